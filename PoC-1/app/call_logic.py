@@ -1,19 +1,45 @@
 from fastapi import HTTPException
-import requests
+from fastapi.concurrency import run_in_threadpool
 import sqlite3
+import time
 from datetime import datetime
+from functools import lru_cache
 import logging
 
-from app.config import VAPI_API_KEY, VAPI_ASSISTANT_ID, VAPI_PHONE_NUMBER_ID
+from app.call_retry import classify_dial_failure, retry_attempt, schedule_retry
+from app.call_status import record_status_events
+from app.config import VAPI_API_KEY, VAPI_ASSISTANT_ID, VAPI_BASE_URL, VAPI_PHONE_NUMBER_ID
+from app.dial_guard import dial_guard
+from app.suppression import suppression_list
 
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _vapi_session():
+    """HTTP session for the Vapi API, created on the first outbound call.
+
+    ``requests`` is imported here rather than at module level so that
+    starting the app (and handling webhooks) does not pay for it.
+    """
+    import requests
+
+    return requests.Session()
+
+
+def _vapi_request_error():
+    """Base class of the errors a ``_vapi_session`` request raises, imported
+    lazily for the same reason as the session"""
+    import requests
+
+    return requests.exceptions.RequestException
+
+
 def extract_intent_from_conversation(messages, summary=None):
-    """Extract intent from conversation messages"""
-    user_messages = [msg["message"] for msg in messages if msg["role"] == "user"]
-    bot_messages = [msg["message"] for msg in messages if msg["role"] == "bot"]
+    """Extract intent from conversation messages (``ConversationMessage``s)"""
+    user_messages = [msg.message or "" for msg in messages if msg.role == "user"]
+    bot_messages = [msg.message or "" for msg in messages if msg.role == "bot"]
 
     # Simple intent classification logic
     intent = "unknown"
@@ -51,20 +77,40 @@ def log_outbound_request(
     status: str = "initiated",
     call_id: str = None,
     error_message: str = None,
+    retry_of: int = None,
+    failure_reason: str = None,
+    retry_after: float = None,
 ):
-    """Log outbound call request to database"""
+    """Log outbound call request to database
+
+    ``retry_of`` is the request this one retries; a ``failure_reason``
+    schedules a retry of this one (app/call_retry.py).
+    """
     conn = sqlite3.connect("voice_agent.db")
     cursor = conn.cursor()
 
     try:
+        attempt = retry_attempt(cursor, retry_of)
         cursor.execute(
             """
             INSERT INTO outbound_requests 
-            (phone_number, assistant_id, purpose, status, call_id, error_message)
-            VALUES (?, ?, ?, ?, ?, ?)
+            (phone_number, assistant_id, purpose, status, call_id, error_message,
+             retry_of, retry_attempt)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         """,
-            (phone_number, assistant_id, purpose, status, call_id, error_message),
+            (
+                phone_number,
+                assistant_id,
+                purpose,
+                status,
+                call_id,
+                error_message,
+                retry_of,
+                attempt,
+            ),
         )
+        if failure_reason:
+            schedule_retry(cursor, cursor.lastrowid, failure_reason, attempt, retry_after)
 
         conn.commit()
         return cursor.lastrowid
@@ -82,8 +128,24 @@ async def make_outbound_call(
     assistant_id: str = None,
     first_message: str = None,
     purpose: str = "Customer outreach",
+    retry_of: int = None,
+    retry_failures: bool = True,
 ):
-    """Make an outbound call using Vapi API"""
+    """Make an outbound call using Vapi API
+
+    ``retry_of`` is the outbound request this call retries. Without
+    ``retry_failures``, a call that cannot be placed is not retried
+    automatically (the caller retries it). Numbers on the do-not-call
+    list are not dialled; the result then has ``suppressed`` set. A
+    number already being dialled, or called within DIAL_DEDUPE_SECONDS,
+    is not dialled again; the result of that dial is returned with
+    ``duplicate`` set (app/dial_guard.py).
+    """
+
+    try:
+        phone_number = suppression_list.normalize(phone_number)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     # Use default assistant if not provided
     if not assistant_id:
@@ -96,8 +158,56 @@ async def make_outbound_call(
     if not assistant_id:
         raise HTTPException(status_code=500, detail="Vapi Assistant ID not configured")
 
+    if suppression_list.is_suppressed(phone_number):
+        error_msg = f"{phone_number} is on the do-not-call list"
+        logger.warning(f"Not calling {phone_number}: on the do-not-call list")
+        await run_in_threadpool(
+            log_outbound_request,
+            phone_number,
+            assistant_id,
+            purpose,
+            "suppressed",
+            error_message=error_msg,
+            retry_of=retry_of,
+        )
+        return {"success": False, "error": error_msg, "suppressed": True}
+
+    # The Vapi request and the database writes block, so they run in a
+    # worker thread and concurrent calls (e.g. scheduled callbacks) don't
+    # hold up the event loop
+    return await dial_guard.dial(
+        phone_number,
+        lambda: run_in_threadpool(
+            _place_outbound_call,
+            phone_number,
+            assistant_id,
+            first_message,
+            purpose,
+            retry_of,
+            retry_failures,
+        ),
+    )
+
+
+def _retry_after(response):
+    """Seconds from a Retry-After header, if it is given as a number"""
+    try:
+        return float(response.headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _place_outbound_call(
+    phone_number, assistant_id, first_message, purpose, retry_of, retry_failures
+):
+    # Another process may be dialling the number, or have just called it
+    request_id, duplicate = dial_guard.claim(phone_number, assistant_id, purpose, retry_of)
+    if duplicate is not None:
+        logger.info(f"Not calling {phone_number} again: already called")
+        return duplicate
+
     # Prepare API request
-    url = "https://api.vapi.ai/call"
+    url = f"{VAPI_BASE_URL}/call"
     headers = {
         "Authorization": f"Bearer {VAPI_API_KEY}",
         "Content-Type": "application/json",
@@ -115,37 +225,48 @@ async def make_outbound_call(
 
     try:
         logger.info(f"Making outbound call to {phone_number}")
-        response = requests.post(url, json=payload, headers=headers, timeout=30)
+        response = _vapi_session().post(url, json=payload, headers=headers, timeout=30)
 
         if response.status_code == 201:
             call_data = response.json()
             call_id = call_data.get("id")
 
             # Log successful request
-            log_outbound_request(
-                phone_number, assistant_id, purpose, "success", call_id
-            )
-
-            # Store initial call record
-            conn = sqlite3.connect("voice_agent.db")
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT OR REPLACE INTO calls 
-                (id, type, phone_number, status, purpose, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    call_id,
-                    "outbound",
-                    phone_number,
-                    "initiated",
-                    purpose,
-                    datetime.now().isoformat(),
-                ),
-            )
-            conn.commit()
-            conn.close()
+            dial_guard.finish(request_id, "success", call_id)
+
+            # Store initial call record; a webhook for the call may already
+            # have created it, in which case its status is kept. The call is
+            # placed either way, so an error here must not fail the dial
+            # (it would be retried and the customer called twice).
+            conn = sqlite3.connect("voice_agent.db", timeout=30)
+            try:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    INSERT INTO calls 
+                    (id, type, phone_number, status, purpose, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                        phone_number = excluded.phone_number,
+                        purpose = excluded.purpose
+                """,
+                    (
+                        call_id,
+                        "outbound",
+                        phone_number,
+                        "unknown",
+                        purpose,
+                        datetime.now().isoformat(),
+                    ),
+                )
+                record_status_events(
+                    cursor, [(call_id, "initiated", int(time.time() * 1000))]
+                )
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Error storing call {call_id}: {str(e)}")
+            finally:
+                conn.close()
 
             logger.info(f"✅ Successfully initiated call {call_id} to {phone_number}")
             return {"success": True, "call_id": call_id, "data": call_data}
@@ -155,8 +276,14 @@ async def make_outbound_call(
             logger.error(error_msg)
 
             # Log failed request
-            log_outbound_request(
-                phone_number, assistant_id, purpose, "failed", error_message=error_msg
+            dial_guard.finish(
+                request_id,
+                "failed",
+                error_message=error_msg,
+                failure_reason=(
+                    classify_dial_failure(response.status_code) if retry_failures else None
+                ),
+                retry_after=_retry_after(response),
             )
 
             return {
@@ -165,13 +292,16 @@ async def make_outbound_call(
                 "status_code": response.status_code,
             }
 
-    except requests.exceptions.RequestException as e:
+    except _vapi_request_error() as e:
         error_msg = f"Request failed: {str(e)}"
         logger.error(error_msg)
 
         # Log failed request
-        log_outbound_request(
-            phone_number, assistant_id, purpose, "failed", error_message=error_msg
+        dial_guard.finish(
+            request_id,
+            "failed",
+            error_message=error_msg,
+            failure_reason=classify_dial_failure() if retry_failures else None,
         )
 
         return {"success": False, "error": error_msg}
@@ -181,8 +311,6 @@ async def make_outbound_call(
         logger.error(error_msg)
 
         # Log failed request
-        log_outbound_request(
-            phone_number, assistant_id, purpose, "failed", error_message=error_msg
-        )
+        dial_guard.finish(request_id, "failed", error_message=error_msg)
 
         return {"success": False, "error": error_msg}
@@ -0,0 +1,376 @@
+"""
+Automatic retries of failed and unanswered outbound calls.
+
+A failure is classified when it is seen:
+
+- placing the call (``make_outbound_call``): HTTP 429 is ``rate_limited``,
+  a 5xx is ``provider_error`` and a timeout or connection error is
+  ``network``; other client errors (e.g. an invalid number) are not retried
+- ending the call (end-of-call report): an ``endedReason`` of no answer,
+  busy or voicemail, or a provider/pipeline error
+
+and recorded on the call's ``outbound_requests`` row: ``retry_reason``,
+``retry_status`` and ``retry_at``. ``CALL_RETRY_POLICY`` gives each reason
+a number of retries and a first backoff, which doubles with each retry.
+Retries after a customer outcome (no answer, busy, voicemail) are moved
+into the callback business hours; a ``Retry-After`` on a 429 is honoured.
+
+``CallRetryEngine`` reads due retries through a partial index on
+``retry_at`` that only holds rows whose ``retry_status`` is ``pending``,
+so the scan does not grow with the request history. A retry is claimed
+(pending -> dialing) before it is dialled and is then ``retried``; the
+new request points at it through ``retry_of`` and carries the attempt
+count, so a chain stops at the cap whatever reasons it failed with. A
+process that dies while dialling leaves the row ``interrupted`` rather
+than dialling it again. Reasons that run out of retries end ``exhausted``.
+"""
+
+import asyncio
+import logging
+import random
+import sqlite3
+import time
+
+from app.callback_scheduler import business_hours
+from app.config import (
+    CALL_RETRY_ENABLED,
+    CALL_RETRY_MAX_DELAY_SECONDS,
+    CALL_RETRY_POLICY,
+    CALL_RETRY_POLL_SECONDS,
+    CALL_RETRY_WORKERS,
+)
+
+
+logger = logging.getLogger(__name__)
+
+RETRY_REASONS = ("provider_error", "network", "rate_limited", "no_answer", "busy", "voicemail")
+# Outcomes of a call that reached the customer's line; their retries are
+# placed in business hours
+CUSTOMER_REASONS = ("no_answer", "busy", "voicemail")
+
+
+def parse_policy(value):
+    """``reason=retries:seconds,...`` -> {reason: (retries, seconds)}"""
+    policy = {}
+    for entry in value.split(","):
+        if not entry.strip():
+            continue
+        reason, _, limits = entry.partition("=")
+        reason = reason.strip()
+        if reason not in RETRY_REASONS:
+            raise ValueError(f"Unknown retry reason: {reason}")
+        retries, _, seconds = limits.partition(":")
+        policy[reason] = (int(retries), float(seconds or 60))
+    return policy
+
+
+retry_policy = parse_policy(CALL_RETRY_POLICY)
+
+
+def classify_dial_failure(status_code=None):
+    """Reason to retry a call that could not be placed; ``status_code`` is
+    None when no response came back"""
+    if status_code is None:
+        return "network"
+    if status_code == 429:
+        return "rate_limited"
+    if status_code >= 500:
+        return "provider_error"
+    return None
+
+
+def classify_ended_reason(ended_reason):
+    """Reason to retry a call that ended with Vapi's ``ended_reason``"""
+    if not ended_reason:
+        return None
+    ended_reason = ended_reason.lower()
+    if "voicemail" in ended_reason:
+        return "voicemail"
+    if "busy" in ended_reason:
+        return "busy"
+    if "did-not-answer" in ended_reason or "no-answer" in ended_reason:
+        return "no_answer"
+    if "failed-to-connect" in ended_reason or "error" in ended_reason:
+        return "provider_error"
+    return None
+
+
+def next_retry_at(reason, attempt, now_ms=None, retry_after=None, policy=retry_policy):
+    """When to retry a call that failed with ``reason`` on its ``attempt``th
+    retry (0 for the first call); None once the reason's retries are used"""
+    if reason not in policy:
+        return None
+    retries, base_seconds = policy[reason]
+    if attempt >= retries:
+        return None
+    now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+    delay = min(base_seconds * 2**attempt, CALL_RETRY_MAX_DELAY_SECONDS)
+    delay *= random.uniform(0.9, 1.1)  # so failures from one outage don't retry together
+    if retry_after:
+        delay = max(delay, retry_after)
+    due = now_ms + int(delay * 1000)
+    if reason in CUSTOMER_REASONS:
+        due = business_hours.next_open(due)
+    return due
+
+
+def retry_attempt(cursor, retry_of):
+    """Attempt number of a request that retries ``retry_of`` (0 for a
+    first call)"""
+    if retry_of is None:
+        return 0
+    row = cursor.execute(
+        "SELECT retry_attempt FROM outbound_requests WHERE id = ?", (retry_of,)
+    ).fetchone()
+    return row[0] + 1 if row else 1
+
+
+def schedule_retry(cursor, request_id, reason, attempt, retry_after=None):
+    """Record a failure on an outbound request that has none yet; returns
+    the retry time, or None if the reason is out of retries"""
+    due = next_retry_at(reason, attempt, retry_after=retry_after)
+    cursor.execute(
+        """
+        UPDATE outbound_requests
+        SET retry_reason = ?, retry_status = ?, retry_at = ?, updated_at = CURRENT_TIMESTAMP
+        WHERE id = ? AND retry_status IS NULL
+    """,
+        (reason, "pending" if due else "exhausted", due, request_id),
+    )
+    return due
+
+
+def schedule_call_retries(cursor, failures):
+    """Retries for ended calls; ``failures`` are (call_id, reason). A call
+    already given a retry (e.g. a replayed webhook) is left alone."""
+    for call_id, reason in failures:
+        cursor.execute(
+            """
+            SELECT id, retry_attempt FROM outbound_requests
+            WHERE call_id = ? AND retry_status IS NULL
+        """,
+            (call_id,),
+        )
+        for request_id, attempt in cursor.fetchall():
+            schedule_retry(cursor, request_id, reason, attempt)
+
+
+def retry_stats(cursor):
+    """Retries per reason: requests in each retry status, the next due
+    retry, and how many retries went through without failing again"""
+    stats = {
+        reason: {"retries": retries, "first_backoff_seconds": seconds}
+        for reason, (retries, seconds) in retry_policy.items()
+    }
+    cursor.execute(
+        """
+        SELECT retry_reason, retry_status, COUNT(*), MIN(retry_at)
+        FROM outbound_requests
+        WHERE retry_reason IS NOT NULL
+        GROUP BY retry_reason, retry_status
+    """
+    )
+    for reason, status, count, next_at in cursor.fetchall():
+        entry = stats.setdefault(reason, {})
+        entry[status] = count
+        if status == "pending":
+            entry["next_retry_at"] = next_at
+    cursor.execute(
+        """
+        SELECT failed.retry_reason, COUNT(*)
+        FROM outbound_requests retry
+        JOIN outbound_requests failed ON failed.id = retry.retry_of
+        WHERE retry.retry_of IS NOT NULL
+          AND retry.status = 'success' AND retry.retry_reason IS NULL
+        GROUP BY failed.retry_reason
+    """
+    )
+    for reason, count in cursor.fetchall():
+        stats.setdefault(reason, {})["recovered"] = count
+    return stats
+
+
+class CallRetryEngine:
+    """Dials due retries with ``dial`` (``make_outbound_call`` by default),
+    ``workers`` at a time"""
+
+    def __init__(
+        self,
+        dial=None,
+        db_path="voice_agent.db",
+        workers=CALL_RETRY_WORKERS,
+        poll_seconds=CALL_RETRY_POLL_SECONDS,
+        enabled=CALL_RETRY_ENABLED,
+    ):
+        self.dial = dial
+        self.db_path = db_path
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        self.enabled = enabled
+        self._wakeup = None
+        self._loop = None
+
+    def wake(self):
+        """Check for due retries now; safe to call from any thread"""
+        if self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def run(self, until_idle=False):
+        """Dial due retries until cancelled, or until none are due when
+        ``until_idle`` is set"""
+        if self.dial is None:
+            from app.call_logic import make_outbound_call
+
+            self.dial = make_outbound_call
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        await asyncio.to_thread(self._mark_interrupted)
+
+        queue = asyncio.Queue(maxsize=self.workers)
+        workers = [asyncio.create_task(self._worker(queue)) for _ in range(self.workers)]
+        drained = False
+        try:
+            while True:
+                self._wakeup.clear()
+                try:
+                    jobs, next_at = await asyncio.to_thread(self._claim, self.workers * 4)
+                except sqlite3.Error as e:
+                    logger.error(f"Error claiming call retries: {str(e)}")
+                    jobs, next_at = [], None
+                for job in jobs:
+                    await queue.put(job)
+                if jobs:
+                    drained = False
+                    continue
+                if until_idle:
+                    # Stop once a claim after the last dials finds nothing due
+                    if drained:
+                        return
+                    await queue.join()
+                    drained = True
+                    continue
+                wait = self.poll_seconds
+                if next_at is not None:
+                    wait = min(wait, max(next_at / 1000 - time.time(), 0))
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            for worker in workers:
+                worker.cancel()
+            self._wakeup = None
+
+    async def _worker(self, queue):
+        while True:
+            job = await queue.get()
+            try:
+                await self._retry(job)
+            except Exception as e:
+                logger.error(f"Error retrying outbound request {job[0]}: {str(e)}")
+            finally:
+                queue.task_done()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _mark_interrupted(self):
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                """
+                UPDATE outbound_requests
+                SET retry_status = 'interrupted', updated_at = CURRENT_TIMESTAMP
+                WHERE retry_status = 'dialing'
+            """
+            )
+            conn.commit()
+            if cursor.rowcount:
+                logger.warning(
+                    f"{cursor.rowcount} call retries were being dialled when the engine "
+                    "stopped; marked interrupted instead of dialling again"
+                )
+        finally:
+            conn.close()
+
+    def _claim(self, limit):
+        """Mark up to ``limit`` due retries ``dialing`` and return them, with
+        the due time of the next one left"""
+        now_ms = int(time.time() * 1000)
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            # Both queries are answered from idx_outbound_requests_retry_due
+            jobs = conn.execute(
+                """
+                SELECT id, phone_number, assistant_id, purpose, retry_reason
+                FROM outbound_requests
+                WHERE retry_status = 'pending' AND retry_at <= ?
+                ORDER BY retry_at
+                LIMIT ?
+            """,
+                (now_ms, limit),
+            ).fetchall()
+            if jobs:
+                conn.executemany(
+                    """
+                    UPDATE outbound_requests
+                    SET retry_status = 'dialing', updated_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                """,
+                    [(job[0],) for job in jobs],
+                )
+            next_at = conn.execute(
+                "SELECT MIN(retry_at) FROM outbound_requests WHERE retry_status = 'pending'"
+            ).fetchone()[0]
+            conn.commit()
+            return jobs, next_at
+        finally:
+            conn.close()
+
+    async def _retry(self, job):
+        request_id, phone_number, assistant_id, purpose, reason = job
+        logger.info(f"Retrying outbound request {request_id} to {phone_number} ({reason})")
+        try:
+            await self.dial(
+                phone_number=phone_number,
+                assistant_id=assistant_id,
+                purpose=purpose,
+                retry_of=request_id,
+            )
+        except Exception as e:
+            # Raised before anything was dialled: an invalid number won't
+            # become valid, missing configuration might
+            logger.error(f"Could not retry outbound request {request_id}: {str(e)}")
+            if getattr(e, "status_code", 500) < 500:
+                await asyncio.to_thread(self._set_status, request_id, "exhausted")
+            else:
+                await asyncio.to_thread(
+                    self._set_status,
+                    request_id,
+                    "pending",
+                    int((time.time() + self.poll_seconds) * 1000),
+                )
+            return
+        # The new request records its own outcome and any further retry
+        await asyncio.to_thread(self._set_status, request_id, "retried")
+
+    def _set_status(self, request_id, status, retry_at=None):
+        conn = self._connect()
+        try:
+            conn.execute(
+                """
+                UPDATE outbound_requests
+                SET retry_status = ?, retry_at = COALESCE(?, retry_at),
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """,
+                (status, retry_at, request_id),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+
+call_retry_engine = CallRetryEngine()
+
@@ -0,0 +1,173 @@
+"""
+Call status timeline.
+
+Every accepted status change is appended to ``call_status_events``
+(call_id, status, ts) and mirrored to ``calls.status`` /
+``calls.status_changed_at``. Calls only move forward through
+``STATUS_RANKS``, so repeated and late (out-of-order) updates are dropped
+instead of overwriting a newer status.
+
+``StatusCoalescer`` holds ``status-update`` webhooks for a short window and
+writes them in one transaction; within a window updates are applied in
+event-time order, so a burst that arrives shuffled still produces the
+right timeline.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+
+from app.config import CALL_STATUS_COALESCE_MAX, CALL_STATUS_COALESCE_MS
+
+
+logger = logging.getLogger(__name__)
+
+# Forward-only order of Vapi call statuses ("initiated" is ours, set when
+# an outbound call is placed)
+STATUS_RANKS = {
+    "initiated": 0,
+    "queued": 1,
+    "ringing": 2,
+    "in-progress": 3,
+    "forwarding": 4,
+    "ended": 5,
+}
+
+# SQLite's default limit on host parameters is 999
+_IN_CHUNK = 500
+
+
+def is_valid_transition(current, new):
+    """Whether a call in status ``current`` (None if none yet) may move to ``new``"""
+    if new not in STATUS_RANKS:
+        return False
+    return STATUS_RANKS[new] > STATUS_RANKS.get(current, -1)
+
+
+def record_status_events(cursor, events):
+    """Apply (call_id, status, ts_ms) events; the caller commits.
+
+    The calls must already exist. Returns the number of transitions accepted.
+    """
+    if not events:
+        return 0
+
+    call_ids = list({call_id for call_id, _, _ in events})
+    current = {}
+    for start in range(0, len(call_ids), _IN_CHUNK):
+        chunk = call_ids[start:start + _IN_CHUNK]
+        placeholders = ",".join("?" * len(chunk))
+        cursor.execute(f"SELECT id, status FROM calls WHERE id IN ({placeholders})", chunk)
+        current.update(cursor.fetchall())
+
+    accepted = []
+    for call_id, status, ts in sorted(events, key=lambda event: event[2]):
+        if status not in STATUS_RANKS:
+            logger.warning(f"Ignoring unknown status {status!r} for call {call_id}")
+            continue
+        if not is_valid_transition(current.get(call_id), status):
+            continue
+        current[call_id] = status
+        accepted.append((call_id, status, ts))
+
+    if not accepted:
+        return 0
+
+    cursor.executemany(
+        "INSERT INTO call_status_events (call_id, status, ts) VALUES (?, ?, ?)",
+        accepted,
+    )
+    latest = {call_id: (status, ts) for call_id, status, ts in accepted}
+    cursor.executemany(
+        "UPDATE calls SET status = ?, status_changed_at = ? WHERE id = ?",
+        [(status, ts, call_id) for call_id, (status, ts) in latest.items()],
+    )
+    return len(accepted)
+
+
+def status_history(cursor, call_id):
+    cursor.execute(
+        "SELECT status, ts FROM call_status_events WHERE call_id = ? ORDER BY ts, id",
+        (call_id,),
+    )
+    return [{"status": status, "ts": ts} for status, ts in cursor.fetchall()]
+
+
+def find_stuck_calls(cursor, status, minutes, limit=100, now_ms=None):
+    """Calls that have been in ``status`` for more than ``minutes``, longest first"""
+    if now_ms is None:
+        now_ms = int(time.time() * 1000)
+    cursor.execute(
+        """
+        SELECT id, type, phone_number, status, status_changed_at
+        FROM calls
+        WHERE status = ? AND status_changed_at < ?
+        ORDER BY status_changed_at
+        LIMIT ?
+    """,
+        (status, now_ms - int(minutes * 60_000), limit),
+    )
+    return [
+        {
+            "id": call_id,
+            "type": call_type,
+            "phone_number": phone_number,
+            "status": call_status,
+            "status_changed_at": changed_at,
+            "minutes_in_status": round((now_ms - changed_at) / 60_000, 1),
+        }
+        for call_id, call_type, phone_number, call_status, changed_at in cursor.fetchall()
+    ]
+
+
+class StatusCoalescer:
+    """Buffers webhook rows for up to ``window_ms`` and writes each window
+    with ``write_batch(cursor, rows)`` in a single transaction"""
+
+    def __init__(
+        self,
+        write_batch,
+        window_ms=CALL_STATUS_COALESCE_MS,
+        max_pending=CALL_STATUS_COALESCE_MAX,
+        db_path="voice_agent.db",
+    ):
+        self.write_batch = write_batch
+        self.window_ms = window_ms
+        self.max_pending = max_pending
+        self.db_path = db_path
+        self._pending = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.window_ms > 0
+
+    def submit(self, rows):
+        """Queue rows from ``build_call_rows``; written immediately when
+        coalescing is disabled or the buffer is full"""
+        with self._lock:
+            self._pending.append(rows)
+            full = not self.enabled or len(self._pending) >= self.max_pending
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Write everything buffered; returns the number of rows written"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return 0
+
+        with self._write_lock:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                self.write_batch(conn.cursor(), pending)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                conn.close()
+        return len(pending)
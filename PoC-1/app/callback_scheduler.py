@@ -0,0 +1,494 @@
+"""
+Scheduled callbacks.
+
+A call whose intent is ``schedule_callback`` gets a row in
+``scheduled_callbacks`` (one per source call, so retried and replayed
+webhooks don't add more), due ``CALLBACK_DELAY_MINUTES`` after the request
+or at the next opening time if the customer asked for "tomorrow". Due
+times are moved into business hours (``CALLBACK_BUSINESS_HOURS`` on
+``CALLBACK_BUSINESS_DAYS`` in ``CALLBACK_TIMEZONE``) and spread by up to
+``CALLBACK_JITTER_SECONDS`` so a backlog doesn't dial all at once.
+
+The table is the source of truth. ``CallbackScheduler`` keeps only the
+callbacks due within ``CALLBACK_HORIZON_SECONDS`` in a heap (loaded
+through the (status, due_at) index, so any number can be pending),
+sleeps until the earliest one and places it with ``make_outbound_call``,
+at most ``CALLBACK_MAX_CONCURRENT`` at a time. Changing a callback's due
+time leaves its old heap entry behind; entries are checked against the
+table when they come up.
+
+A callback is claimed with a conditional UPDATE (pending -> dialing)
+before it is dialled, so it is placed at most once. A process that dies
+while dialling leaves the row ``dialing``; the next start marks it
+``interrupted`` rather than dialling again, since the call may have gone
+out. Interrupted and failed callbacks can be rescheduled by hand.
+"""
+
+import asyncio
+import heapq
+import logging
+import sqlite3
+import time
+import zlib
+from datetime import datetime, timedelta
+from functools import partial
+
+from app.config import (
+    CALLBACK_BUSINESS_DAYS,
+    CALLBACK_BUSINESS_HOURS,
+    CALLBACK_DELAY_MINUTES,
+    CALLBACK_EXPIRE_HOURS,
+    CALLBACK_HORIZON_SECONDS,
+    CALLBACK_JITTER_SECONDS,
+    CALLBACK_MAX_ATTEMPTS,
+    CALLBACK_MAX_CONCURRENT,
+    CALLBACK_RETRY_MINUTES,
+    CALLBACK_SCHEDULER_ENABLED,
+    CALLBACK_TIMEZONE,
+)
+
+
+logger = logging.getLogger(__name__)
+
+WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+# Statuses a callback can be rescheduled or cancelled from
+OPEN_STATUSES = ("pending", "interrupted", "failed")
+
+
+class BusinessHours:
+    """Daily calling window, e.g. ``09:00-18:00`` on ``mon,...,fri``, in a
+    timezone. An empty ``hours`` means any time."""
+
+    def __init__(
+        self, hours=CALLBACK_BUSINESS_HOURS, days=CALLBACK_BUSINESS_DAYS, tz=CALLBACK_TIMEZONE
+    ):
+        from zoneinfo import ZoneInfo
+
+        self.tz = ZoneInfo(tz)
+        self.window = None
+        if hours.strip():
+            start, end = (
+                datetime.strptime(part.strip(), "%H:%M").time() for part in hours.split("-")
+            )
+            if start >= end:
+                raise ValueError(f"Business hours must start before they end: {hours}")
+            self.window = (start, end)
+        days = [day.strip().lower()[:3] for day in days.split(",") if day.strip()]
+        unknown = set(days) - set(WEEKDAYS)
+        if unknown:
+            raise ValueError(f"Unknown business days: {', '.join(sorted(unknown))}")
+        self.days = {WEEKDAYS.index(day) for day in days} or set(range(7))
+
+    def _local(self, ts_ms):
+        return datetime.fromtimestamp(ts_ms / 1000, tz=self.tz)
+
+    def _ms(self, day, at):
+        return int(datetime.combine(day, at, tzinfo=self.tz).timestamp() * 1000)
+
+    def contains(self, ts_ms):
+        if self.window is None:
+            return True
+        local = self._local(ts_ms)
+        start, end = self.window
+        return local.weekday() in self.days and start <= local.time() < end
+
+    def next_open(self, ts_ms):
+        """``ts_ms`` if it is within business hours, else the next opening"""
+        if self.window is None or self.contains(ts_ms):
+            return ts_ms
+        local = self._local(ts_ms)
+        for offset in range(8):
+            day = local.date() + timedelta(days=offset)
+            if day.weekday() in self.days and (offset or local.time() < self.window[0]):
+                return self._ms(day, self.window[0])
+        return ts_ms
+
+    def next_day_open(self, ts_ms):
+        """Opening time of the first business day after ``ts_ms``'s day"""
+        if self.window is None:
+            return ts_ms + 86_400_000
+        local = self._local(ts_ms)
+        for offset in range(1, 9):
+            day = local.date() + timedelta(days=offset)
+            if day.weekday() in self.days:
+                return self._ms(day, self.window[0])
+        return ts_ms + 86_400_000
+
+
+business_hours = BusinessHours()
+
+
+def jitter_ms(key):
+    """Stable spread for ``key``, so re-processing an event gives the same
+    due time"""
+    span = int(CALLBACK_JITTER_SECONDS * 1000)
+    return zlib.crc32(str(key).encode()) % (span + 1) if span > 0 else 0
+
+
+def spread_into_hours(ts_ms, key, hours=business_hours):
+    """Move ``ts_ms`` into business hours and add ``key``'s jitter"""
+    due = hours.next_open(ts_ms) + jitter_ms(key)
+    return hours.next_open(due)
+
+
+def callback_due_at(requested_at_ms, user_text, key, hours=business_hours):
+    """When to call back a customer who asked at ``requested_at_ms``"""
+    if "tomorrow" in user_text.lower():
+        base = hours.next_day_open(requested_at_ms)
+    else:
+        base = requested_at_ms + int(CALLBACK_DELAY_MINUTES * 60_000)
+    return spread_into_hours(base, key, hours)
+
+
+# Queues the callback for a call unless it has one already. Without a
+# number in the event, the number the call was placed to is used.
+QUEUE_CALLBACK_SQL = """
+    INSERT INTO scheduled_callbacks (source_call_id, phone_number, purpose, due_at)
+    SELECT ?1, number, ?3, ?4
+    FROM (SELECT COALESCE(?2, (SELECT phone_number FROM calls WHERE id = ?1)) AS number)
+    WHERE number IS NOT NULL
+    ON CONFLICT (source_call_id) DO NOTHING
+"""
+
+
+def list_callbacks(cursor, status=None, limit=100):
+    """Callbacks soonest first, optionally only those in ``status``"""
+    query = """
+        SELECT id, source_call_id, phone_number, purpose, status, due_at, attempts,
+               result_call_id, error, updated_at
+        FROM scheduled_callbacks
+    """
+    params = []
+    if status is not None:
+        query += " WHERE status = ?"
+        params.append(status)
+    query += " ORDER BY due_at LIMIT ?"
+    params.append(limit)
+    cursor.execute(query, params)
+    columns = [description[0] for description in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+class CallbackScheduler:
+    """Places due callbacks with ``dial`` (``make_outbound_call`` by
+    default), at most ``max_concurrent`` at a time"""
+
+    def __init__(
+        self,
+        dial=None,
+        db_path="voice_agent.db",
+        max_concurrent=CALLBACK_MAX_CONCURRENT,
+        horizon_seconds=CALLBACK_HORIZON_SECONDS,
+        max_attempts=CALLBACK_MAX_ATTEMPTS,
+        retry_minutes=CALLBACK_RETRY_MINUTES,
+        expire_hours=CALLBACK_EXPIRE_HOURS,
+        hours=business_hours,
+        enabled=CALLBACK_SCHEDULER_ENABLED,
+    ):
+        self.dial = dial
+        self.db_path = db_path
+        self.max_concurrent = max_concurrent
+        self.horizon_ms = int(horizon_seconds * 1000)
+        self.max_attempts = max_attempts
+        self.retry_ms = int(retry_minutes * 60_000)
+        self.expire_ms = int(expire_hours * 3_600_000)
+        self.hours = hours
+        self.enabled = enabled
+        self._heap = []  # (due_at, id)
+        self._queued = {}  # id -> due_at of its live heap entry
+        self._loaded_until = 0
+        self._loop = None
+        self._wakeup = None
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    # --- Changes from the API (any thread) ---------------------------------
+
+    def schedule(self, phone_number, due_at_ms=None, purpose=None):
+        """Add a callback; returns (id, due_at). Without ``due_at_ms`` it is
+        due after ``CALLBACK_DELAY_MINUTES``."""
+        now_ms = int(time.time() * 1000)
+        if due_at_ms is None:
+            due_at_ms = now_ms + int(CALLBACK_DELAY_MINUTES * 60_000)
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                "INSERT INTO scheduled_callbacks (phone_number, purpose, due_at) VALUES (?, ?, ?)",
+                (phone_number, purpose, due_at_ms),
+            )
+            # Jitter needs the id, so the final due time is set second
+            due_at_ms = spread_into_hours(due_at_ms, cursor.lastrowid, self.hours)
+            conn.execute(
+                "UPDATE scheduled_callbacks SET due_at = ? WHERE id = ?",
+                (due_at_ms, cursor.lastrowid),
+            )
+            conn.commit()
+            job_id = cursor.lastrowid
+        finally:
+            conn.close()
+        self.notify(job_id, due_at_ms)
+        return job_id, due_at_ms
+
+    def reschedule(self, job_id, due_at_ms):
+        """Move a pending, interrupted or failed callback to ``due_at_ms``
+        (kept as given, outside business hours too). Returns False if there
+        is no such open callback."""
+        if self._update_open(
+            job_id,
+            "status = 'pending', due_at = ?, attempts = 0, error = NULL",
+            (due_at_ms,),
+        ):
+            self.notify(job_id, due_at_ms)
+            return True
+        return False
+
+    def cancel(self, job_id):
+        return self._update_open(job_id, "status = 'cancelled'", ())
+
+    def _update_open(self, job_id, assignments, params):
+        placeholders = ",".join("?" * len(OPEN_STATUSES))
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                f"""
+                UPDATE scheduled_callbacks
+                SET {assignments}, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ? AND status IN ({placeholders})
+            """,
+                (*params, job_id, *OPEN_STATUSES),
+            )
+            conn.commit()
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def notify(self, job_id, due_at_ms):
+        """Tell the running scheduler about a new due time"""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._push, job_id, due_at_ms)
+
+    def wake(self):
+        """Reload due callbacks from the table now (e.g. after a webhook
+        queued one)"""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._request_reload)
+
+    def _request_reload(self):
+        self._loaded_until = 0
+        self._wakeup.set()
+
+    # --- Scheduling loop ---------------------------------------------------
+
+    def _push(self, job_id, due_at_ms):
+        # Due times beyond the loaded horizon are picked up by a later load
+        if due_at_ms < self._loaded_until and self._queued.get(job_id) != due_at_ms:
+            self._queued[job_id] = due_at_ms
+            heapq.heappush(self._heap, (due_at_ms, job_id))
+            if self._wakeup is not None and self._heap[0][1] == job_id:
+                self._wakeup.set()
+
+    def _load(self, until_ms):
+        conn = self._connect()
+        try:
+            return conn.execute(
+                """
+                SELECT id, due_at FROM scheduled_callbacks
+                WHERE status = 'pending' AND due_at < ?
+            """,
+                (until_ms,),
+            ).fetchall()
+        finally:
+            conn.close()
+
+    def _mark_interrupted(self):
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                """
+                UPDATE scheduled_callbacks
+                SET status = 'interrupted', updated_at = CURRENT_TIMESTAMP
+                WHERE status = 'dialing'
+            """
+            )
+            conn.commit()
+            if cursor.rowcount:
+                logger.warning(
+                    f"{cursor.rowcount} callbacks were being dialled when the scheduler "
+                    "stopped; marked interrupted instead of dialling again"
+                )
+        finally:
+            conn.close()
+
+    async def run(self):
+        """Place callbacks as they come due, until cancelled"""
+        if self.dial is None:
+            from app.call_logic import make_outbound_call
+
+            # Failed dials are retried here, not by app/call_retry.py
+            self.dial = partial(make_outbound_call, retry_failures=False)
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        slots = asyncio.Semaphore(self.max_concurrent)
+        dialing = set()
+        await asyncio.to_thread(self._mark_interrupted)
+
+        try:
+            while True:
+                now_ms = int(time.time() * 1000)
+                if now_ms + self.horizon_ms // 2 >= self._loaded_until:
+                    until_ms = now_ms + self.horizon_ms
+                    try:
+                        due = await asyncio.to_thread(self._load, until_ms)
+                    except sqlite3.Error as e:
+                        logger.error(f"Error loading callbacks: {str(e)}")
+                        due = []
+                    self._loaded_until = until_ms
+                    for job_id, due_at_ms in due:
+                        self._push(job_id, due_at_ms)
+
+                while self._heap and self._heap[0][0] <= now_ms:
+                    due_at_ms, job_id = heapq.heappop(self._heap)
+                    if self._queued.get(job_id) != due_at_ms:
+                        continue  # superseded by a later due time
+                    del self._queued[job_id]
+                    await slots.acquire()
+                    task = asyncio.create_task(self._place(job_id, due_at_ms, slots))
+                    dialing.add(task)
+                    task.add_done_callback(dialing.discard)
+
+                self._wakeup.clear()
+                wait_ms = self._loaded_until - self.horizon_ms // 2 - int(time.time() * 1000)
+                if self._heap:
+                    wait_ms = min(wait_ms, self._heap[0][0] - int(time.time() * 1000))
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), max(wait_ms, 0) / 1000)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._loop = None
+            for task in dialing:
+                task.cancel()
+
+    async def _place(self, job_id, due_at_ms, slots):
+        try:
+            job = await asyncio.to_thread(self._claim, job_id, due_at_ms)
+            if job is None:
+                return
+            phone_number, purpose = job
+            try:
+                result = await self.dial(
+                    phone_number=phone_number, purpose=purpose or "Scheduled callback"
+                )
+            except Exception as e:
+                result = {"success": False, "error": getattr(e, "detail", None) or str(e)}
+            next_due = await asyncio.to_thread(self._record_result, job_id, result)
+            if next_due is not None:
+                self._push(job_id, next_due)
+        except Exception as e:
+            logger.error(f"Error placing callback {job_id}: {str(e)}")
+        finally:
+            slots.release()
+
+    def _claim(self, job_id, due_at_ms):
+        """Take a due callback for dialling; None if it was changed, is late
+        or is outside business hours (it is then moved instead)"""
+        now_ms = int(time.time() * 1000)
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                """
+                SELECT phone_number, purpose FROM scheduled_callbacks
+                WHERE id = ? AND status = 'pending' AND due_at = ?
+            """,
+                (job_id, due_at_ms),
+            ).fetchone()
+            if row is None:
+                conn.rollback()
+                return None
+
+            if now_ms - due_at_ms > self.expire_ms:
+                conn.execute(
+                    """
+                    UPDATE scheduled_callbacks
+                    SET status = 'expired', updated_at = CURRENT_TIMESTAMP WHERE id = ?
+                """,
+                    (job_id,),
+                )
+                conn.commit()
+                logger.warning(f"Callback {job_id} expired before it could be placed")
+                return None
+
+            if not self.hours.contains(now_ms):
+                # Came due outside business hours (e.g. a backlog after downtime)
+                later = spread_into_hours(now_ms, job_id, self.hours)
+                conn.execute(
+                    """
+                    UPDATE scheduled_callbacks
+                    SET due_at = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?
+                """,
+                    (later, job_id),
+                )
+                conn.commit()
+                self._loop.call_soon_threadsafe(self._push, job_id, later)
+                return None
+
+            conn.execute(
+                """
+                UPDATE scheduled_callbacks
+                SET status = 'dialing', attempts = attempts + 1, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """,
+                (job_id,),
+            )
+            conn.commit()
+            return row
+        finally:
+            conn.close()
+
+    def _record_result(self, job_id, result):
+        """Store the outcome of a dial; returns the next due time if the
+        callback is retried"""
+        conn = self._connect()
+        try:
+            if result.get("success"):
+                conn.execute(
+                    """
+                    UPDATE scheduled_callbacks
+                    SET status = 'done', result_call_id = ?, error = NULL,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                """,
+                    (result.get("call_id"), job_id),
+                )
+                conn.commit()
+                logger.info(f"Placed callback {job_id}: call {result.get('call_id')}")
+                return None
+
+            error = result.get("error")
+            attempts = conn.execute(
+                "SELECT attempts FROM scheduled_callbacks WHERE id = ?", (job_id,)
+            ).fetchone()[0]
+            next_due = None
+            if attempts < self.max_attempts and not result.get("suppressed"):
+                next_due = spread_into_hours(
+                    int(time.time() * 1000) + self.retry_ms, f"{job_id}:{attempts}", self.hours
+                )
+            conn.execute(
+                """
+                UPDATE scheduled_callbacks
+                SET status = ?, due_at = COALESCE(?, due_at), error = ?,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """,
+                ("pending" if next_due else "failed", next_due, error, job_id),
+            )
+            conn.commit()
+            logger.warning(f"Callback {job_id} attempt {attempts} failed: {error}")
+            return next_due
+        finally:
+            conn.close()
+
+
+callback_scheduler = CallbackScheduler()
@@ -4,3 +4,82 @@ from dotenv import load_dotenv
 VAPI_API_KEY = os.getenv("VAPI_API_KEY")
 VAPI_ASSISTANT_ID = os.getenv("VAPI_ASSISTANT_ID")
 VAPI_PHONE_NUMBER_ID = os.getenv("VAPI_PHONE_NUMBER_ID")
+# Point at a local stand-in (benchmarks/mock_providers.py) for load tests
+VAPI_BASE_URL = os.getenv("VAPI_BASE_URL", "https://api.vapi.ai").rstrip("/")
+
+# Raw webhook events are archived here for replay/backfill (app/event_replay.py)
+EVENT_ARCHIVE_ENABLED = os.getenv("EVENT_ARCHIVE_ENABLED", "true").lower() == "true"
+EVENT_ARCHIVE_DIR = os.getenv("EVENT_ARCHIVE_DIR", "event_archive")
+# "gzip", or "zstd" when the zstandard package is installed
+EVENT_ARCHIVE_COMPRESSION = os.getenv("EVENT_ARCHIVE_COMPRESSION", "gzip").lower()
+EVENT_ARCHIVE_FLUSH_EVENTS = int(os.getenv("EVENT_ARCHIVE_FLUSH_EVENTS", "500"))
+EVENT_ARCHIVE_FLUSH_SECONDS = float(os.getenv("EVENT_ARCHIVE_FLUSH_SECONDS", "5"))
+
+# status-update webhooks are written in batches, at most this many ms late
+# (0 writes each one immediately)
+CALL_STATUS_COALESCE_MS = int(os.getenv("CALL_STATUS_COALESCE_MS", "200"))
+CALL_STATUS_COALESCE_MAX = int(os.getenv("CALL_STATUS_COALESCE_MAX", "1000"))
+
+# Most recent matches per source that transcript search ranks (bounds the
+# cost of very common words)
+TRANSCRIPT_SEARCH_MAX_CANDIDATES = int(os.getenv("TRANSCRIPT_SEARCH_MAX_CANDIDATES", "5000"))
+
+# Call recordings linked from end-of-call reports are downloaded in the
+# background (app/recording_fetcher.py) into a size-capped local store
+RECORDING_FETCH_ENABLED = os.getenv("RECORDING_FETCH_ENABLED", "true").lower() == "true"
+# Any of: mono, stereo, assistant, customer
+RECORDING_FETCH_KINDS = [
+    kind.strip()
+    for kind in os.getenv("RECORDING_FETCH_KINDS", "mono,stereo,assistant,customer").split(",")
+    if kind.strip()
+]
+RECORDING_FETCH_WORKERS = int(os.getenv("RECORDING_FETCH_WORKERS", "4"))
+RECORDING_FETCH_TIMEOUT = float(os.getenv("RECORDING_FETCH_TIMEOUT", "30"))
+RECORDING_FETCH_MAX_ATTEMPTS = int(os.getenv("RECORDING_FETCH_MAX_ATTEMPTS", "5"))
+RECORDING_FETCH_POLL_SECONDS = float(os.getenv("RECORDING_FETCH_POLL_SECONDS", "30"))
+RECORDING_STORE_DIR = os.getenv("RECORDING_STORE_DIR", "recordings")
+RECORDING_STORE_MAX_MB = float(os.getenv("RECORDING_STORE_MAX_MB", "2048"))
+
+# Callbacks for calls whose intent is schedule_callback (app/callback_scheduler.py)
+CALLBACK_SCHEDULER_ENABLED = os.getenv("CALLBACK_SCHEDULER_ENABLED", "true").lower() == "true"
+CALLBACK_MAX_CONCURRENT = int(os.getenv("CALLBACK_MAX_CONCURRENT", "5"))
+# Delay after the request, unless the customer asked for "tomorrow"
+CALLBACK_DELAY_MINUTES = float(os.getenv("CALLBACK_DELAY_MINUTES", "60"))
+# Callbacks are only placed in these local hours and days ("" = any time)
+CALLBACK_BUSINESS_HOURS = os.getenv("CALLBACK_BUSINESS_HOURS", "09:00-18:00")
+CALLBACK_BUSINESS_DAYS = os.getenv("CALLBACK_BUSINESS_DAYS", "mon,tue,wed,thu,fri")
+CALLBACK_TIMEZONE = os.getenv("CALLBACK_TIMEZONE", "UTC")
+# Spread callbacks due at the same moment (e.g. opening time) over this many seconds
+CALLBACK_JITTER_SECONDS = float(os.getenv("CALLBACK_JITTER_SECONDS", "300"))
+CALLBACK_MAX_ATTEMPTS = int(os.getenv("CALLBACK_MAX_ATTEMPTS", "3"))
+CALLBACK_RETRY_MINUTES = float(os.getenv("CALLBACK_RETRY_MINUTES", "30"))
+# Callbacks this late (e.g. after downtime) are dropped instead of placed
+CALLBACK_EXPIRE_HOURS = float(os.getenv("CALLBACK_EXPIRE_HOURS", "48"))
+# Callbacks due within this many seconds are held in memory
+CALLBACK_HORIZON_SECONDS = float(os.getenv("CALLBACK_HORIZON_SECONDS", "600"))
+
+# Failed and unanswered outbound calls are dialled again (app/call_retry.py).
+# Policy per failure reason: reason=max retries:first backoff in seconds;
+# the backoff doubles with each retry, up to CALL_RETRY_MAX_DELAY_SECONDS
+CALL_RETRY_ENABLED = os.getenv("CALL_RETRY_ENABLED", "true").lower() == "true"
+CALL_RETRY_POLICY = os.getenv(
+    "CALL_RETRY_POLICY",
+    "provider_error=3:60,network=3:30,rate_limited=5:30,no_answer=2:1800,busy=3:600,voicemail=1:3600",
+)
+CALL_RETRY_MAX_DELAY_SECONDS = float(os.getenv("CALL_RETRY_MAX_DELAY_SECONDS", "21600"))
+CALL_RETRY_WORKERS = int(os.getenv("CALL_RETRY_WORKERS", "4"))
+CALL_RETRY_POLL_SECONDS = float(os.getenv("CALL_RETRY_POLL_SECONDS", "30"))
+
+# Do-not-call list checked before every dial (app/suppression.py): a text
+# file with one number per line, reloaded when it changes
+SUPPRESSION_LIST_PATH = os.getenv("SUPPRESSION_LIST_PATH", "suppression_list.txt")
+SUPPRESSION_RELOAD_SECONDS = float(os.getenv("SUPPRESSION_RELOAD_SECONDS", "60"))
+# Country calling code for numbers written without one (e.g. 555-123-4567)
+PHONE_DEFAULT_COUNTRY_CODE = os.getenv("PHONE_DEFAULT_COUNTRY_CODE", "1").lstrip("+")
+
+# Duplicate dials of a number (app/dial_guard.py): a dial in progress is
+# shared, and one that succeeded within this many seconds is returned
+# instead of calling again (0 only guards dials in progress)
+DIAL_DEDUPE_SECONDS = float(os.getenv("DIAL_DEDUPE_SECONDS", "60"))
+# A number's dial lease lapses after this long (e.g. the process died)
+DIAL_LEASE_SECONDS = float(os.getenv("DIAL_LEASE_SECONDS", "60"))
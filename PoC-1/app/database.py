@@ -1,8 +1,15 @@
 import json
 import sqlite3
 import logging
+import time
 
 from app.call_logic import extract_intent_from_conversation
+from app.call_retry import classify_ended_reason, schedule_call_retries
+from app.callback_scheduler import QUEUE_CALLBACK_SQL, callback_due_at
+from app.call_status import StatusCoalescer, record_status_events
+from app.recording_fetcher import recording_urls
+from app.transcript_search import init_search
+from app.vapi_events import CallAnalysis, CallInfo
 
 
 logger = logging.getLogger(__name__)
@@ -25,10 +32,35 @@ def init_db():
             duration_seconds REAL,
             cost REAL,
             ended_reason TEXT,
+            purpose TEXT,
+            status_changed_at INTEGER,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     """
     )
+    # Columns added after the first release
+    _add_missing_columns(
+        cursor, "calls", {"purpose": "TEXT", "status_changed_at": "INTEGER"}
+    )
+    # For "calls stuck in status X" queries
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_calls_status_changed ON calls (status, status_changed_at)"
+    )
+
+    # Status timeline (app/call_status.py); ts is epoch milliseconds
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS call_status_events (
+            id INTEGER PRIMARY KEY,
+            call_id TEXT NOT NULL,
+            status TEXT NOT NULL,
+            ts INTEGER NOT NULL
+        )
+    """
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_call_status_events_call ON call_status_events (call_id, ts)"
+    )
 
     # Create conversations table
     cursor.execute(
@@ -64,6 +96,68 @@ def init_db():
     """
     )
 
+    # Per-call lookups; webhook writes replace a call's messages and intents
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_conversations_call_id ON conversations (call_id)"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_call_intents_call_id ON call_intents (call_id)"
+    )
+
+    # Recording downloads (app/recording_fetcher.py); one row per call and
+    # kind of recording, next_attempt_at/fetched_at are epoch milliseconds
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS recordings (
+            id INTEGER PRIMARY KEY,
+            call_id TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            url TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            sha256 TEXT,
+            path TEXT,
+            bytes INTEGER,
+            duration_seconds REAL,
+            content_type TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt_at INTEGER NOT NULL DEFAULT 0,
+            error TEXT,
+            fetched_at INTEGER,
+            UNIQUE (call_id, kind)
+        )
+    """
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_recordings_due ON recordings (status, next_attempt_at)"
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_recordings_sha256 ON recordings (sha256)")
+
+    # Callbacks to place (app/callback_scheduler.py); due_at is epoch ms.
+    # Callbacks added through the API have no source call.
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS scheduled_callbacks (
+            id INTEGER PRIMARY KEY,
+            source_call_id TEXT UNIQUE,
+            phone_number TEXT NOT NULL,
+            purpose TEXT,
+            status TEXT NOT NULL DEFAULT 'pending',
+            due_at INTEGER NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            result_call_id TEXT,
+            error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_scheduled_callbacks_due ON scheduled_callbacks (status, due_at)"
+    )
+
+    # Full-text index of messages and summaries (app/transcript_search.py)
+    init_search(cursor)
+
     # For outbound calls
     cursor.execute(
         """
@@ -75,464 +169,320 @@ def init_db():
             status TEXT DEFAULT 'initiated',
             call_id TEXT,
             error_message TEXT,
+            retry_of INTEGER,
+            retry_attempt INTEGER NOT NULL DEFAULT 0,
+            retry_reason TEXT,
+            retry_status TEXT,
+            retry_at INTEGER,
+            lease_expires_at INTEGER,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     """
     )
+    # Retries of failed calls (app/call_retry.py); retry_at is epoch ms
+    _add_missing_columns(
+        cursor,
+        "outbound_requests",
+        {
+            "retry_of": "INTEGER",
+            "retry_attempt": "INTEGER NOT NULL DEFAULT 0",
+            "retry_reason": "TEXT",
+            "retry_status": "TEXT",
+            "retry_at": "INTEGER",
+            "lease_expires_at": "INTEGER",
+        },
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_outbound_requests_call_id ON outbound_requests (call_id)"
+    )
+    # One dial in progress per number, whichever process places it
+    # (app/dial_guard.py), and recent dials of a number
+    cursor.execute(
+        """
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_outbound_requests_dialing
+        ON outbound_requests (phone_number) WHERE status = 'dialing'
+    """
+    )
+    cursor.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_outbound_requests_number
+        ON outbound_requests (phone_number, created_at)
+    """
+    )
+    # Only the retries waiting to be dialled, so finding due ones doesn't
+    # grow with the request history
+    cursor.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_outbound_requests_retry_due
+        ON outbound_requests (retry_at) WHERE retry_status = 'pending'
+    """
+    )
+    # Retry statistics per reason
+    cursor.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_outbound_requests_retry_reason
+        ON outbound_requests (retry_reason, retry_status, retry_at)
+        WHERE retry_reason IS NOT NULL
+    """
+    )
+    cursor.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_outbound_requests_retry_of
+        ON outbound_requests (retry_of) WHERE retry_of IS NOT NULL
+    """
+    )
 
     conn.commit()
     conn.close()
 
 
-def save_call_data(call_data):
-    """Save call data to database"""
-    conn = sqlite3.connect("voice_agent.db")
-    cursor = conn.cursor()
+def _add_missing_columns(cursor, table, columns):
+    """ALTER TABLE ... ADD COLUMN for ``columns`` ({name: type}) that an
+    existing database does not have yet"""
+    existing = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+    for name, column_type in columns.items():
+        if name not in existing:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
 
-    try:
-        call_info = call_data.get("call", {})
-        call_id = call_info.get("id")
 
-        print(call_info, call_id, sep="\n")
+# Merges a webhook into the call row in place: a field is only overwritten
+# when the event carries a value, so data written when the call was placed
+# (phone_number, purpose, created_at) survives, and an update is a single
+# row write instead of the delete and reinsert of INSERT OR REPLACE.
+# Status is not set here; it goes through record_status_events.
+UPSERT_CALL_SQL = """
+    INSERT INTO calls
+    (id, type, status, started_at, ended_at, duration_seconds, cost, ended_reason)
+    VALUES (?1, COALESCE(?2, 'unknown'), 'unknown', ?3, ?4, ?5, ?6, ?7)
+    ON CONFLICT(id) DO UPDATE SET
+        type = COALESCE(?2, type),
+        started_at = COALESCE(?3, started_at),
+        ended_at = COALESCE(?4, ended_at),
+        duration_seconds = COALESCE(?5, duration_seconds),
+        cost = COALESCE(?6, cost),
+        ended_reason = COALESCE(?7, ended_reason)
+"""
 
-        if not call_id:
-            logger.error("No call ID found in call data")
-            return
+# A changed link (e.g. a re-sent report) is fetched again; the same link is
+# left alone whatever its status
+QUEUE_RECORDING_SQL = """
+    INSERT INTO recordings (call_id, kind, url) VALUES (?, ?, ?)
+    ON CONFLICT(call_id, kind) DO UPDATE SET
+        url = excluded.url, status = 'pending', attempts = 0,
+        next_attempt_at = 0, error = NULL
+    WHERE recordings.url != excluded.url
+"""
 
-        # Insert or update call record
-        cursor.execute(
-            """
-            INSERT OR REPLACE INTO calls 
-            (id, type, status, started_at, ended_at, duration_seconds, cost, ended_reason)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-            (
-                call_id,
-                call_info.get("type", "unknown"),
-                call_data.get("message", {}).get("status", "unknown"),
-                call_data.get("startedAt"),
-                call_data.get("endedAt"),
-                call_data.get("durationSeconds"),
-                call_data.get("cost"),
-                call_data.get("endedReason"),
-            ),
+
+def build_call_rows(message):
+    """Turn a webhook ``VapiMessage`` into the rows ``write_call_rows`` stores.
+
+    Pure function (no database access), so event replays can run it in
+    worker processes. Returns None if the event has no call ID.
+    """
+    call_info = message.call or CallInfo()
+    call_id = call_info.id
+    if not call_id:
+        return None
+
+    if message.type == "end-of-call-report":
+        status = "ended"
+    else:
+        status = message.status or call_info.status
+    status_event = None
+    if status:
+        timestamp = message.timestamp or int(time.time() * 1000)
+        status_event = (call_id, status, timestamp)
+
+    # None leaves the stored value alone (see UPSERT_CALL_SQL)
+    call_row = (
+        call_id,
+        call_info.type,
+        message.started_at,
+        message.ended_at,
+        message.duration_seconds,
+        message.cost,
+        message.ended_reason,
+    )
+
+    messages = message.messages
+    message_rows = [
+        (
+            call_id,
+            msg.role or "",
+            msg.message or "",
+            msg.time,
+            msg.seconds_from_start,
+            msg.duration,
         )
+        for msg in messages
+        if msg.role != "system"  # Skip system messages
+    ]
 
-        # Save conversation messages if available
-        messages = call_data.get("messages", [])
-        for msg in messages:
-            if msg["role"] != "system":  # Skip system messages
-                cursor.execute(
-                    """
-                    INSERT OR REPLACE INTO conversations 
-                    (call_id, role, message, timestamp, seconds_from_start, duration)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        call_id,
-                        msg["role"],
-                        msg["message"],
-                        msg.get("time"),
-                        msg.get("secondsFromStart"),
-                        msg.get("duration"),
-                    ),
-                )
-
-        # Extract and save intent if this is an end-of-call report
-        if call_data.get("message", {}).get("type") == "end-of-call-report":
-            intent, confidence, extracted_data = extract_intent_from_conversation(
-                messages
-            )
-            summary = call_data.get("summary", "")
-            success_eval = call_data.get("analysis", {}).get("successEvaluation", "")
-
-            cursor.execute(
-                """
-                INSERT OR REPLACE INTO call_intents 
-                (call_id, intent, confidence, extracted_data, summary, success_evaluation)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    call_id,
-                    intent,
-                    confidence,
-                    json.dumps(extracted_data),
-                    summary,
-                    success_eval,
+    # Extract intent if this is an end-of-call report
+    intent_row = None
+    callback_row = None
+    retry_row = None
+    recording_rows = []
+    if message.type == "end-of-call-report":
+        retry_reason = classify_ended_reason(message.ended_reason)
+        if retry_reason:
+            retry_row = (call_id, retry_reason)
+        recording_rows = [
+            (call_id, kind, url) for kind, url in recording_urls(message).items()
+        ]
+        intent, confidence, extracted_data = extract_intent_from_conversation(messages)
+        analysis = message.analysis or CallAnalysis()
+        intent_row = (
+            call_id,
+            intent,
+            confidence,
+            json.dumps(extracted_data),
+            message.summary or "",
+            analysis.success_evaluation,
+        )
+        if intent == "schedule_callback":
+            requested_at = message.timestamp or int(time.time() * 1000)
+            customer = call_info.customer
+            callback_row = (
+                call_id,
+                customer.number if customer else None,
+                f"Callback requested on call {call_id}",
+                callback_due_at(
+                    requested_at, " ".join(extracted_data["user_responses"]), call_id
                 ),
             )
 
+    return {
+        "call_id": call_id,
+        "call": call_row,
+        "status": status_event,
+        "messages": message_rows,
+        "intent": intent_row,
+        "callback": callback_row,
+        "retry": retry_row,
+        "recordings": recording_rows,
+    }
+
+
+def write_call_rows(cursor, rows):
+    """Write rows from ``build_call_rows``; the caller commits"""
+    write_call_batch(cursor, [rows])
+
+
+def write_call_batch(cursor, batch):
+    """Write a list of ``build_call_rows`` results in arrival order.
+
+    Events carry the full transcript and analysis, so existing messages and
+    intents for a call are replaced. That keeps reprocessing an event
+    (retries, replays from the event archive) idempotent, and means only the
+    last event of each call in the batch decides what is stored, so the
+    batch is collapsed per call and written with a few ``executemany``.
+    Call fields are merged instead: a later event only overrides the
+    fields it has a value for. Status changes are all passed on to
+    ``record_status_events``, which keeps the valid transitions. Recording
+    links are queued for ``app/recording_fetcher.py``, callback requests
+    for ``app/callback_scheduler.py`` and unanswered or failed outbound
+    calls for ``app/call_retry.py``.
+    """
+    calls = {}
+    statuses = []
+    messages = {}
+    intents = {}
+    callbacks = {}
+    retries = {}
+    recordings = []
+    for rows in batch:
+        call_id = rows["call_id"]
+        if rows["status"]:
+            statuses.append(rows["status"])
+        previous = calls.get(call_id)
+        if previous is None:
+            calls[call_id] = rows["call"]
+        else:
+            calls[call_id] = tuple(
+                new if new is not None else old
+                for old, new in zip(previous, rows["call"])
+            )
+        if rows["messages"]:
+            messages[call_id] = rows["messages"]
+        if rows["intent"]:
+            intents[call_id] = rows["intent"]
+        if rows["callback"]:
+            callbacks.setdefault(call_id, rows["callback"])
+        if rows["retry"]:
+            retries.setdefault(call_id, rows["retry"])
+        recordings.extend(rows["recordings"])
+
+    cursor.executemany(UPSERT_CALL_SQL, calls.values())
+    record_status_events(cursor, statuses)
+
+    if messages:
+        cursor.executemany(
+            "DELETE FROM conversations WHERE call_id = ?",
+            [(call_id,) for call_id in messages],
+        )
+        cursor.executemany(
+            """
+            INSERT INTO conversations 
+            (call_id, role, message, timestamp, seconds_from_start, duration)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """,
+            [row for call_messages in messages.values() for row in call_messages],
+        )
+
+    if intents:
+        cursor.executemany(
+            "DELETE FROM call_intents WHERE call_id = ?",
+            [(call_id,) for call_id in intents],
+        )
+        cursor.executemany(
+            """
+            INSERT INTO call_intents 
+            (call_id, intent, confidence, extracted_data, summary, success_evaluation)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """,
+            intents.values(),
+        )
+
+    if callbacks:
+        cursor.executemany(QUEUE_CALLBACK_SQL, callbacks.values())
+
+    if retries:
+        schedule_call_retries(cursor, retries.values())
+
+    if recordings:
+        cursor.executemany(QUEUE_RECORDING_SQL, recordings)
+
+
+def save_call_data(message, conn=None):
+    """Save a webhook ``VapiMessage`` to the database.
+
+    Opens and commits its own connection unless ``conn`` is given, in which
+    case the caller commits (e.g. to batch many events per transaction).
+    """
+    rows = build_call_rows(message)
+    if rows is None:
+        logger.error("No call ID found in call data")
+        return
+
+    if conn is not None:
+        write_call_rows(conn.cursor(), rows)
+        return
+
+    conn = sqlite3.connect("voice_agent.db")
+    try:
+        write_call_rows(conn.cursor(), rows)
         conn.commit()
-        logger.info(f"Successfully saved call data for call ID: {call_id}")
+        logger.info(f"Successfully saved call data for call ID: {rows['call_id']}")
 
     except Exception as e:
         logger.error(f"Error saving call data: {str(e)}")
-        print("Error saving call data:", str(e))
         conn.rollback()
     finally:
         conn.close()
 
 
-{
-    "message": {
-        "timestamp": 1749546420647,
-        "type": "status-update",
-        "status": "in-progress",
-        "artifact": {
-            "messages": [
-                {
-                    "role": "system",
-                    "message": "You are a helpful customer support agent for Cogniwide.\nGreet the user, ask if their internet issue is resolved.\nIf yes, say thanks and end the call.\nIf no, ask if they want to schedule a callback.",
-                    "time": 1749546415876,
-                    "secondsFromStart": 0,
-                }
-            ],
-            "messagesOpenAIFormatted": [
-                {
-                    "role": "system",
-                    "content": "You are a helpful customer support agent for Cogniwide.\nGreet the user, ask if their internet issue is resolved.\nIf yes, say thanks and end the call.\nIf no, ask if they want to schedule a callback.",
-                }
-            ],
-        },
-        "call": {
-            "id": "73daba4d-2bcc-4cca-8e49-3d7903467ade",
-            "orgId": "aeccb59a-73ea-4033-baae-51833f9ed571",
-            "createdAt": "2025-06-10T09:06:55.710Z",
-            "updatedAt": "2025-06-10T09:06:55.710Z",
-            "type": "webCall",
-            "monitor": {
-                "listenUrl": "wss://phone-call-websocket.aws-us-west-2-backend-production2.vapi.ai/73daba4d-2bcc-4cca-8e49-3d7903467ade/listen",
-                "controlUrl": "https://phone-call-websocket.aws-us-west-2-backend-production2.vapi.ai/73daba4d-2bcc-4cca-8e49-3d7903467ade/control",
-            },
-            "transport": {
-                "provider": "daily",
-                "assistantVideoEnabled": False,
-                "callUrl": "https://vapi.daily.co/yJPTsCsAtxVnVkqIgWyZ",
-            },
-            "webCallUrl": "https://vapi.daily.co/yJPTsCsAtxVnVkqIgWyZ",
-            "status": "queued",
-            "assistantId": "054ea7e1-a5fc-4b9c-8c7c-9c6e80d21921",
-            "assistantOverrides": {"clientMessages": ["transfer-update", "transcript"]},
-        },
-        "assistant": {
-            "id": "054ea7e1-a5fc-4b9c-8c7c-9c6e80d21921",
-            "orgId": "aeccb59a-73ea-4033-baae-51833f9ed571",
-            "name": "Finzie",
-            "voice": {"voiceId": "Elliot", "provider": "vapi"},
-            "createdAt": "2025-06-10T07:49:12.531Z",
-            "updatedAt": "2025-06-10T09:05:22.146Z",
-            "model": {
-                "model": "gpt-4o-mini",
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": "You are a helpful customer support agent for Cogniwide.\nGreet the user, ask if their internet issue is resolved.\nIf yes, say thanks and end the call.\nIf no, ask if they want to schedule a callback.",
-                    }
-                ],
-                "provider": "openai",
-                "temperature": 0.7,
-            },
-            "firstMessage": "Hello.",
-            "voicemailMessage": "Please call back when you're available.",
-            "endCallMessage": "Goodbye.",
-            "transcriber": {
-                "model": "nova-2",
-                "language": "en",
-                "provider": "deepgram",
-            },
-            "clientMessages": ["transfer-update", "transcript"],
-            "server": {
-                "url": "https://40d8-183-82-160-130.ngrok-free.app/webhook",
-                "timeoutSeconds": 20,
-            },
-        },
-    }
-}
-
-
-{
-    "message": {
-        "timestamp": 1749546450909,
-        "type": "end-of-call-report",
-        "analysis": {
-            "summary": "The AI called to follow up on a user's internet issue. The user confirmed that the issue had been resolved, and the AI ended the call after receiving this confirmation.",
-            "successEvaluation": "true",
-        },
-        "artifact": {
-            "messages": [
-                {
-                    "role": "system",
-                    "message": "You are a helpful customer support agent for Cogniwide.\nGreet the user, ask if their internet issue is resolved.\nIf yes, say thanks and end the call.\nIf no, ask if they want to schedule a callback.",
-                    "time": 1749546415876,
-                    "secondsFromStart": 0,
-                },
-                {
-                    "role": "bot",
-                    "message": "Hello?",
-                    "time": 1749546417519,
-                    "endTime": 1749546418019,
-                    "secondsFromStart": 1.28,
-                    "duration": 500,
-                    "source": "",
-                },
-                {
-                    "role": "user",
-                    "message": "Okay.",
-                    "time": 1749546419759,
-                    "endTime": 1749546420259,
-                    "secondsFromStart": 3.52,
-                    "duration": 500,
-                },
-                {
-                    "role": "bot",
-                    "message": "Hi there. I hope you're doing well. I wanted to check-in see if your Internet issue has been resolved.",
-                    "time": 1749546422419,
-                    "endTime": 1749546429009,
-                    "secondsFromStart": 6.18,
-                    "duration": 6280,
-                    "source": "",
-                },
-                {
-                    "role": "user",
-                    "message": "Yes. It has been.",
-                    "time": 1749546430259,
-                    "endTime": 1749546431559,
-                    "secondsFromStart": 14.02,
-                    "duration": 1300,
-                },
-                {
-                    "role": "bot",
-                    "message": "That's great to hear. You for letting me know. Um, if you need any further assistance in the future, feel free to reach out. Have a wonderful day.",
-                    "time": 1749546432989,
-                    "endTime": 1749546441049,
-                    "secondsFromStart": 16.75,
-                    "duration": 7030,
-                    "source": "",
-                },
-            ],
-            "messagesOpenAIFormatted": [
-                {
-                    "role": "system",
-                    "content": "You are a helpful customer support agent for Cogniwide.\nGreet the user, ask if their internet issue is resolved.\nIf yes, say thanks and end the call.\nIf no, ask if they want to schedule a callback.",
-                },
-                {"role": "assistant", "content": "Hello?"},
-                {"role": "user", "content": "Okay."},
-                {
-                    "role": "assistant",
-                    "content": "Hi there. I hope you're doing well. I wanted to check-in see if your Internet issue has been resolved.",
-                },
-                {"role": "user", "content": "Yes. It has been."},
-                {
-                    "role": "assistant",
-                    "content": "That's great to hear. You for letting me know. Um, if you need any further assistance in the future, feel free to reach out. Have a wonderful day.",
-                },
-            ],
-            "transcript": "AI: Hello?\nUser: Okay.\nAI: Hi there. I hope you're doing well. I wanted to check-in see if your Internet issue has been resolved.\nUser: Yes. It has been.\nAI: That's great to hear. You for letting me know. Um, if you need any further assistance in the future, feel free to reach out. Have a wonderful day.\n",
-            "recordingUrl": "https://storage.vapi.ai/73daba4d-2bcc-4cca-8e49-3d7903467ade-1749546448431-3ef3457e-6fe6-4410-b76d-7b135cd4901e-mono.wav",
-            "stereoRecordingUrl": "https://storage.vapi.ai/73daba4d-2bcc-4cca-8e49-3d7903467ade-1749546448431-2df6e5bd-59d4-4ef3-81d5-7024bef0ce08-stereo.wav",
-            "recording": {
-                "stereoUrl": "https://storage.vapi.ai/73daba4d-2bcc-4cca-8e49-3d7903467ade-1749546448431-2df6e5bd-59d4-4ef3-81d5-7024bef0ce08-stereo.wav",
-                "mono": {
-                    "combinedUrl": "https://storage.vapi.ai/73daba4d-2bcc-4cca-8e49-3d7903467ade-1749546448431-3ef3457e-6fe6-4410-b76d-7b135cd4901e-mono.wav",
-                    "assistantUrl": "https://storage.vapi.ai/73daba4d-2bcc-4cca-8e49-3d7903467ade-1749546448431-40c52d21-edb4-45e3-bacd-8c607f779a93-mono.wav",
-                    "customerUrl": "https://storage.vapi.ai/73daba4d-2bcc-4cca-8e49-3d7903467ade-1749546448431-9ab3c0a5-d478-4277-93cc-189a4b7c9e62-mono.wav",
-                },
-            },
-            "nodes": [],
-            "variables": {},
-        },
-        "startedAt": "2025-06-10T09:07:00.649Z",
-        "endedAt": "2025-06-10T09:07:25.925Z",
-        "endedReason": "customer-ended-call",
-        "cost": 0.0394,
-        "costBreakdown": {
-            "stt": 0.0056,
-            "llm": 0.0001,
-            "tts": 0.0126,
-            "vapi": 0.0211,
-            "total": 0.0394,
-            "llmPromptTokens": 257,
-            "llmCompletionTokens": 57,
-            "ttsCharacters": 251,
-            "voicemailDetectionCost": 0,
-            "knowledgeBaseCost": 0,
-            "analysisCostBreakdown": {
-                "summary": 0,
-                "summaryPromptTokens": 147,
-                "summaryCompletionTokens": 35,
-                "structuredData": 0,
-                "structuredDataPromptTokens": 0,
-                "structuredDataCompletionTokens": 0,
-                "successEvaluation": 0,
-                "successEvaluationPromptTokens": 251,
-                "successEvaluationCompletionTokens": 1,
-            },
-        },
-        "costs": [
-            {
-                "type": "transcriber",
-                "transcriber": {"provider": "deepgram", "model": "nova-2"},
-                "minutes": 0.5009166666666667,
-                "cost": 0.00562928,
-            },
-            {
-                "type": "model",
-                "model": {"provider": "openai", "model": "gpt-4o-mini"},
-                "promptTokens": 257,
-                "completionTokens": 57,
-                "cost": 7.275e-05,
-            },
-            {
-                "type": "voice",
-                "voice": {
-                    "provider": "vapi",
-                    "voiceId": "dN8hviqdNrAsEcL57yFj",
-                    "model": "eleven_turbo_v2_5",
-                },
-                "characters": 251,
-                "cost": 0.01255,
-            },
-            {"type": "vapi", "subType": "normal", "minutes": 0.4213, "cost": 0.021065},
-            {
-                "type": "analysis",
-                "analysisType": "summary",
-                "model": {
-                    "provider": "google",
-                    "model": "gemini-2.5-flash-preview-04-17",
-                },
-                "promptTokens": 147,
-                "completionTokens": 35,
-                "cost": 4.305e-05,
-            },
-            {
-                "type": "analysis",
-                "analysisType": "successEvaluation",
-                "model": {
-                    "provider": "google",
-                    "model": "gemini-2.5-flash-preview-04-17",
-                },
-                "promptTokens": 251,
-                "completionTokens": 1,
-                "cost": 3.825e-05,
-            },
-            {
-                "type": "knowledge-base",
-                "model": {"provider": "google", "model": "gemini-1.5-flash"},
-                "promptTokens": 0,
-                "completionTokens": 0,
-                "cost": 0,
-            },
-        ],
-        "durationMs": 25276,
-        "durationSeconds": 25.276,
-        "durationMinutes": 0.4213,
-        "summary": "The AI called to follow up on a user's internet issue. The user confirmed that the issue had been resolved, and the AI ended the call after receiving this confirmation.",
-        "transcript": "AI: Hello?\nUser: Okay.\nAI: Hi there. I hope you're doing well. I wanted to check-in see if your Internet issue has been resolved.\nUser: Yes. It has been.\nAI: That's great to hear. You for letting me know. Um, if you need any further assistance in the future, feel free to reach out. Have a wonderful day.\n",
-        "messages": [
-            {
-                "role": "system",
-                "message": "You are a helpful customer support agent for Cogniwide.\nGreet the user, ask if their internet issue is resolved.\nIf yes, say thanks and end the call.\nIf no, ask if they want to schedule a callback.",
-                "time": 1749546415876,
-                "secondsFromStart": 0,
-            },
-            {
-                "role": "bot",
-                "message": "Hello?",
-                "time": 1749546417519,
-                "endTime": 1749546418019,
-                "secondsFromStart": 1.28,
-                "duration": 500,
-                "source": "",
-            },
-            {
-                "role": "user",
-                "message": "Okay.",
-                "time": 1749546419759,
-                "endTime": 1749546420259,
-                "secondsFromStart": 3.52,
-                "duration": 500,
-            },
-            {
-                "role": "bot",
-                "message": "Hi there. I hope you're doing well. I wanted to check-in see if your Internet issue has been resolved.",
-                "time": 1749546422419,
-                "endTime": 1749546429009,
-                "secondsFromStart": 6.18,
-                "duration": 6280,
-                "source": "",
-            },
-            {
-                "role": "user",
-                "message": "Yes. It has been.",
-                "time": 1749546430259,
-                "endTime": 1749546431559,
-                "secondsFromStart": 14.02,
-                "duration": 1300,
-            },
-            {
-                "role": "bot",
-                "message": "That's great to hear. You for letting me know. Um, if you need any further assistance in the future, feel free to reach out. Have a wonderful day.",
-                "time": 1749546432989,
-                "endTime": 1749546441049,
-                "secondsFromStart": 16.75,
-                "duration": 7030,
-                "source": "",
-            },
-        ],
-        "recordingUrl": "https://storage.vapi.ai/73daba4d-2bcc-4cca-8e49-3d7903467ade-1749546448431-3ef3457e-6fe6-4410-b76d-7b135cd4901e-mono.wav",
-        "stereoRecordingUrl": "https://storage.vapi.ai/73daba4d-2bcc-4cca-8e49-3d7903467ade-1749546448431-2df6e5bd-59d4-4ef3-81d5-7024bef0ce08-stereo.wav",
-        "call": {
-            "id": "73daba4d-2bcc-4cca-8e49-3d7903467ade",
-            "orgId": "aeccb59a-73ea-4033-baae-51833f9ed571",
-            "createdAt": "2025-06-10T09:06:55.710Z",
-            "updatedAt": "2025-06-10T09:06:55.710Z",
-            "type": "webCall",
-            "monitor": {
-                "listenUrl": "wss://phone-call-websocket.aws-us-west-2-backend-production2.vapi.ai/73daba4d-2bcc-4cca-8e49-3d7903467ade/listen",
-                "controlUrl": "https://phone-call-websocket.aws-us-west-2-backend-production2.vapi.ai/73daba4d-2bcc-4cca-8e49-3d7903467ade/control",
-            },
-            "transport": {
-                "provider": "daily",
-                "assistantVideoEnabled": False,
-                "callUrl": "https://vapi.daily.co/yJPTsCsAtxVnVkqIgWyZ",
-            },
-            "webCallUrl": "https://vapi.daily.co/yJPTsCsAtxVnVkqIgWyZ",
-            "status": "queued",
-            "assistantId": "054ea7e1-a5fc-4b9c-8c7c-9c6e80d21921",
-            "assistantOverrides": {"clientMessages": ["transfer-update", "transcript"]},
-        },
-        "assistant": {
-            "id": "054ea7e1-a5fc-4b9c-8c7c-9c6e80d21921",
-            "orgId": "aeccb59a-73ea-4033-baae-51833f9ed571",
-            "name": "Finzie",
-            "voice": {"voiceId": "Elliot", "provider": "vapi"},
-            "createdAt": "2025-06-10T07:49:12.531Z",
-            "updatedAt": "2025-06-10T09:05:22.146Z",
-            "model": {
-                "model": "gpt-4o-mini",
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": "You are a helpful customer support agent for Cogniwide.\nGreet the user, ask if their internet issue is resolved.\nIf yes, say thanks and end the call.\nIf no, ask if they want to schedule a callback.",
-                    }
-                ],
-                "provider": "openai",
-                "temperature": 0.7,
-            },
-            "firstMessage": "Hello.",
-            "voicemailMessage": "Please call back when you're available.",
-            "endCallMessage": "Goodbye.",
-            "transcriber": {
-                "model": "nova-2",
-                "language": "en",
-                "provider": "deepgram",
-            },
-            "clientMessages": ["transfer-update", "transcript"],
-            "server": {
-                "url": "https://40d8-183-82-160-130.ngrok-free.app/webhook",
-                "timeoutSeconds": 20,
-            },
-        },
-    }
-}
+# Writes status-update webhooks in short batches (see app/call_status.py)
+status_coalescer = StatusCoalescer(write_call_batch)
@@ -0,0 +1,224 @@
+"""
+Per-number guard against duplicate dials.
+
+A retried client request, a callback and a retry coming due together, or
+two app processes can all ask to call the same number at once. Only one
+of them reaches Vapi; the others get its result (``duplicate`` set).
+
+In the process, ``DialGuard.dial`` keeps a lease per number: the first
+dial creates it and the rest wait on it. A lease lasts
+``DIAL_LEASE_SECONDS`` while the dial is in progress and, once the call
+is placed, ``DIAL_DEDUPE_SECONDS`` more, during which the call id is
+returned instead of dialling again. A failed dial releases the lease.
+
+Across processes, the dial is an ``outbound_requests`` row with status
+``dialing``, and a unique partial index allows one such row per number.
+``DialGuard.claim`` inserts it (after checking for a call placed within
+the window); a process that finds one waits for its outcome. The row
+carries ``lease_expires_at``, so a row left ``dialing`` by a process that
+died is marked ``abandoned`` and the number can be dialled again.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import time
+
+from app.call_retry import retry_attempt, schedule_retry
+from app.config import DIAL_DEDUPE_SECONDS, DIAL_LEASE_SECONDS
+
+
+logger = logging.getLogger(__name__)
+
+# How often a process waiting on another one's dial checks its row
+WAIT_POLL_SECONDS = 0.1
+
+
+class DialLease:
+    __slots__ = ("future", "expires_at")
+
+    def __init__(self, future, expires_at):
+        self.future = future
+        self.expires_at = expires_at
+
+
+class DialGuard:
+    def __init__(
+        self,
+        window_seconds=DIAL_DEDUPE_SECONDS,
+        lease_seconds=DIAL_LEASE_SECONDS,
+        db_path="voice_agent.db",
+    ):
+        self.window_seconds = window_seconds
+        self.lease_seconds = lease_seconds
+        self.db_path = db_path
+        self._leases = {}  # E.164 number -> DialLease
+        self._sweep_at = 1024
+
+    # --- In the process ----------------------------------------------------
+
+    async def dial(self, phone_number, place):
+        """Result of ``place()`` (a coroutine function placing the call), or
+        of the dial of ``phone_number`` already in progress or just placed"""
+        now = time.monotonic()
+        lease = self._leases.get(phone_number)
+        if lease is not None and lease.expires_at > now:
+            result = await asyncio.shield(lease.future)
+            return {**result, "duplicate": True}
+
+        lease = DialLease(asyncio.get_running_loop().create_future(), now + self.lease_seconds)
+        self._leases[phone_number] = lease
+        if len(self._leases) > self._sweep_at:
+            self._sweep(now)
+        try:
+            result = await place()
+        except asyncio.CancelledError:
+            self._release(phone_number, lease)
+            lease.future.cancel()
+            raise
+        except Exception as e:
+            self._release(phone_number, lease)
+            lease.future.set_exception(e)
+            lease.future.exception()  # waiters re-raise it; no "never retrieved" warning
+            raise
+
+        lease.future.set_result(result)
+        if result.get("success") and self.window_seconds > 0:
+            lease.expires_at = time.monotonic() + self.window_seconds
+        else:
+            self._release(phone_number, lease)
+        return result
+
+    def _release(self, phone_number, lease):
+        if self._leases.get(phone_number) is lease:
+            del self._leases[phone_number]
+
+    def _sweep(self, now):
+        expired = [number for number, lease in self._leases.items() if lease.expires_at <= now]
+        for number in expired:
+            del self._leases[number]
+        self._sweep_at = max(1024, 2 * len(self._leases))
+
+    # --- Across processes (blocking; run in a worker thread) ---------------
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def claim(self, phone_number, assistant_id, purpose, retry_of=None):
+        """Record a dial of ``phone_number``. Returns (request id, None) if
+        this process may dial, else (None, result of the other dial)."""
+        now_ms = int(time.time() * 1000)
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                """
+                UPDATE outbound_requests
+                SET status = 'abandoned', error_message = 'Dial lease expired',
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE phone_number = ? AND status = 'dialing' AND lease_expires_at < ?
+            """,
+                (phone_number, now_ms),
+            )
+            if self.window_seconds > 0:
+                placed = conn.execute(
+                    """
+                    SELECT call_id FROM outbound_requests
+                    WHERE phone_number = ? AND status = 'success'
+                      AND created_at >= datetime('now', ?)
+                    ORDER BY created_at DESC LIMIT 1
+                """,
+                    (phone_number, f"-{self.window_seconds} seconds"),
+                ).fetchone()
+                if placed:
+                    conn.commit()
+                    return None, {"success": True, "call_id": placed[0], "duplicate": True}
+            try:
+                cursor = conn.execute(
+                    """
+                    INSERT INTO outbound_requests
+                    (phone_number, assistant_id, purpose, status, retry_of, retry_attempt,
+                     lease_expires_at)
+                    VALUES (?, ?, ?, 'dialing', ?, ?, ?)
+                """,
+                    (
+                        phone_number,
+                        assistant_id,
+                        purpose,
+                        retry_of,
+                        retry_attempt(conn, retry_of),
+                        now_ms + int(self.lease_seconds * 1000),
+                    ),
+                )
+            except sqlite3.IntegrityError:
+                # Another process holds the number (idx_outbound_requests_dialing)
+                other = conn.execute(
+                    "SELECT id FROM outbound_requests WHERE phone_number = ? AND status = 'dialing'",
+                    (phone_number,),
+                ).fetchone()
+                conn.rollback()
+                return None, self._wait_for(other[0])
+            conn.commit()
+            return cursor.lastrowid, None
+        finally:
+            conn.close()
+
+    def _wait_for(self, request_id):
+        """Outcome of another process's dial, once it has one"""
+        deadline = time.monotonic() + self.lease_seconds
+        while time.monotonic() < deadline:
+            time.sleep(WAIT_POLL_SECONDS)
+            conn = self._connect()
+            try:
+                status, call_id, error = conn.execute(
+                    "SELECT status, call_id, error_message FROM outbound_requests WHERE id = ?",
+                    (request_id,),
+                ).fetchone()
+            finally:
+                conn.close()
+            if status != "dialing":
+                return {
+                    "success": status == "success",
+                    "call_id": call_id,
+                    "error": error,
+                    "duplicate": True,
+                }
+        return {"success": False, "error": "Another dial of this number did not finish"}
+
+    def finish(
+        self,
+        request_id,
+        status,
+        call_id=None,
+        error_message=None,
+        failure_reason=None,
+        retry_after=None,
+    ):
+        """Record the outcome of a claimed dial, scheduling a retry for a
+        ``failure_reason`` (app/call_retry.py)"""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                UPDATE outbound_requests
+                SET status = ?, call_id = ?, error_message = ?, lease_expires_at = NULL,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """,
+                (status, call_id, error_message, request_id),
+            )
+            if failure_reason:
+                attempt = cursor.execute(
+                    "SELECT retry_attempt FROM outbound_requests WHERE id = ?", (request_id,)
+                ).fetchone()[0]
+                schedule_retry(cursor, request_id, failure_reason, attempt, retry_after)
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Error recording outbound request {request_id}: {str(e)}")
+            conn.rollback()
+        finally:
+            conn.close()
+
+
+dial_guard = DialGuard()
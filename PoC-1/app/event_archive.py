@@ -0,0 +1,176 @@
+"""
+Append-only archive of raw Vapi webhook events.
+
+Events are buffered in memory and written as compressed NDJSON, one line
+``{"received_at": <epoch ms>, "event": <webhook body>}`` per event, with
+the body kept as Vapi sent it. Segments are per hour and per process
+(``events-YYYYMMDDHH-<pid>.ndjson.gz``, or ``.zst`` with zstd), so several
+workers never append to the same file and a date range maps to a set of
+file names without opening them. Every flush
+appends one gzip member / zstd frame; concatenated members and frames are
+valid gzip / zstd streams, so a segment stays readable even if the process
+dies between flushes.
+
+``app/event_replay.py`` reads the segments back to rebuild the database.
+"""
+
+import glob
+import gzip
+import io
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+from app.config import (
+    EVENT_ARCHIVE_COMPRESSION,
+    EVENT_ARCHIVE_DIR,
+    EVENT_ARCHIVE_ENABLED,
+    EVENT_ARCHIVE_FLUSH_EVENTS,
+)
+from app.vapi_events import decode_archived_event
+
+
+logger = logging.getLogger(__name__)
+
+HOUR_FORMAT = "%Y%m%d%H"
+EXTENSIONS = {"gzip": ".ndjson.gz", "zstd": ".ndjson.zst"}
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def segment_hour(path):
+    """UTC hour a segment covers, from its file name"""
+    stamp = os.path.basename(path).split("-")[1]
+    return datetime.strptime(stamp, HOUR_FORMAT).replace(tzinfo=timezone.utc)
+
+
+def iter_segments(directory=EVENT_ARCHIVE_DIR, since=None, until=None):
+    """Segment paths overlapping [since, until), oldest hour first.
+
+    ``since``/``until`` are timezone-aware datetimes; None means unbounded.
+    """
+    paths = glob.glob(os.path.join(directory, "events-*.ndjson.*"))
+    selected = []
+    for path in paths:
+        hour = segment_hour(path)
+        if since is not None and hour.timestamp() + 3600 <= since.timestamp():
+            continue
+        if until is not None and hour >= until:
+            continue
+        selected.append(path)
+    return sorted(selected, key=lambda path: (segment_hour(path), path))
+
+
+def _open_segment(path):
+    if path.endswith(".zst"):
+        zstandard = _zstandard()
+        if zstandard is None:
+            raise RuntimeError(f"zstandard is required to read {path}")
+        raw = open(path, "rb")
+        reader = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+        return io.BufferedReader(reader)
+    return gzip.open(path, "rb")
+
+
+def read_segment(path, since_ms=None, until_ms=None):
+    """Yield (received_at_ms, ``VapiEvent``) from a segment, optionally by
+    time range"""
+    with _open_segment(path) as f:
+        try:
+            for line in f:
+                try:
+                    record = decode_archived_event(line)
+                except (ValueError, TypeError) as e:
+                    # Archived as received; not an event the model can read
+                    logger.warning(f"Skipping undecodable event in {path}: {e}")
+                    continue
+                received_at = record.received_at
+                if since_ms is not None and received_at < since_ms:
+                    continue
+                if until_ms is not None and received_at >= until_ms:
+                    continue
+                yield received_at, record.event
+        except (EOFError, OSError) as e:
+            # A member cut short by a crash mid-flush; keep what was read
+            logger.warning(f"Truncated event segment {path}: {e}")
+
+
+class EventArchive:
+    """Buffers raw webhook events and flushes them to compressed segments"""
+
+    def __init__(
+        self,
+        directory=EVENT_ARCHIVE_DIR,
+        compression=EVENT_ARCHIVE_COMPRESSION,
+        flush_events=EVENT_ARCHIVE_FLUSH_EVENTS,
+        enabled=EVENT_ARCHIVE_ENABLED,
+    ):
+        if compression == "zstd" and _zstandard() is None:
+            logger.warning("zstandard is not installed, archiving events with gzip")
+            compression = "gzip"
+        if compression not in EXTENSIONS:
+            raise ValueError(f"Unknown event archive compression: {compression}")
+        self.directory = directory
+        self.compression = compression
+        self.flush_events = flush_events
+        self.enabled = enabled
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def append(self, body, received_at_ms=None):
+        """Queue one raw webhook body (JSON bytes); flushes once the buffer
+        is full"""
+        if not self.enabled:
+            return
+        if received_at_ms is None:
+            received_at_ms = int(time.time() * 1000)
+        # The body is stored as received rather than re-encoded. Newlines in
+        # JSON can only be whitespace between tokens, so they can be blanked.
+        body = body.replace(b"\n", b" ").replace(b"\r", b" ")
+        line = b'{"received_at":%d,"event":%s}' % (received_at_ms, body)
+        with self._lock:
+            self._buffer.append((received_at_ms, line))
+            full = len(self._buffer) >= self.flush_events
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Write buffered events; returns how many were written"""
+        with self._lock:
+            pending, self._buffer = self._buffer, []
+        if not pending:
+            return 0
+
+        by_hour = {}
+        for received_at_ms, line in pending:
+            hour = datetime.fromtimestamp(received_at_ms / 1000, tz=timezone.utc)
+            by_hour.setdefault(hour.strftime(HOUR_FORMAT), []).append(line)
+
+        with self._write_lock:
+            os.makedirs(self.directory, exist_ok=True)
+            for hour, lines in by_hour.items():
+                data = b"\n".join(lines) + b"\n"
+                with open(self._segment_path(hour), "ab") as f:
+                    f.write(self._compress(data))
+        return len(pending)
+
+    def _segment_path(self, hour):
+        name = f"events-{hour}-{os.getpid()}{EXTENSIONS[self.compression]}"
+        return os.path.join(self.directory, name)
+
+    def _compress(self, data):
+        if self.compression == "zstd":
+            return _zstandard().ZstdCompressor(level=3).compress(data)
+        return gzip.compress(data, compresslevel=6)
+
+
+event_archive = EventArchive()
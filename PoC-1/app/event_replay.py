@@ -0,0 +1,221 @@
+"""
+Replay archived webhook events into the database (backfill / rebuild).
+
+Segments from ``app/event_archive.py`` are decompressed, parsed and turned
+into rows (including intent extraction) by a pool of worker processes; the
+main process writes each hour of events in one transaction, in arrival
+order, with the same code path as the webhook (``write_call_batch``). Writes are idempotent, so
+replaying an event that was already stored leaves the database unchanged.
+
+After each hour is committed the checkpoint file records the segments done
+and their sizes; a rerun with the same checkpoint skips them, and picks up
+segments that have grown since (the current hour) or are new.
+
+Usage (from the PoC-1 directory):
+    python -m app.event_replay --since 2025-06-01 --until 2025-06-02
+    python -m app.event_replay --dry-run
+    python -m app.event_replay --checkpoint replay.checkpoint.json --workers 8
+"""
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from itertools import chain, groupby
+
+from app.config import EVENT_ARCHIVE_DIR
+from app.database import build_call_rows, write_call_batch
+from app.event_archive import iter_segments, read_segment, segment_hour
+from app.vapi_events import event_message
+
+
+logger = logging.getLogger(__name__)
+
+DB_PATH = "voice_agent.db"
+
+
+def parse_time(value):
+    """ISO date or datetime; naive values are taken as UTC"""
+    if value is None:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _to_ms(moment):
+    return None if moment is None else int(moment.timestamp() * 1000)
+
+
+def process_segment(path, since_ms=None, until_ms=None):
+    """Worker: parse a segment into (received_at, event_type, rows) tuples"""
+    results = []
+    for received_at, event in read_segment(path, since_ms, until_ms):
+        message = event_message(event)
+        results.append((received_at, message.type, build_call_rows(message)))
+    return results
+
+
+def load_checkpoint(path):
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f).get("segments", {})
+
+
+def save_checkpoint(path, done):
+    if not path:
+        return
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump({"segments": done}, f)
+    os.replace(tmp, path)
+
+
+def replay_events(
+    since=None,
+    until=None,
+    directory=EVENT_ARCHIVE_DIR,
+    db_path=DB_PATH,
+    workers=None,
+    checkpoint=None,
+    dry_run=False,
+    progress=None,
+):
+    """Replay archived events in [since, until); returns a summary dict"""
+    started = time.perf_counter()
+    since_ms, until_ms = _to_ms(since), _to_ms(until)
+    done = load_checkpoint(checkpoint)
+
+    # Segment sizes are taken up front so the checkpoint never claims bytes
+    # appended while the replay was running
+    segments = [
+        (path, os.path.getsize(path))
+        for path in iter_segments(directory, since, until)
+    ]
+    pending = [
+        (path, size)
+        for path, size in segments
+        if done.get(os.path.basename(path)) != size
+    ]
+
+    summary = {
+        "segments": len(segments),
+        "segments_skipped": len(segments) - len(pending),
+        "events": 0,
+        "calls": 0,
+        "event_types": Counter(),
+        "intents": Counter(),
+        "skipped_events": 0,
+        "dry_run": dry_run,
+    }
+    calls = set()
+
+    conn = None if dry_run else sqlite3.connect(db_path)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Keep a few segments per worker in flight so parsing runs ahead
+            # of the (single) writer without holding the whole archive in memory
+            window = 2 * (workers or os.cpu_count() or 1)
+            queued = iter(pending)
+            in_flight = deque()
+
+            def fill():
+                while len(in_flight) < window:
+                    item = next(queued, None)
+                    if item is None:
+                        return
+                    future = pool.submit(process_segment, item[0], since_ms, until_ms)
+                    in_flight.append((item, future))
+
+            for hour, group in groupby(pending, key=lambda item: segment_hour(item[0])):
+                group = list(group)
+                parsed = []
+                for _ in group:
+                    fill()
+                    _, future = in_flight.popleft()
+                    parsed.append(future.result())
+                fill()
+                # Segments of one hour come from different processes; merge
+                # them so every call's events are applied in arrival order
+                # (each segment is already nearly sorted, which sort exploits)
+                events = sorted(chain.from_iterable(parsed), key=lambda item: item[0])
+
+                batch = []
+                for _, event_type, rows in events:
+                    summary["event_types"][event_type] += 1
+                    if rows is None:
+                        summary["skipped_events"] += 1
+                        continue
+                    calls.add(rows["call_id"])
+                    if rows["intent"]:
+                        summary["intents"][rows["intent"][1]] += 1
+                    batch.append(rows)
+                if conn is not None:
+                    write_call_batch(conn.cursor(), batch)
+                    conn.commit()
+
+                summary["events"] += len(events)
+                if not dry_run:
+                    done.update((os.path.basename(path), size) for path, size in group)
+                    save_checkpoint(checkpoint, done)
+                if progress is not None:
+                    progress(hour, summary)
+    except Exception:
+        if conn is not None:
+            conn.rollback()
+        raise
+    finally:
+        if conn is not None:
+            conn.close()
+
+    elapsed = time.perf_counter() - started
+    summary.update(
+        calls=len(calls),
+        event_types=dict(summary["event_types"]),
+        intents=dict(summary["intents"]),
+        seconds=round(elapsed, 2),
+        events_per_second=round(summary["events"] / elapsed, 1) if elapsed else 0.0,
+    )
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--since", help="ISO date/time (UTC if no offset), inclusive")
+    parser.add_argument("--until", help="ISO date/time (UTC if no offset), exclusive")
+    parser.add_argument("--dir", default=EVENT_ARCHIVE_DIR, help="event archive directory")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--workers", type=int, help="parser processes (default: CPU count)")
+    parser.add_argument("--checkpoint", help="file recording segments already replayed")
+    parser.add_argument("--dry-run", action="store_true", help="parse and count, write nothing")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    def progress(hour, summary):
+        logger.info(f"Replayed {hour:%Y-%m-%d %H}:00 UTC, {summary['events']} events so far")
+
+    summary = replay_events(
+        since=parse_time(args.since),
+        until=parse_time(args.until),
+        directory=args.dir,
+        db_path=args.db,
+        workers=args.workers,
+        checkpoint=args.checkpoint,
+        dry_run=args.dry_run,
+        progress=progress,
+    )
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,97 @@
+import asyncio
 import logging
+import os
 import sqlite3
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Optional
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
 
 from app.webhook_handlers import router as webhook_router
-from app.database import init_db
+from app.database import init_db, status_coalescer
+from app.call_status import STATUS_RANKS, find_stuck_calls, status_history
+from app.config import (
+    CALL_STATUS_COALESCE_MS,
+    EVENT_ARCHIVE_FLUSH_SECONDS,
+    SUPPRESSION_RELOAD_SECONDS,
+)
+from app.event_archive import event_archive
+from app.recording_fetcher import list_recordings, recording_fetcher
 from app.call_logic import make_outbound_call
-from app.schemas import CallResponse, MakeCallRequest
+from app.callback_scheduler import callback_scheduler, list_callbacks
+from app.call_retry import call_retry_engine, retry_stats
+from app.suppression import suppression_list
+from app.transcript_search import search_transcripts
+from app.schemas import (
+    CallbackRequest,
+    CallbackReschedule,
+    CallResponse,
+    MakeCallRequest,
+    SuppressionFilterRequest,
+)
 
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+
+async def flush_event_archive_periodically():
+    """Write buffered webhook events at least every few seconds"""
+    while True:
+        await asyncio.sleep(EVENT_ARCHIVE_FLUSH_SECONDS)
+        try:
+            await run_in_threadpool(event_archive.flush)
+        except Exception as e:
+            logger.error(f"Error flushing event archive: {str(e)}")
+
+
+async def flush_status_updates_periodically():
+    """Write coalesced status-update webhooks once per window"""
+    while True:
+        await asyncio.sleep(CALL_STATUS_COALESCE_MS / 1000)
+        try:
+            await run_in_threadpool(status_coalescer.flush)
+        except Exception as e:
+            logger.error(f"Error writing status updates: {str(e)}")
+
+
+async def reload_suppression_list_periodically():
+    """Pick up a changed do-not-call list file"""
+    while True:
+        await asyncio.sleep(SUPPRESSION_RELOAD_SECONDS)
+        try:
+            await run_in_threadpool(suppression_list.reload_if_changed)
+        except Exception as e:
+            logger.error(f"Error reloading suppression list: {str(e)}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Loaded before anything can be dialled
+    await run_in_threadpool(suppression_list.load)
+    background_tasks = [
+        asyncio.create_task(flush_event_archive_periodically()),
+        asyncio.create_task(reload_suppression_list_periodically()),
+    ]
+    if status_coalescer.enabled:
+        background_tasks.append(asyncio.create_task(flush_status_updates_periodically()))
+    if recording_fetcher.enabled:
+        background_tasks.append(asyncio.create_task(recording_fetcher.run()))
+    if callback_scheduler.enabled:
+        background_tasks.append(asyncio.create_task(callback_scheduler.run()))
+    if call_retry_engine.enabled:
+        background_tasks.append(asyncio.create_task(call_retry_engine.run()))
+    yield
+    for task in background_tasks:
+        task.cancel()
+    status_coalescer.flush()
+    event_archive.flush()
+
+
+app = FastAPI(lifespan=lifespan)
 app.include_router(webhook_router)
 
 try:
@@ -47,11 +126,12 @@ async def initiate_outbound_call(request: MakeCallRequest):
         )
 
         if result["success"]:
-            return CallResponse(
-                status="success",
-                call_id=result["call_id"],
-                message=f"Call initiated successfully to {request.phone_number}",
-            )
+            message = f"Call initiated successfully to {request.phone_number}"
+            if result.get("duplicate"):
+                message = f"Call to {request.phone_number} already placed; not calling again"
+            return CallResponse(status="success", call_id=result["call_id"], message=message)
+        elif result.get("suppressed"):
+            raise HTTPException(status_code=403, detail=result["error"])
         else:
             raise HTTPException(
                 status_code=500, detail=f"Failed to initiate call: {result['error']}"
@@ -91,6 +171,120 @@ async def get_outbound_requests():
         conn.close()
 
 
+@app.get("/outbound-requests/retries")
+async def get_retry_stats():
+    """Retry policy and retries of failed outbound calls per failure reason"""
+    conn = sqlite3.connect("voice_agent.db")
+    try:
+        return {"reasons": retry_stats(conn.cursor())}
+
+    except Exception as e:
+        logger.error(f"Error fetching retry statistics: {str(e)}")
+        raise HTTPException(status_code=500, detail="Database error")
+    finally:
+        conn.close()
+
+
+@app.get("/suppression")
+async def get_suppression_list():
+    """Size and state of the do-not-call list"""
+    return suppression_list.stats()
+
+
+@app.post("/suppression/reload")
+async def reload_suppression_list():
+    """Reload the do-not-call list file now"""
+    try:
+        await run_in_threadpool(suppression_list.load)
+    except Exception as e:
+        logger.error(f"Error reloading suppression list: {str(e)}")
+        raise HTTPException(status_code=500, detail="Could not load suppression list")
+    return suppression_list.stats()
+
+
+@app.post("/suppression/filter")
+async def filter_phone_numbers(request: SuppressionFilterRequest):
+    """
+    Split a batch of numbers (e.g. for a campaign) into those that may be
+    called (normalised to E.164, each once), suppressed ones and invalid ones
+    """
+    return await run_in_threadpool(suppression_list.filter, request.phone_numbers)
+
+
+@app.get("/callbacks")
+async def get_callbacks(status: Optional[str] = None, limit: int = Query(100, ge=1, le=1000)):
+    """
+    Scheduled callbacks, soonest first
+
+    - **status**: pending, dialing, done, failed, interrupted, expired or cancelled (optional)
+    - **limit**: maximum number of callbacks returned
+    """
+    conn = sqlite3.connect("voice_agent.db")
+    try:
+        return {"callbacks": list_callbacks(conn.cursor(), status, limit)}
+
+    except Exception as e:
+        logger.error(f"Error fetching callbacks: {str(e)}")
+        raise HTTPException(status_code=500, detail="Database error")
+    finally:
+        conn.close()
+
+
+@app.post("/callbacks")
+async def schedule_callback(request: CallbackRequest):
+    """
+    Schedule a callback
+
+    - **phone_number**: number to call (required)
+    - **due_at**: when to call; moved into business hours (optional, defaults to
+      CALLBACK_DELAY_MINUTES from now)
+    - **purpose**: purpose of the call for logging (optional)
+    """
+    try:
+        phone_number = suppression_list.normalize(request.phone_number)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Valid phone number is required")
+    if suppression_list.is_suppressed(phone_number):
+        raise HTTPException(status_code=403, detail=f"{phone_number} is on the do-not-call list")
+    due_at_ms = int(request.due_at.timestamp() * 1000) if request.due_at else None
+    try:
+        callback_id, due_at_ms = await run_in_threadpool(
+            callback_scheduler.schedule, phone_number, due_at_ms, request.purpose
+        )
+        return {"id": callback_id, "due_at": due_at_ms}
+
+    except Exception as e:
+        logger.error(f"Error scheduling callback: {str(e)}")
+        raise HTTPException(status_code=500, detail="Database error")
+
+
+@app.post("/callbacks/{callback_id}/reschedule")
+async def reschedule_callback(callback_id: int, request: CallbackReschedule):
+    """Move a pending, interrupted or failed callback to a new time"""
+    due_at_ms = int(request.due_at.timestamp() * 1000)
+    try:
+        moved = await run_in_threadpool(callback_scheduler.reschedule, callback_id, due_at_ms)
+    except Exception as e:
+        logger.error(f"Error rescheduling callback: {str(e)}")
+        raise HTTPException(status_code=500, detail="Database error")
+    if not moved:
+        raise HTTPException(status_code=409, detail="No open callback with this ID")
+    return {"id": callback_id, "due_at": due_at_ms}
+
+
+@app.delete("/callbacks/{callback_id}")
+async def cancel_callback(callback_id: int):
+    """Cancel a pending, interrupted or failed callback"""
+    try:
+        cancelled = await run_in_threadpool(callback_scheduler.cancel, callback_id)
+    except Exception as e:
+        logger.error(f"Error cancelling callback: {str(e)}")
+        raise HTTPException(status_code=500, detail="Database error")
+    if not cancelled:
+        raise HTTPException(status_code=409, detail="No open callback with this ID")
+    return {"id": callback_id, "status": "cancelled"}
+
+
 @app.get("/calls")
 async def get_calls():
     """Get all calls from database"""
@@ -118,6 +312,33 @@ async def get_calls():
         conn.close()
 
 
+@app.get("/calls/stuck")
+async def get_stuck_calls(status: str = "in-progress", minutes: float = 30, limit: int = 100):
+    """
+    Calls that have been in a status for longer than expected
+
+    - **status**: status to look for (default in-progress)
+    - **minutes**: minimum time in that status (default 30)
+    - **limit**: maximum number of calls returned, longest stuck first
+    """
+    if status not in STATUS_RANKS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown status, expected one of: {', '.join(STATUS_RANKS)}",
+        )
+
+    conn = sqlite3.connect("voice_agent.db")
+    try:
+        calls = find_stuck_calls(conn.cursor(), status, minutes, limit)
+        return {"status": status, "minutes": minutes, "calls": calls}
+
+    except Exception as e:
+        logger.error(f"Error fetching stuck calls: {str(e)}")
+        raise HTTPException(status_code=500, detail="Database error")
+    finally:
+        conn.close()
+
+
 @app.get("/calls/{call_id}")
 async def get_call_details(call_id: str):
     """Get detailed conversation for a specific call"""
@@ -153,6 +374,8 @@ async def get_call_details(call_id: str):
             "call": dict(call),
             "messages": messages,
             "intent": dict(intent_data) if intent_data else None,
+            "status_history": status_history(cursor, call_id),
+            "recordings": list_recordings(cursor, call_id),
         }
 
     except HTTPException:
@@ -164,6 +387,69 @@ async def get_call_details(call_id: str):
         conn.close()
 
 
+@app.get("/recordings/{recording_id}")
+async def get_recording(recording_id: int):
+    """Download a fetched call recording from the local store"""
+    conn = sqlite3.connect("voice_agent.db")
+    try:
+        row = conn.execute(
+            "SELECT status, path, content_type FROM recordings WHERE id = ?",
+            (recording_id,),
+        ).fetchone()
+    except Exception as e:
+        logger.error(f"Error fetching recording: {str(e)}")
+        raise HTTPException(status_code=500, detail="Database error")
+    finally:
+        conn.close()
+
+    if row is None:
+        raise HTTPException(status_code=404, detail="Recording not found")
+    status, path, content_type = row
+    if status != "fetched" or not os.path.exists(path):
+        raise HTTPException(status_code=404, detail=f"Recording not available ({status})")
+    # Recently served recordings are the last to be evicted
+    recording_fetcher.store.touch(path)
+    return FileResponse(path, media_type=content_type or "application/octet-stream")
+
+
+@app.get("/search/transcripts")
+async def search_call_transcripts(
+    q: str,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+):
+    """
+    Full-text search over call messages and summaries, best matches first
+
+    - **q**: words to search for, all must match; `word*` matches a prefix
+    - **since** / **until**: only messages from this time range (optional)
+    - **limit** / **offset**: pagination
+    """
+    conn = sqlite3.connect("voice_agent.db")
+    try:
+        hits, has_more = search_transcripts(
+            conn.cursor(), q, since, until, limit, offset
+        )
+        return {
+            "query": q,
+            "results": hits,
+            "limit": limit,
+            "offset": offset,
+            "next_offset": offset + limit if has_more else None,
+        }
+
+    except sqlite3.OperationalError as e:
+        logger.error(f"Error searching transcripts: {str(e)}")
+        raise HTTPException(status_code=503, detail="Transcript search unavailable")
+    except Exception as e:
+        logger.error(f"Error searching transcripts: {str(e)}")
+        raise HTTPException(status_code=500, detail="Database error")
+    finally:
+        conn.close()
+
+
 @app.get("/analytics")
 async def get_analytics():
     """Get call analytics and statistics"""
@@ -230,8 +516,15 @@ async def root():
         "message": "Cogniwide AI Voice Agent System - POC-1",
         "endpoints": {
             "webhook": "/webhook (POST) - Receive Vapi events",
+            "webhook_replay": "/webhook/replay (POST) - Replay archived events",
             "calls": "/calls (GET) - List all calls",
             "call_details": "/calls/{call_id} (GET) - Get call conversation",
+            "stuck_calls": "/calls/stuck (GET) - Calls stuck in a status",
+            "recording": "/recordings/{recording_id} (GET) - Download a call recording",
+            "callbacks": "/callbacks (GET, POST) - Scheduled callbacks",
+            "suppression": "/suppression (GET), /suppression/filter (POST) - Do-not-call list",
+            "call_retries": "/outbound-requests/retries (GET) - Retries of failed calls per reason",
+            "search": "/search/transcripts?q= (GET) - Search call transcripts",
             "analytics": "/analytics (GET) - Get call statistics",
         },
     }
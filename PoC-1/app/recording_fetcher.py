@@ -0,0 +1,494 @@
+"""
+Background download of call recordings.
+
+End-of-call reports link to the call's recordings: the mono and stereo
+mixes and one mono track per side. ``write_call_batch`` queues each link
+as a ``recordings`` row (status ``pending``); ``RecordingFetcher`` claims
+due rows and downloads them with a fixed number of asyncio workers, the
+HTTP requests themselves running in threads.
+
+Downloads go to ``<store>/partial/<recording id>-<url hash>.part`` first.
+A download that fails part way keeps what it received and the next attempt
+asks for the rest with a ``Range`` request (servers that ignore it send the
+whole file again). A changed link starts a new partial file and the old
+one is deleted, so bytes from two different files are never joined. Finished files are stored by SHA-256 of their content
+(``<store>/ab/abcd....wav``), so a recording linked twice is stored once.
+When the store grows past ``RECORDING_STORE_MAX_MB`` the least recently
+used files are deleted and their rows marked ``evicted``.
+
+Failed downloads are retried with exponential backoff, up to
+``RECORDING_FETCH_MAX_ATTEMPTS``; client errors other than 408/429 (an
+expired or missing link) fail at once.
+
+To download everything that is due without starting the app (e.g. against
+``benchmarks/mock_providers.py``):
+
+    python -m app.recording_fetcher
+"""
+
+import argparse
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import wave
+from urllib.parse import urlparse
+
+from app.config import (
+    RECORDING_FETCH_ENABLED,
+    RECORDING_FETCH_KINDS,
+    RECORDING_FETCH_MAX_ATTEMPTS,
+    RECORDING_FETCH_POLL_SECONDS,
+    RECORDING_FETCH_TIMEOUT,
+    RECORDING_FETCH_WORKERS,
+    RECORDING_STORE_DIR,
+    RECORDING_STORE_MAX_MB,
+)
+
+
+logger = logging.getLogger(__name__)
+
+RECORDING_KINDS = ("mono", "stereo", "assistant", "customer")
+CHUNK_SIZE = 64 * 1024
+# Backoff before retry n is RETRY_BASE_SECONDS * 2 ** (n - 1), at most RETRY_MAX_SECONDS
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 3600
+
+
+def recording_urls(message):
+    """{kind: url} of the recordings an end-of-call report links to,
+    limited to ``RECORDING_FETCH_KINDS``"""
+    recording = message.artifact.recording if message.artifact else None
+    mono = recording.mono if recording else None
+    urls = {
+        "mono": message.recording_url or (mono.combined_url if mono else None),
+        "stereo": message.stereo_recording_url or (recording.stereo_url if recording else None),
+        "assistant": mono.assistant_url if mono else None,
+        "customer": mono.customer_url if mono else None,
+    }
+    return {kind: url for kind, url in urls.items() if url and kind in RECORDING_FETCH_KINDS}
+
+
+class DownloadError(Exception):
+    """A download that should not be retried"""
+
+
+def _extension(url):
+    extension = os.path.splitext(urlparse(url).path)[1].lower()
+    return extension if re.fullmatch(r"\.[a-z0-9]{1,5}", extension) else ""
+
+
+def _range_header(value):
+    """(start, total) from a ``Content-Range: bytes start-end/total`` header"""
+    match = re.fullmatch(r"bytes (?:(\d+)-\d+|\*)/(\d+|\*)", (value or "").strip())
+    if match is None:
+        return None, None
+    start, total = match.groups()
+    return (
+        int(start) if start is not None else None,
+        int(total) if total != "*" else None,
+    )
+
+
+def _hash_file(path, digest):
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+
+
+def download(session, url, partial, timeout=RECORDING_FETCH_TIMEOUT):
+    """Download ``url`` into ``partial``, resuming from the bytes already
+    there. Returns (sha256, size, content type).
+
+    Raises DownloadError for responses that retrying will not fix; other
+    exceptions leave ``partial`` in place for the next attempt.
+    """
+    import requests
+
+    offset = os.path.getsize(partial) if os.path.exists(partial) else 0
+    headers = {"Range": f"bytes={offset}-"} if offset else {}
+    digest = hashlib.sha256()
+
+    with session.get(url, headers=headers, stream=True, timeout=timeout) as response:
+        if offset and response.status_code == 416:
+            _, total = _range_header(response.headers.get("Content-Range"))
+            if total == offset:
+                # Everything had arrived; only the bookkeeping failed
+                _hash_file(partial, digest)
+                return digest.hexdigest(), offset, None
+            os.remove(partial)
+            raise IOError(f"Partial download of {offset} bytes is no longer valid")
+        try:
+            response.raise_for_status()
+        except requests.HTTPError as e:
+            status = response.status_code
+            if 400 <= status < 500 and status not in (408, 429):
+                raise DownloadError(str(e))
+            raise
+
+        expected = response.headers.get("Content-Length")
+        expected = int(expected) if expected and expected.isdigit() else None
+        start, total = _range_header(response.headers.get("Content-Range"))
+        if response.status_code == 206 and start == offset:
+            _hash_file(partial, digest)
+            mode = "ab"
+            if total is not None:
+                expected = total - offset
+        else:
+            # No range support: the whole file came back
+            offset, mode = 0, "wb"
+
+        received = 0
+        with open(partial, mode) as f:
+            for chunk in response.iter_content(CHUNK_SIZE):
+                f.write(chunk)
+                digest.update(chunk)
+                received += len(chunk)
+        content_type = response.headers.get("Content-Type")
+
+    if expected is not None and received != expected:
+        raise IOError(f"Download cut short: {received} of {expected} bytes")
+    return digest.hexdigest(), offset + received, content_type
+
+
+def wav_duration(path):
+    """Length in seconds of a WAV file, or None for other formats"""
+    try:
+        with wave.open(path, "rb") as f:
+            return f.getnframes() / f.getframerate()
+    except (wave.Error, EOFError, ZeroDivisionError):
+        return None
+
+
+class ContentStore:
+    """Files stored by SHA-256 of their content, capped at ``max_bytes``
+    by deleting the least recently used"""
+
+    def __init__(self, directory=RECORDING_STORE_DIR, max_mb=RECORDING_STORE_MAX_MB):
+        self.directory = directory
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._size = None  # bytes stored, from a scan on first use
+        self._lock = threading.Lock()
+
+    def blob_path(self, sha256, extension=""):
+        return os.path.join(self.directory, sha256[:2], sha256 + extension)
+
+    def partial_path(self, recording_id, url):
+        url_hash = hashlib.sha256(url.encode()).hexdigest()[:16]
+        return os.path.join(self.directory, "partial", f"{recording_id}-{url_hash}.part")
+
+    def discard_partials(self, recording_id, keep=None):
+        """Delete partial downloads of a recording other than ``keep``
+        (left by an earlier link)"""
+        directory = os.path.join(self.directory, "partial")
+        prefix = f"{recording_id}-"
+        try:
+            names = os.listdir(directory)
+        except FileNotFoundError:
+            return
+        for name in names:
+            path = os.path.join(directory, name)
+            if name.startswith(prefix) and name.endswith(".part") and path != keep:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def add(self, partial, sha256, extension=""):
+        """Move a finished download into the store; returns its path"""
+        path = self.blob_path(sha256, extension)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._lock:
+            if os.path.exists(path):
+                # Same content fetched before (or through another link)
+                os.remove(partial)
+                os.utime(path)
+                return path
+            size = os.path.getsize(partial)
+            os.replace(partial, path)
+            if self._size is not None:
+                self._size += size
+        return path
+
+    def touch(self, path):
+        """Mark a stored file as used, so eviction keeps it longer"""
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+    def _blobs(self):
+        """(mtime, size, path) of every stored file"""
+        blobs = []
+        if not os.path.isdir(self.directory):
+            return blobs
+        for prefix in os.scandir(self.directory):
+            if not prefix.is_dir() or len(prefix.name) != 2:
+                continue
+            for entry in os.scandir(prefix.path):
+                stat = entry.stat()
+                blobs.append((stat.st_mtime, stat.st_size, entry.path))
+        return blobs
+
+    def usage(self):
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._blobs())
+            return self._size
+
+    def evict(self, keep=()):
+        """Delete least recently used files until the store fits in
+        ``max_bytes``. Returns the SHA-256 of every deleted file."""
+        if self.usage() <= self.max_bytes:
+            return []
+        evicted = []
+        with self._lock:
+            blobs = sorted(self._blobs())
+            self._size = sum(size for _, size, _ in blobs)
+            for _, size, path in blobs:
+                if self._size <= self.max_bytes:
+                    break
+                if path in keep:
+                    continue
+                os.remove(path)
+                self._size -= size
+                evicted.append(os.path.splitext(os.path.basename(path))[0])
+        return evicted
+
+
+class RecordingFetcher:
+    """Downloads due ``recordings`` rows with ``workers`` concurrent
+    downloads"""
+
+    def __init__(
+        self,
+        store=None,
+        db_path="voice_agent.db",
+        workers=RECORDING_FETCH_WORKERS,
+        timeout=RECORDING_FETCH_TIMEOUT,
+        max_attempts=RECORDING_FETCH_MAX_ATTEMPTS,
+        poll_seconds=RECORDING_FETCH_POLL_SECONDS,
+        enabled=RECORDING_FETCH_ENABLED,
+    ):
+        self.store = store if store is not None else ContentStore()
+        self.db_path = db_path
+        self.workers = workers
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.poll_seconds = poll_seconds
+        self.enabled = enabled
+        self._session = None
+        self._wakeup = None
+        self._loop = None
+
+    def wake(self):
+        """Check for new recordings now rather than at the next poll; safe
+        to call from any thread"""
+        if self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def run(self, until_idle=False):
+        """Fetch due recordings until cancelled, or until none are due when
+        ``until_idle`` is set"""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        await asyncio.to_thread(self._release_claims)
+
+        # A small queue keeps claimed rows close to the number of workers
+        queue = asyncio.Queue(maxsize=self.workers)
+        workers = [asyncio.create_task(self._worker(queue)) for _ in range(self.workers)]
+        try:
+            while True:
+                self._wakeup.clear()
+                try:
+                    jobs = await asyncio.to_thread(self._claim, self.workers * 4)
+                except sqlite3.Error as e:
+                    logger.error(f"Error claiming recordings: {str(e)}")
+                    jobs = []
+                for job in jobs:
+                    await queue.put(job)
+                if jobs:
+                    continue
+                if until_idle:
+                    await queue.join()
+                    if not await asyncio.to_thread(self._claim, 0, True):
+                        return
+                    continue
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            for worker in workers:
+                worker.cancel()
+            self._wakeup = None
+
+    async def _worker(self, queue):
+        while True:
+            job = await queue.get()
+            try:
+                await asyncio.to_thread(self.fetch, job)
+            except Exception as e:
+                logger.error(f"Error fetching recording {job[0]}: {str(e)}")
+            finally:
+                queue.task_done()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _release_claims(self):
+        """Rows left ``fetching`` by a previous run go back in the queue"""
+        conn = self._connect()
+        try:
+            conn.execute("UPDATE recordings SET status = 'pending' WHERE status = 'fetching'")
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _claim(self, limit, peek=False):
+        """Mark up to ``limit`` due rows ``fetching`` and return them as
+        (id, url). With ``peek``, only report whether any are due."""
+        now_ms = int(time.time() * 1000)
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            cursor = conn.execute(
+                """
+                SELECT id, url FROM recordings
+                WHERE status = 'pending' AND next_attempt_at <= ?
+                ORDER BY next_attempt_at, id
+                LIMIT ?
+            """,
+                (now_ms, 1 if peek else limit),
+            )
+            jobs = cursor.fetchall()
+            if jobs and not peek:
+                conn.executemany(
+                    "UPDATE recordings SET status = 'fetching' WHERE id = ?",
+                    [(recording_id,) for recording_id, _ in jobs],
+                )
+            conn.commit()
+            return jobs
+        finally:
+            conn.close()
+
+    def _http(self):
+        if self._session is None:
+            import requests
+
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.workers)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._session = session
+        return self._session
+
+    def fetch(self, job):
+        """Download one claimed recording and record the outcome"""
+        recording_id, url = job
+        partial = self.store.partial_path(recording_id, url)
+        os.makedirs(os.path.dirname(partial), exist_ok=True)
+        self.store.discard_partials(recording_id, keep=partial)
+        try:
+            sha256, size, content_type = download(self._http(), url, partial, self.timeout)
+        except DownloadError as e:
+            self._failed(recording_id, str(e), permanent=True)
+            if os.path.exists(partial):
+                os.remove(partial)
+            return
+        except Exception as e:
+            self._failed(recording_id, str(e))
+            return
+
+        duration = wav_duration(partial)
+        path = self.store.add(partial, sha256, _extension(url))
+        evicted = self.store.evict(keep={path})
+
+        conn = self._connect()
+        try:
+            conn.execute(
+                """
+                UPDATE recordings
+                SET status = 'fetched', sha256 = ?, path = ?, bytes = ?,
+                    duration_seconds = ?, content_type = ?, error = NULL,
+                    fetched_at = ?
+                WHERE id = ?
+            """,
+                (sha256, path, size, duration, content_type, int(time.time() * 1000), recording_id),
+            )
+            # Other links to the same content are available again
+            conn.execute(
+                "UPDATE recordings SET status = 'fetched' WHERE sha256 = ? AND status = 'evicted'",
+                (sha256,),
+            )
+            if evicted:
+                conn.executemany(
+                    "UPDATE recordings SET status = 'evicted' WHERE sha256 = ? AND status = 'fetched'",
+                    [(digest,) for digest in evicted],
+                )
+            conn.commit()
+        finally:
+            conn.close()
+        logger.info(f"Fetched recording {recording_id}: {size} bytes")
+
+    def _failed(self, recording_id, error, permanent=False):
+        conn = self._connect()
+        try:
+            attempts = conn.execute(
+                "SELECT attempts FROM recordings WHERE id = ?", (recording_id,)
+            ).fetchone()[0] + 1
+            if permanent or attempts >= self.max_attempts:
+                status, next_attempt_at = "failed", 0
+                logger.error(f"Giving up on recording {recording_id}: {error}")
+            else:
+                delay = min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS)
+                status, next_attempt_at = "pending", int((time.time() + delay) * 1000)
+                logger.warning(f"Recording {recording_id} failed ({error}), retrying in {delay} s")
+            conn.execute(
+                """
+                UPDATE recordings SET status = ?, attempts = ?, next_attempt_at = ?, error = ?
+                WHERE id = ?
+            """,
+                (status, attempts, next_attempt_at, error, recording_id),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+
+def list_recordings(cursor, call_id):
+    cursor.execute(
+        """
+        SELECT id, kind, url, status, sha256, bytes, duration_seconds, content_type,
+               attempts, error, fetched_at
+        FROM recordings WHERE call_id = ? ORDER BY kind
+    """,
+        (call_id,),
+    )
+    columns = [description[0] for description in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+recording_fetcher = RecordingFetcher()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Download every call recording that is due, then exit"
+    )
+    parser.add_argument("--db", default="voice_agent.db")
+    parser.add_argument("--workers", type=int, default=RECORDING_FETCH_WORKERS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    fetcher = RecordingFetcher(db_path=args.db, workers=args.workers)
+    asyncio.run(fetcher.run(until_idle=True))
+    print(f"Store: {fetcher.store.usage() / 1e6:.1f} MB in {fetcher.store.directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+"""
+Sample Vapi webhook payloads, exactly as POSTed to ``/webhook``.
+
+Kept for reference and used as templates by the load-testing harness
+(``benchmarks/replay.py`` in the repository root).
+"""
+
+STATUS_UPDATE_EVENT = {
+    "message": {
+        "timestamp": 1749546420647,
+        "type": "status-update",
+        "status": "in-progress",
+        "artifact": {
+            "messages": [
+                {
+                    "role": "system",
+                    "message": "You are a helpful customer support agent for Cogniwide.\nGreet the user, ask if their internet issue is resolved.\nIf yes, say thanks and end the call.\nIf no, ask if they want to schedule a callback.",
+                    "time": 1749546415876,
+                    "secondsFromStart": 0,
+                }
+            ],
+            "messagesOpenAIFormatted": [
+                {
+                    "role": "system",
+                    "content": "You are a helpful customer support agent for Cogniwide.\nGreet the user, ask if their internet issue is resolved.\nIf yes, say thanks and end the call.\nIf no, ask if they want to schedule a callback.",
+                }
+            ],
+        },
+        "call": {
+            "id": "73daba4d-2bcc-4cca-8e49-3d7903467ade",
+            "orgId": "aeccb59a-73ea-4033-baae-51833f9ed571",
+            "createdAt": "2025-06-10T09:06:55.710Z",
+            "updatedAt": "2025-06-10T09:06:55.710Z",
+            "type": "webCall",
+            "monitor": {
+                "listenUrl": "wss://phone-call-websocket.aws-us-west-2-backend-production2.vapi.ai/73daba4d-2bcc-4cca-8e49-3d7903467ade/listen",
+                "controlUrl": "https://phone-call-websocket.aws-us-west-2-backend-production2.vapi.ai/73daba4d-2bcc-4cca-8e49-3d7903467ade/control",
+            },
+            "transport": {
+                "provider": "daily",
+                "assistantVideoEnabled": False,
+                "callUrl": "https://vapi.daily.co/yJPTsCsAtxVnVkqIgWyZ",
+            },
+            "webCallUrl": "https://vapi.daily.co/yJPTsCsAtxVnVkqIgWyZ",
+            "status": "queued",
+            "assistantId": "054ea7e1-a5fc-4b9c-8c7c-9c6e80d21921",
+            "assistantOverrides": {"clientMessages": ["transfer-update", "transcript"]},
+        },
+        "assistant": {
+            "id": "054ea7e1-a5fc-4b9c-8c7c-9c6e80d21921",
+            "orgId": "aeccb59a-73ea-4033-baae-51833f9ed571",
+            "name": "Finzie",
+            "voice": {"voiceId": "Elliot", "provider": "vapi"},
+            "createdAt": "2025-06-10T07:49:12.531Z",
+            "updatedAt": "2025-06-10T09:05:22.146Z",
+            "model": {
+                "model": "gpt-4o-mini",
+                "messages": [
+                    {
+                        "role": "system",
+                        "content": "You are a helpful customer support agent for Cogniwide.\nGreet the user, ask if their internet issue is resolved.\nIf yes, say thanks and end the call.\nIf no, ask if they want to schedule a callback.",
+                    }
+                ],
+                "provider": "openai",
+                "temperature": 0.7,
+            },
+            "firstMessage": "Hello.",
+            "voicemailMessage": "Please call back when you're available.",
+            "endCallMessage": "Goodbye.",
+            "transcriber": {
+                "model": "nova-2",
+                "language": "en",
+                "provider": "deepgram",
+            },
+            "clientMessages": ["transfer-update", "transcript"],
+            "server": {
+                "url": "https://40d8-183-82-160-130.ngrok-free.app/webhook",
+                "timeoutSeconds": 20,
+            },
+        },
+    }
+}
+
+
+END_OF_CALL_REPORT_EVENT = {
+    "message": {
+        "timestamp": 1749546450909,
+        "type": "end-of-call-report",
+        "analysis": {
+            "summary": "The AI called to follow up on a user's internet issue. The user confirmed that the issue had been resolved, and the AI ended the call after receiving this confirmation.",
+            "successEvaluation": "true",
+        },
+        "artifact": {
+            "messages": [
+                {
+                    "role": "system",
+                    "message": "You are a helpful customer support agent for Cogniwide.\nGreet the user, ask if their internet issue is resolved.\nIf yes, say thanks and end the call.\nIf no, ask if they want to schedule a callback.",
+                    "time": 1749546415876,
+                    "secondsFromStart": 0,
+                },
+                {
+                    "role": "bot",
+                    "message": "Hello?",
+                    "time": 1749546417519,
+                    "endTime": 1749546418019,
+                    "secondsFromStart": 1.28,
+                    "duration": 500,
+                    "source": "",
+                },
+                {
+                    "role": "user",
+                    "message": "Okay.",
+                    "time": 1749546419759,
+                    "endTime": 1749546420259,
+                    "secondsFromStart": 3.52,
+                    "duration": 500,
+                },
+                {
+                    "role": "bot",
+                    "message": "Hi there. I hope you're doing well. I wanted to check-in see if your Internet issue has been resolved.",
+                    "time": 1749546422419,
+                    "endTime": 1749546429009,
+                    "secondsFromStart": 6.18,
+                    "duration": 6280,
+                    "source": "",
+                },
+                {
+                    "role": "user",
+                    "message": "Yes. It has been.",
+                    "time": 1749546430259,
+                    "endTime": 1749546431559,
+                    "secondsFromStart": 14.02,
+                    "duration": 1300,
+                },
+                {
+                    "role": "bot",
+                    "message": "That's great to hear. You for letting me know. Um, if you need any further assistance in the future, feel free to reach out. Have a wonderful day.",
+                    "time": 1749546432989,
+                    "endTime": 1749546441049,
+                    "secondsFromStart": 16.75,
+                    "duration": 7030,
+                    "source": "",
+                },
+            ],
+            "messagesOpenAIFormatted": [
+                {
+                    "role": "system",
+                    "content": "You are a helpful customer support agent for Cogniwide.\nGreet the user, ask if their internet issue is resolved.\nIf yes, say thanks and end the call.\nIf no, ask if they want to schedule a callback.",
+                },
+                {"role": "assistant", "content": "Hello?"},
+                {"role": "user", "content": "Okay."},
+                {
+                    "role": "assistant",
+                    "content": "Hi there. I hope you're doing well. I wanted to check-in see if your Internet issue has been resolved.",
+                },
+                {"role": "user", "content": "Yes. It has been."},
+                {
+                    "role": "assistant",
+                    "content": "That's great to hear. You for letting me know. Um, if you need any further assistance in the future, feel free to reach out. Have a wonderful day.",
+                },
+            ],
+            "transcript": "AI: Hello?\nUser: Okay.\nAI: Hi there. I hope you're doing well. I wanted to check-in see if your Internet issue has been resolved.\nUser: Yes. It has been.\nAI: That's great to hear. You for letting me know. Um, if you need any further assistance in the future, feel free to reach out. Have a wonderful day.\n",
+            "recordingUrl": "https://storage.vapi.ai/73daba4d-2bcc-4cca-8e49-3d7903467ade-1749546448431-3ef3457e-6fe6-4410-b76d-7b135cd4901e-mono.wav",
+            "stereoRecordingUrl": "https://storage.vapi.ai/73daba4d-2bcc-4cca-8e49-3d7903467ade-1749546448431-2df6e5bd-59d4-4ef3-81d5-7024bef0ce08-stereo.wav",
+            "recording": {
+                "stereoUrl": "https://storage.vapi.ai/73daba4d-2bcc-4cca-8e49-3d7903467ade-1749546448431-2df6e5bd-59d4-4ef3-81d5-7024bef0ce08-stereo.wav",
+                "mono": {
+                    "combinedUrl": "https://storage.vapi.ai/73daba4d-2bcc-4cca-8e49-3d7903467ade-1749546448431-3ef3457e-6fe6-4410-b76d-7b135cd4901e-mono.wav",
+                    "assistantUrl": "https://storage.vapi.ai/73daba4d-2bcc-4cca-8e49-3d7903467ade-1749546448431-40c52d21-edb4-45e3-bacd-8c607f779a93-mono.wav",
+                    "customerUrl": "https://storage.vapi.ai/73daba4d-2bcc-4cca-8e49-3d7903467ade-1749546448431-9ab3c0a5-d478-4277-93cc-189a4b7c9e62-mono.wav",
+                },
+            },
+            "nodes": [],
+            "variables": {},
+        },
+        "startedAt": "2025-06-10T09:07:00.649Z",
+        "endedAt": "2025-06-10T09:07:25.925Z",
+        "endedReason": "customer-ended-call",
+        "cost": 0.0394,
+        "costBreakdown": {
+            "stt": 0.0056,
+            "llm": 0.0001,
+            "tts": 0.0126,
+            "vapi": 0.0211,
+            "total": 0.0394,
+            "llmPromptTokens": 257,
+            "llmCompletionTokens": 57,
+            "ttsCharacters": 251,
+            "voicemailDetectionCost": 0,
+            "knowledgeBaseCost": 0,
+            "analysisCostBreakdown": {
+                "summary": 0,
+                "summaryPromptTokens": 147,
+                "summaryCompletionTokens": 35,
+                "structuredData": 0,
+                "structuredDataPromptTokens": 0,
+                "structuredDataCompletionTokens": 0,
+                "successEvaluation": 0,
+                "successEvaluationPromptTokens": 251,
+                "successEvaluationCompletionTokens": 1,
+            },
+        },
+        "costs": [
+            {
+                "type": "transcriber",
+                "transcriber": {"provider": "deepgram", "model": "nova-2"},
+                "minutes": 0.5009166666666667,
+                "cost": 0.00562928,
+            },
+            {
+                "type": "model",
+                "model": {"provider": "openai", "model": "gpt-4o-mini"},
+                "promptTokens": 257,
+                "completionTokens": 57,
+                "cost": 7.275e-05,
+            },
+            {
+                "type": "voice",
+                "voice": {
+                    "provider": "vapi",
+                    "voiceId": "dN8hviqdNrAsEcL57yFj",
+                    "model": "eleven_turbo_v2_5",
+                },
+                "characters": 251,
+                "cost": 0.01255,
+            },
+            {"type": "vapi", "subType": "normal", "minutes": 0.4213, "cost": 0.021065},
+            {
+                "type": "analysis",
+                "analysisType": "summary",
+                "model": {
+                    "provider": "google",
+                    "model": "gemini-2.5-flash-preview-04-17",
+                },
+                "promptTokens": 147,
+                "completionTokens": 35,
+                "cost": 4.305e-05,
+            },
+            {
+                "type": "analysis",
+                "analysisType": "successEvaluation",
+                "model": {
+                    "provider": "google",
+                    "model": "gemini-2.5-flash-preview-04-17",
+                },
+                "promptTokens": 251,
+                "completionTokens": 1,
+                "cost": 3.825e-05,
+            },
+            {
+                "type": "knowledge-base",
+                "model": {"provider": "google", "model": "gemini-1.5-flash"},
+                "promptTokens": 0,
+                "completionTokens": 0,
+                "cost": 0,
+            },
+        ],
+        "durationMs": 25276,
+        "durationSeconds": 25.276,
+        "durationMinutes": 0.4213,
+        "summary": "The AI called to follow up on a user's internet issue. The user confirmed that the issue had been resolved, and the AI ended the call after receiving this confirmation.",
+        "transcript": "AI: Hello?\nUser: Okay.\nAI: Hi there. I hope you're doing well. I wanted to check-in see if your Internet issue has been resolved.\nUser: Yes. It has been.\nAI: That's great to hear. You for letting me know. Um, if you need any further assistance in the future, feel free to reach out. Have a wonderful day.\n",
+        "messages": [
+            {
+                "role": "system",
+                "message": "You are a helpful customer support agent for Cogniwide.\nGreet the user, ask if their internet issue is resolved.\nIf yes, say thanks and end the call.\nIf no, ask if they want to schedule a callback.",
+                "time": 1749546415876,
+                "secondsFromStart": 0,
+            },
+            {
+                "role": "bot",
+                "message": "Hello?",
+                "time": 1749546417519,
+                "endTime": 1749546418019,
+                "secondsFromStart": 1.28,
+                "duration": 500,
+                "source": "",
+            },
+            {
+                "role": "user",
+                "message": "Okay.",
+                "time": 1749546419759,
+                "endTime": 1749546420259,
+                "secondsFromStart": 3.52,
+                "duration": 500,
+            },
+            {
+                "role": "bot",
+                "message": "Hi there. I hope you're doing well. I wanted to check-in see if your Internet issue has been resolved.",
+                "time": 1749546422419,
+                "endTime": 1749546429009,
+                "secondsFromStart": 6.18,
+                "duration": 6280,
+                "source": "",
+            },
+            {
+                "role": "user",
+                "message": "Yes. It has been.",
+                "time": 1749546430259,
+                "endTime": 1749546431559,
+                "secondsFromStart": 14.02,
+                "duration": 1300,
+            },
+            {
+                "role": "bot",
+                "message": "That's great to hear. You for letting me know. Um, if you need any further assistance in the future, feel free to reach out. Have a wonderful day.",
+                "time": 1749546432989,
+                "endTime": 1749546441049,
+                "secondsFromStart": 16.75,
+                "duration": 7030,
+                "source": "",
+            },
+        ],
+        "recordingUrl": "https://storage.vapi.ai/73daba4d-2bcc-4cca-8e49-3d7903467ade-1749546448431-3ef3457e-6fe6-4410-b76d-7b135cd4901e-mono.wav",
+        "stereoRecordingUrl": "https://storage.vapi.ai/73daba4d-2bcc-4cca-8e49-3d7903467ade-1749546448431-2df6e5bd-59d4-4ef3-81d5-7024bef0ce08-stereo.wav",
+        "call": {
+            "id": "73daba4d-2bcc-4cca-8e49-3d7903467ade",
+            "orgId": "aeccb59a-73ea-4033-baae-51833f9ed571",
+            "createdAt": "2025-06-10T09:06:55.710Z",
+            "updatedAt": "2025-06-10T09:06:55.710Z",
+            "type": "webCall",
+            "monitor": {
+                "listenUrl": "wss://phone-call-websocket.aws-us-west-2-backend-production2.vapi.ai/73daba4d-2bcc-4cca-8e49-3d7903467ade/listen",
+                "controlUrl": "https://phone-call-websocket.aws-us-west-2-backend-production2.vapi.ai/73daba4d-2bcc-4cca-8e49-3d7903467ade/control",
+            },
+            "transport": {
+                "provider": "daily",
+                "assistantVideoEnabled": False,
+                "callUrl": "https://vapi.daily.co/yJPTsCsAtxVnVkqIgWyZ",
+            },
+            "webCallUrl": "https://vapi.daily.co/yJPTsCsAtxVnVkqIgWyZ",
+            "status": "queued",
+            "assistantId": "054ea7e1-a5fc-4b9c-8c7c-9c6e80d21921",
+            "assistantOverrides": {"clientMessages": ["transfer-update", "transcript"]},
+        },
+        "assistant": {
+            "id": "054ea7e1-a5fc-4b9c-8c7c-9c6e80d21921",
+            "orgId": "aeccb59a-73ea-4033-baae-51833f9ed571",
+            "name": "Finzie",
+            "voice": {"voiceId": "Elliot", "provider": "vapi"},
+            "createdAt": "2025-06-10T07:49:12.531Z",
+            "updatedAt": "2025-06-10T09:05:22.146Z",
+            "model": {
+                "model": "gpt-4o-mini",
+                "messages": [
+                    {
+                        "role": "system",
+                        "content": "You are a helpful customer support agent for Cogniwide.\nGreet the user, ask if their internet issue is resolved.\nIf yes, say thanks and end the call.\nIf no, ask if they want to schedule a callback.",
+                    }
+                ],
+                "provider": "openai",
+                "temperature": 0.7,
+            },
+            "firstMessage": "Hello.",
+            "voicemailMessage": "Please call back when you're available.",
+            "endCallMessage": "Goodbye.",
+            "transcriber": {
+                "model": "nova-2",
+                "language": "en",
+                "provider": "deepgram",
+            },
+            "clientMessages": ["transfer-update", "transcript"],
+            "server": {
+                "url": "https://40d8-183-82-160-130.ngrok-free.app/webhook",
+                "timeoutSeconds": 20,
+            },
+        },
+    }
+}
@@ -1,5 +1,6 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, field_validator
+from datetime import datetime, timezone
+from typing import List, Optional
 
 
 class MakeCallRequest(BaseModel):
@@ -11,4 +12,43 @@ class MakeCallRequest(BaseModel):
 class CallResponse(BaseModel):
     status: str
     call_id: Optional[str] = None
-    message: str
\ No newline at end of file
+    message: str
+
+class ReplayRequest(BaseModel):
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    dry_run: bool = False
+    workers: Optional[int] = None
+
+    @field_validator("since", "until")
+    @classmethod
+    def assume_utc(cls, value):
+        if value is not None and value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value
+
+
+class CallbackRequest(BaseModel):
+    phone_number: str
+    due_at: Optional[datetime] = None
+    purpose: Optional[str] = "Scheduled callback"
+
+    @field_validator("due_at")
+    @classmethod
+    def assume_utc(cls, value):
+        if value is not None and value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value
+
+class CallbackReschedule(BaseModel):
+    due_at: datetime
+
+    @field_validator("due_at")
+    @classmethod
+    def assume_utc(cls, value):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value
+
+class SuppressionFilterRequest(BaseModel):
+    phone_numbers: List[str]
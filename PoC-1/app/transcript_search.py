@@ -0,0 +1,220 @@
+"""
+Full-text search over call transcripts and summaries (SQLite FTS5).
+
+``conversations_fts`` and ``call_intents_fts`` are external-content FTS5
+tables: they index ``conversations.message`` and ``call_intents.summary``
+without storing a second copy of the text, and triggers keep them in step
+with every insert, delete and update of the source rows. Prefixes of 2-4
+characters are indexed too, so ``rout*`` is a single index lookup.
+
+Results are ranked with bm25. Ranking costs time per matching row, so a
+word that appears in a large share of all messages is ranked among its
+``TRANSCRIPT_SEARCH_MAX_CANDIDATES`` most recent matches only; rarer words
+are ranked over every match.
+"""
+
+import logging
+import re
+import sqlite3
+from datetime import timezone
+
+from app.config import TRANSCRIPT_SEARCH_MAX_CANDIDATES
+
+
+logger = logging.getLogger(__name__)
+
+# (FTS table, source table, indexed column)
+FTS_TABLES = [
+    ("conversations_fts", "conversations", "message"),
+    ("call_intents_fts", "call_intents", "summary"),
+]
+
+SNIPPET_TOKENS = 16
+HIGHLIGHT = ("<mark>", "</mark>")
+# Matches ranked per source, most recent first; see _rank
+MAX_CANDIDATES = TRANSCRIPT_SEARCH_MAX_CANDIDATES
+
+
+def init_search(cursor):
+    """Create the FTS tables and triggers, indexing existing rows once.
+
+    Returns False if this SQLite build has no FTS5.
+    """
+    for fts, source, column in FTS_TABLES:
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,)
+        )
+        exists = cursor.fetchone() is not None
+        try:
+            cursor.execute(
+                f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                    {column}, content='{source}', content_rowid='id',
+                    tokenize='porter unicode61', prefix='2 3 4'
+                )
+            """
+            )
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Transcript search disabled, FTS5 not available: {e}")
+            return False
+
+        cursor.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {source} BEGIN
+                INSERT INTO {fts} (rowid, {column}) VALUES (new.id, new.{column});
+            END
+        """
+        )
+        cursor.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {source} BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {column})
+                VALUES ('delete', old.id, old.{column});
+            END
+        """
+        )
+        cursor.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {column} ON {source} BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {column})
+                VALUES ('delete', old.id, old.{column});
+                INSERT INTO {fts} (rowid, {column}) VALUES (new.id, new.{column});
+            END
+        """
+        )
+        if not exists:
+            # Index rows written before search existed
+            cursor.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+    return True
+
+
+def build_match_query(text):
+    """FTS5 query matching all words of ``text`` (a trailing ``*`` makes a
+    word a prefix). Words are quoted, so FTS5 operators and punctuation in
+    user input are taken literally. Returns None if there are no words."""
+    terms = []
+    for word, prefix in re.findall(r"(\w+)(\*?)", text):
+        terms.append(f'"{word}"{prefix}')
+    return " ".join(terms) or None
+
+
+def _to_ms(moment):
+    if moment is None:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp() * 1000)
+
+
+# Per source: FTS table, source table alias and join, time expression (ms)
+_SOURCES = {
+    "message": (
+        "conversations_fts",
+        "JOIN conversations s ON s.id = conversations_fts.rowid",
+        "s.timestamp",
+        "s.call_id, s.role",
+    ),
+    "summary": (
+        "call_intents_fts",
+        "JOIN call_intents s ON s.id = call_intents_fts.rowid",
+        "CAST(strftime('%s', s.created_at) AS INTEGER) * 1000",
+        "s.call_id, NULL",
+    ),
+}
+
+
+def _rank(cursor, source, match, since_ms, until_ms, count):
+    """(score, source, rowid) of the ``count`` best matches in one source"""
+    fts, join, ts, _ = _SOURCES[source]
+    filters = f"{fts} MATCH ?1"
+    if since_ms is None and until_ms is None:
+        join = ""  # the source rows are only needed for the time filter
+    else:
+        filters += f" AND {ts} >= COALESCE(?2, {ts}) AND {ts} < COALESCE(?3, {ts} + 1)"
+
+    # Ranking scores every matching row, so for very common words only the
+    # most recent candidates (highest rowids, which FTS5 walks cheaply) are
+    # ranked
+    cursor.execute(
+        f"""
+        SELECT {fts}.rowid FROM {fts} {join}
+        WHERE {filters}
+        ORDER BY {fts}.rowid DESC
+        LIMIT 1 OFFSET ?4
+    """,
+        (match, since_ms, until_ms, MAX_CANDIDATES - 1),
+    )
+    floor = cursor.fetchone()
+
+    cursor.execute(
+        f"""
+        SELECT bm25({fts}), {fts}.rowid FROM {fts} {join}
+        WHERE {filters} AND {fts}.rowid >= ?4
+        ORDER BY 1
+        LIMIT ?5
+    """,
+        (match, since_ms, until_ms, floor[0] if floor else 0, count),
+    )
+    return [(score, source, rowid) for score, rowid in cursor.fetchall()]
+
+
+def _details(cursor, source, match, rowids):
+    """{rowid: (call_id, role, ts, snippet)} for the hits on a page"""
+    if not rowids:
+        return {}
+    fts, join, ts, columns = _SOURCES[source]
+    placeholders = ",".join("?" * len(rowids))
+    open_mark, close_mark = HIGHLIGHT
+    cursor.execute(
+        f"""
+        SELECT {fts}.rowid, {columns}, {ts},
+               snippet({fts}, 0, ?, ?, '…', {SNIPPET_TOKENS})
+        FROM {fts} {join}
+        WHERE {fts} MATCH ? AND {fts}.rowid IN ({placeholders})
+    """,
+        (open_mark, close_mark, match, *rowids),
+    )
+    return {row[0]: row[1:] for row in cursor.fetchall()}
+
+
+def search_transcripts(cursor, query, since=None, until=None, limit=20, offset=0):
+    """Best-matching transcript messages and call summaries for ``query``.
+
+    ``since``/``until`` bound the message time (summaries: when they were
+    stored). Returns (hits, has_more).
+    """
+    match = build_match_query(query)
+    if match is None:
+        return [], False
+    since_ms, until_ms = _to_ms(since), _to_ms(until)
+
+    # Rank each source separately (the best offset + limit + 1 of each
+    # cover the page), then build snippets for the page only
+    count = offset + limit + 1
+    ranked = sorted(
+        _rank(cursor, "message", match, since_ms, until_ms, count)
+        + _rank(cursor, "summary", match, since_ms, until_ms, count)
+    )
+    page = ranked[offset:offset + limit]
+    details = {
+        source: _details(
+            cursor, source, match, [rowid for _, hit_source, rowid in page if hit_source == source]
+        )
+        for source in _SOURCES
+    }
+
+    hits = []
+    for score, source, rowid in page:
+        call_id, role, ts, snippet = details[source][rowid]
+        hits.append(
+            {
+                "source": source,
+                "call_id": call_id,
+                "role": role,
+                "timestamp": ts,
+                "snippet": snippet,
+                # bm25() is lower for better matches; flip it so higher is better
+                "score": round(-score, 4),
+            }
+        )
+    return hits, len(ranked) > offset + limit
@@ -0,0 +1,225 @@
+"""
+Typed, compact model of the Vapi webhook events PoC-1 stores.
+
+An ``end-of-call-report`` carries the transcript three times
+(``artifact.messages``, ``messagesOpenAIFormatted`` and ``messages``) plus
+the full ``assistant`` and ``call`` objects, but only a handful of fields
+are persisted. The classes below declare just those fields; everything
+else in the payload is skipped.
+
+With ``msgspec`` installed they are ``msgspec.Struct`` types and the
+decoder never materialises the skipped parts. Without it, the payload is
+parsed with ``orjson`` (or ``json``) and copied into equivalent
+``__slots__`` classes, so the parsed dicts are released straight away.
+"""
+
+import json
+import typing
+from typing import Any, List, Optional
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+
+def _camel(name):
+    head, *rest = name.split("_")
+    return head + "".join(part.title() for part in rest)
+
+
+class _RecordMeta(type):
+    """Fallback for ``msgspec.Struct``: fields from annotations, stored in
+    ``__slots__``, with JSON keys optionally renamed to camelCase"""
+
+    def __new__(mcls, name, bases, namespace, rename=None):
+        fields = namespace.get("__annotations__", {})
+        defaults = {field: namespace.pop(field) for field in fields if field in namespace}
+        namespace["__slots__"] = tuple(fields)
+        cls = super().__new__(mcls, name, bases, namespace)
+        cls.__struct_fields__ = tuple(fields)
+        cls._defaults = defaults
+        cls._keys = {
+            field: _camel(field) if rename == "camel" else field for field in fields
+        }
+        cls._plan = None
+        return cls
+
+
+class _Record(metaclass=_RecordMeta):
+    def __init__(self, **values):
+        for field in self.__struct_fields__:
+            if field in values:
+                value = values[field]
+            elif field in self._defaults:
+                value = self._defaults[field]
+                if isinstance(value, list):
+                    value = list(value)
+            else:
+                raise TypeError(f"Missing required argument '{field}'")
+            setattr(self, field, value)
+
+    def __repr__(self):
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.__struct_fields__)
+        return f"{type(self).__name__}({fields})"
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(
+            getattr(self, field) == getattr(other, field) for field in self.__struct_fields__
+        )
+
+    @classmethod
+    def _decode_plan(cls):
+        """(field, JSON key, nested record type, is list) per field"""
+        if cls._plan is None:
+            hints = typing.get_type_hints(cls)
+            plan = []
+            for field in cls.__struct_fields__:
+                hint = hints[field]
+                args = typing.get_args(hint)
+                is_list = typing.get_origin(hint) is list
+                if typing.get_origin(hint) in (list, typing.Union):
+                    hint = args[0]
+                nested = hint if isinstance(hint, type) and issubclass(hint, _Record) else None
+                plan.append((field, cls._keys[field], nested, is_list))
+            cls._plan = plan
+        return cls._plan
+
+    @classmethod
+    def from_dict(cls, data):
+        # Fills the slots directly rather than through __init__; this runs
+        # once per transcript message
+        record = object.__new__(cls)
+        for field, key, nested, is_list in cls._plan or cls._decode_plan():
+            if key in data:
+                value = data[key]
+                if nested is not None and value is not None:
+                    if is_list:
+                        value = [nested.from_dict(item) for item in value]
+                    else:
+                        value = nested.from_dict(value)
+            elif field in cls._defaults:
+                value = cls._defaults[field]
+                if isinstance(value, list):
+                    value = list(value)
+            else:
+                raise TypeError(f"Object missing required field '{key}'")
+            setattr(record, field, value)
+        return record
+
+
+_Base = msgspec.Struct if msgspec is not None else _Record
+_options = {"rename": "camel"}
+
+
+class Customer(_Base, **_options):
+    number: Optional[str] = None
+
+
+class CallInfo(_Base, **_options):
+    id: Optional[str] = None
+    type: Optional[str] = None
+    status: Optional[str] = None
+    # Phone calls only
+    customer: Optional[Customer] = None
+
+
+class ConversationMessage(_Base, **_options):
+    # Either may be missing or null in a payload; readers treat None as ""
+    role: Optional[str] = ""
+    message: Optional[str] = ""
+    time: Any = None
+    seconds_from_start: Any = None
+    duration: Any = None
+
+
+class CallAnalysis(_Base, **_options):
+    success_evaluation: Any = ""
+
+
+class MonoRecording(_Base, **_options):
+    combined_url: Optional[str] = None
+    assistant_url: Optional[str] = None
+    customer_url: Optional[str] = None
+
+
+class Recording(_Base, **_options):
+    stereo_url: Optional[str] = None
+    mono: Optional[MonoRecording] = None
+
+
+class Artifact(_Base, **_options):
+    # Only the recording links; the transcript copies are skipped
+    recording: Optional[Recording] = None
+
+
+class VapiMessage(_Base, **_options):
+    type: str = "unknown"
+    # Epoch milliseconds at which Vapi sent the event
+    timestamp: Any = None
+    status: Optional[str] = None
+    call: Optional[CallInfo] = None
+    started_at: Optional[str] = None
+    ended_at: Optional[str] = None
+    duration_seconds: Any = None
+    cost: Any = None
+    ended_reason: Optional[str] = None
+    summary: Optional[str] = ""
+    analysis: Optional[CallAnalysis] = None
+    # The top-level transcript; the copies under ``artifact`` are skipped
+    messages: List[ConversationMessage] = []
+    recording_url: Optional[str] = None
+    stereo_recording_url: Optional[str] = None
+    artifact: Optional[Artifact] = None
+
+
+class VapiEvent(_Base, **_options):
+    message: Optional[VapiMessage] = None
+
+
+class ArchivedEvent(_Base):
+    """A line of the event archive (``app/event_archive.py``)"""
+
+    received_at: int
+    event: VapiEvent
+
+
+if msgspec is not None:
+    _event_decoder = msgspec.json.Decoder(VapiEvent)
+    _archived_decoder = msgspec.json.Decoder(ArchivedEvent)
+
+    def decode_event(body):
+        """Decode a webhook body (bytes or str) into a ``VapiEvent``"""
+        return _event_decoder.decode(body)
+
+    def decode_archived_event(line):
+        return _archived_decoder.decode(line)
+
+    def event_from_dict(data):
+        """``VapiEvent`` from an already parsed webhook body"""
+        return msgspec.convert(data, VapiEvent)
+
+else:
+
+    def decode_event(body):
+        """Decode a webhook body (bytes or str) into a ``VapiEvent``"""
+        return VapiEvent.from_dict(_loads(body))
+
+    def decode_archived_event(line):
+        return ArchivedEvent.from_dict(_loads(line))
+
+    def event_from_dict(data):
+        """``VapiEvent`` from an already parsed webhook body"""
+        return VapiEvent.from_dict(data)
+
+
+def event_message(event):
+    """The event's ``message``; an empty one if the body had none"""
+    return event.message if event.message is not None else VapiMessage()
@@ -1,6 +1,12 @@
 from fastapi import APIRouter, Request, HTTPException
+from fastapi.concurrency import run_in_threadpool
 import logging
-from app.database import save_call_data
+from app.callback_scheduler import callback_scheduler
+from app.database import build_call_rows, save_call_data, status_coalescer
+from app.event_archive import event_archive
+from app.recording_fetcher import recording_fetcher
+from app.schemas import ReplayRequest
+from app.vapi_events import decode_event, event_message
 
 
 logger = logging.getLogger(__name__)
@@ -11,23 +17,65 @@ router = APIRouter()
 async def receive_vapi_event(request: Request):
     """Webhook endpoint to receive Vapi events"""
     try:
-        data = await request.json()
-        # print(data)
-        event_type = data.get("message", {}).get("type", "unknown")
+        body = await request.body()
+        # Keep the raw event so the database can be rebuilt from the archive,
+        # including events the model below fails to decode
+        event_archive.append(body)
+        # Only the fields that are stored are decoded (see app/vapi_events.py)
+        message = event_message(decode_event(body))
+        event_type = message.type
 
         logger.info(f"Incoming event from Vapi: {event_type}")
 
-        # Save all call data to database
-        save_call_data(data.get("message", {}))
+        # Save all call data to database. Status updates are frequent and
+        # carry nothing else worth storing, so they are written in batches.
+        if event_type == "status-update" and status_coalescer.enabled:
+            rows = build_call_rows(message)
+            if rows is not None:
+                status_coalescer.submit(rows)
+        else:
+            save_call_data(message)
         
         # Handle different event types
         if event_type == "status-update":
             logger.info("Call status update received")
         elif event_type == "end-of-call-report":
             logger.info("End of call report received - processing conversation")
+            # Its recordings (and any callback request) were queued with the
+            # call data
+            recording_fetcher.wake()
+            callback_scheduler.wake()
 
         return {"status": "received", "event_type": event_type}
 
     except Exception as e:
         logger.error(f"Error processing webhook: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post("/webhook/replay")
+async def replay_archived_events(request: ReplayRequest):
+    """
+    Replay archived webhook events into the database
+
+    - **since** / **until**: time range of events to replay (optional)
+    - **dry_run**: parse and count events without writing
+    - **workers**: parser processes (optional, defaults to CPU count)
+    """
+    # Imported here so worker processes are only set up when a replay runs
+    from app.event_replay import replay_events
+
+    try:
+        # Include events still buffered in this process
+        await run_in_threadpool(event_archive.flush)
+        return await run_in_threadpool(
+            replay_events,
+            since=request.since,
+            until=request.until,
+            workers=request.workers,
+            dry_run=request.dry_run,
+        )
+
+    except Exception as e:
+        logger.error(f"Error replaying events: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Replay failed: {str(e)}")
@@ -0,0 +1,113 @@
+"""
+Finding due call retries in a large ``outbound_requests`` table.
+
+Fills a scratch database (created with ``init_db``) with ``--requests``
+outbound requests, of which ``--failed`` failed and used up or finished
+their retries and ``--pending`` wait for a retry, spread over the next
+hour. Then it times the engine's claim (due retries plus the next due
+time, through the partial index) and the retry statistics, and the same
+due-retry query forced to scan the table, as it would without the index.
+
+Usage (from the PoC-1 directory):
+    python benchmarks/bench_call_retry.py --requests 1000000 --pending 10000
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DUE_SQL = """
+    SELECT id, phone_number, assistant_id, purpose, retry_reason
+    FROM outbound_requests {hint}
+    WHERE retry_status = 'pending' AND retry_at <= ?
+    ORDER BY retry_at
+    LIMIT 16
+"""
+
+
+def populate(requests, failed, pending):
+    from app.call_retry import RETRY_REASONS
+
+    now_ms = int(time.time() * 1000)
+    rows = []
+    for i in range(requests):
+        status, reason, retry_status, retry_at = "success", None, None, None
+        if i < pending:
+            status, reason, retry_status = "failed", random.choice(RETRY_REASONS), "pending"
+            retry_at = now_ms + random.randint(-60_000, 3_600_000)
+        elif i < pending + failed:
+            status, reason = "failed", random.choice(RETRY_REASONS)
+            retry_status = random.choice(["retried", "exhausted"])
+        rows.append((f"+1555{i:07d}", "assistant", "benchmark", status, reason, retry_status, retry_at))
+    random.shuffle(rows)
+    conn = sqlite3.connect("voice_agent.db")
+    conn.executemany(
+        """
+        INSERT INTO outbound_requests
+        (phone_number, assistant_id, purpose, status, retry_reason, retry_status, retry_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """,
+        rows,
+    )
+    conn.commit()
+    conn.close()
+
+
+def timed(function, repeats):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--requests", type=int, default=1_000_000)
+    parser.add_argument("--failed", type=int, default=50_000, help="failures no longer pending")
+    parser.add_argument("--pending", type=int, default=10_000, help="retries waiting")
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    os.chdir(tempfile.mkdtemp())  # init_db uses ./voice_agent.db
+    from app.call_retry import CallRetryEngine, retry_stats
+    from app.database import init_db
+
+    init_db()
+    started = time.perf_counter()
+    populate(args.requests, args.failed, args.pending)
+    print(f"inserted {args.requests} requests in {time.perf_counter() - started:.1f} s")
+
+    conn = sqlite3.connect("voice_agent.db")
+    now_ms = int(time.time() * 1000)
+    indexed = timed(lambda: conn.execute(DUE_SQL.format(hint=""), (now_ms,)).fetchall(), args.repeats)
+    scan = timed(
+        lambda: conn.execute(DUE_SQL.format(hint="NOT INDEXED"), (now_ms,)).fetchall(), args.repeats
+    )
+    stats = timed(lambda: retry_stats(conn.cursor()), args.repeats)
+    conn.close()
+
+    # Claims for real: each call marks its rows dialing
+    engine = CallRetryEngine(workers=4)
+    claim = timed(lambda: engine._claim(16), args.repeats)
+
+    print(f"due retries, partial index: {indexed:8.2f} ms")
+    print(f"due retries, table scan:    {scan:8.2f} ms")
+    print(f"claim (16 rows, commit):    {claim:8.2f} ms")
+    print(f"retry statistics:           {stats:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
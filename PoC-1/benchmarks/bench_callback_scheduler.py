@@ -0,0 +1,165 @@
+"""
+Callback scheduler under a large backlog, with a restart part way through.
+
+Builds a scratch database with ``init_db``, queues ``--pending`` callbacks
+due over the next ``--days`` days plus ``--due`` callbacks due within the
+next ``--window`` seconds, and runs ``CallbackScheduler`` with a stand-in
+dialler that takes ``--dial-ms`` per call. Half way through the due
+callbacks the scheduler is stopped mid-dial (as a crash would) and a new
+one is started on the same database.
+
+Reports how long the startup load takes, dispatch lag (time from due to
+dial), throughput, the highest number of concurrent dials, the cost of
+adding a callback, and how many callbacks were dialled more than once
+(should be 0; the ones cut off by the restart end up ``interrupted``).
+
+Usage (from the PoC-1 directory):
+    python benchmarks/bench_callback_scheduler.py --pending 300000 --due 2000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class StandInDialler:
+    def __init__(self, dial_ms):
+        self.dial_ms = dial_ms
+        self.dialled = Counter()
+        self.lags = []
+        self.active = 0
+        self.max_active = 0
+        self.due = {}
+
+    async def __call__(self, phone_number, purpose):
+        job_id = int(phone_number[1:])
+        self.dialled[job_id] += 1
+        self.lags.append(time.time() * 1000 - self.due[job_id])
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.dial_ms / 1000)
+        finally:
+            self.active -= 1
+        return {"success": True, "call_id": f"call-{job_id}"}
+
+
+def populate(pending, due, days, window):
+    now_ms = int(time.time() * 1000)
+    conn = sqlite3.connect("voice_agent.db")
+    rows = []
+    for i in range(1, pending + due + 1):
+        if i <= due:
+            due_at = now_ms + 2000 + random.randint(0, int(window * 1000))
+        else:
+            due_at = now_ms + random.randint(3_600_000, days * 86_400_000)
+        rows.append((f"+{i}", "benchmark", due_at))
+    conn.executemany(
+        "INSERT INTO scheduled_callbacks (phone_number, purpose, due_at) VALUES (?, ?, ?)",
+        rows,
+    )
+    conn.commit()
+    due_at = dict(conn.execute("SELECT id, due_at FROM scheduled_callbacks"))
+    conn.close()
+    return due_at
+
+
+async def run_until(scheduler, condition):
+    task = asyncio.create_task(scheduler.run())
+    while not condition():
+        await asyncio.sleep(0.05)
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+
+async def benchmark(args, dialler):
+    from app.callback_scheduler import BusinessHours, CallbackScheduler
+
+    def make_scheduler():
+        return CallbackScheduler(
+            dial=dialler,
+            max_concurrent=args.concurrency,
+            horizon_seconds=args.horizon,
+            hours=BusinessHours(hours="", days=""),
+        )
+
+    # Only the due callbacks are loaded; the rest stay in the table
+    scheduler = make_scheduler()
+    started = time.perf_counter()
+    loaded = await asyncio.to_thread(scheduler._load, int(time.time() * 1000) + args.horizon * 1000)
+    print(f"startup load: {len(loaded)} callbacks due within {args.horizon:.0f} s "
+          f"in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    started = time.perf_counter()
+    await run_until(scheduler, lambda: len(dialler.dialled) >= args.due // 2)
+    print(f"stopped after {len(dialler.dialled)} dials")
+    await run_until(make_scheduler(), lambda: len(dialler.dialled) + interrupted() >= args.due)
+    elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(args.adds):
+        scheduler.schedule("+0", int(time.time() * 1000) + 86_400_000, "benchmark")
+    add_ms = (time.perf_counter() - started) * 1000 / args.adds
+    return elapsed, add_ms
+
+
+def interrupted():
+    conn = sqlite3.connect("voice_agent.db")
+    try:
+        return conn.execute(
+            "SELECT COUNT(*) FROM scheduled_callbacks WHERE status = 'interrupted'"
+        ).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--pending", type=int, default=300_000, help="callbacks due later")
+    parser.add_argument("--due", type=int, default=2000, help="callbacks due now")
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--window", type=float, default=10, help="seconds the due ones spread over")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--dial-ms", type=float, default=100)
+    parser.add_argument("--horizon", type=float, default=600)
+    parser.add_argument("--adds", type=int, default=500, help="callbacks added through the API")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    os.chdir(tempfile.mkdtemp())  # init_db uses ./voice_agent.db
+    from app.database import init_db
+
+    init_db()
+    started = time.perf_counter()
+    dialler = StandInDialler(args.dial_ms)
+    dialler.due = populate(args.pending, args.due, args.days, args.window)
+    print(f"queued {args.pending + args.due} callbacks in {time.perf_counter() - started:.1f} s")
+
+    elapsed, add_ms = asyncio.run(benchmark(args, dialler))
+    lags = sorted(dialler.lags)
+    twice = sum(1 for count in dialler.dialled.values() if count > 1)
+    print(f"dialled {len(dialler.dialled)} in {elapsed:.1f} s, "
+          f"max concurrent {dialler.max_active} (cap {args.concurrency})")
+    print(f"dispatch lag ms: p50 {statistics.median(lags):.0f}  "
+          f"p99 {lags[int(0.99 * (len(lags) - 1))]:.0f}  max {lags[-1]:.0f}")
+    print(f"interrupted by the restart: {interrupted()}, dialled more than once: {twice}")
+    print(f"adding a callback: {add_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Contention test for duplicate-dial protection.
+
+Starts ``--processes`` processes sharing one scratch database (each like
+an app worker) that all fire ``--requests`` concurrent ``make_outbound_call``
+requests at once, for numbers drawn from a pool of only ``--numbers``, so
+most requests overlap with another one in the same or another process.
+Vapi is the mock server (``benchmarks/mock_providers.py``, from the
+repository root), which counts the calls it receives.
+
+Reports how many requests placed a call, how many got an existing call's
+id, request latency, and checks that every number was called once: one
+``success`` row per number and as many Vapi requests as numbers (the run
+must be shorter than ``DIAL_DEDUPE_SECONDS``).
+
+Usage (from the PoC-1 directory, with the mock server running):
+    python ../benchmarks/mock_providers.py --port 9000 &
+    python benchmarks/bench_dial_guard.py --processes 4 --requests 2000 --numbers 200
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+async def fire(requests, numbers, start_at, seed):
+    from app.call_logic import make_outbound_call
+
+    rng = random.Random(seed)
+
+    async def one():
+        started = time.perf_counter()
+        result = await make_outbound_call(
+            phone_number=f"+1555{rng.randrange(numbers):07d}", purpose="contention test"
+        )
+        return result, time.perf_counter() - started
+
+    await asyncio.sleep(max(start_at - time.time(), 0))
+    return await asyncio.gather(*(one() for _ in range(requests)))
+
+
+def worker(requests, numbers, start_at, seed, results):
+    outcomes = asyncio.run(fire(requests, numbers, start_at, seed))
+    results.put(
+        {
+            "placed": sum(1 for r, _ in outcomes if r["success"] and not r.get("duplicate")),
+            "duplicate": sum(1 for r, _ in outcomes if r["success"] and r.get("duplicate")),
+            "failed": sum(1 for r, _ in outcomes if not r["success"]),
+            "latencies": [latency for _, latency in outcomes],
+        }
+    )
+
+
+def vapi_requests(vapi_url):
+    with urllib.request.urlopen(f"{vapi_url}/__stats") as response:
+        return json.load(response).get("vapi_requests", 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--vapi-url", default="http://127.0.0.1:9000")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=2000, help="concurrent requests per process")
+    parser.add_argument("--numbers", type=int, default=200, help="distinct numbers dialled")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    os.environ["VAPI_BASE_URL"] = args.vapi_url
+    os.environ.setdefault("VAPI_API_KEY", "test")
+    os.environ.setdefault("VAPI_ASSISTANT_ID", "test")
+    os.chdir(tempfile.mkdtemp())  # the app uses ./voice_agent.db
+    from app.config import DIAL_DEDUPE_SECONDS
+    from app.database import init_db
+
+    init_db()
+    before = vapi_requests(args.vapi_url)
+
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    start_at = time.time() + 3  # after every process has imported the app
+    processes = [
+        context.Process(
+            target=worker, args=(args.requests, args.numbers, start_at, args.seed + i, results)
+        )
+        for i in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    outcomes = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    elapsed = time.time() - start_at
+
+    latencies = sorted(latency for outcome in outcomes for latency in outcome["latencies"])
+    total = len(latencies)
+    placed = sum(outcome["placed"] for outcome in outcomes)
+    duplicate = sum(outcome["duplicate"] for outcome in outcomes)
+    failed = sum(outcome["failed"] for outcome in outcomes)
+    print(f"{total} requests from {args.processes} processes in {elapsed:.1f} s: "
+          f"{placed} placed a call, {duplicate} got an existing call, {failed} failed")
+    print(f"latency ms: p50 {statistics.median(latencies) * 1000:.0f}  "
+          f"p99 {latencies[int(0.99 * (total - 1))] * 1000:.0f}")
+
+    conn = sqlite3.connect("voice_agent.db")
+    numbers, most = conn.execute(
+        """
+        SELECT COUNT(*), MAX(calls) FROM (
+            SELECT COUNT(*) AS calls FROM outbound_requests
+            WHERE status = 'success' GROUP BY phone_number
+        )
+    """
+    ).fetchone()
+    conn.close()
+    sent = vapi_requests(args.vapi_url) - before
+    print(f"numbers called: {numbers}, most calls to one number: {most}, "
+          f"requests that reached Vapi: {sent}")
+    if DIAL_DEDUPE_SECONDS == 0:
+        # Only dials in progress are shared
+        print("DIAL_DEDUPE_SECONDS=0: numbers may be called again once a call is placed")
+    elif most != 1 or sent != numbers:
+        raise SystemExit("Some numbers were called more than once")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Decode time and memory of Vapi webhook payloads, per decoder.
+
+Decoders:
+
+    json      json.loads into dicts (what ``request.json()`` does)
+    orjson    orjson.loads into dicts
+    slots     app.vapi_events without msgspec: orjson/json, copied into
+              __slots__ classes
+    msgspec   app.vapi_events with msgspec: typed decode of the stored
+              fields only
+
+Payloads are the samples in app/sample_events.py, plus the
+end-of-call-report with its transcript (in all three copies) grown to
+``--turns`` messages. For each decoder and payload the script reports the
+median decode time, the peak memory allocated while decoding one event and
+the memory still held per decoded event. Every decoder runs in a fresh
+interpreter so the measurements don't share allocator state.
+
+Usage (from the PoC-1 directory):
+    python benchmarks/bench_event_decoding.py --turns 200 --events 2000
+"""
+
+import argparse
+import copy
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DECODERS = ["json", "orjson", "slots", "msgspec"]
+
+
+def payloads(turns: int) -> dict:
+    from app.sample_events import END_OF_CALL_REPORT_EVENT, STATUS_UPDATE_EVENT
+
+    long_report = copy.deepcopy(END_OF_CALL_REPORT_EVENT)
+    message = long_report["message"]
+    conversation = message["messages"][1:]
+    grown = message["messages"][:1]
+    while len(grown) < turns:
+        grown.extend(copy.deepcopy(conversation))
+    grown = grown[:turns]
+    message["messages"] = grown
+    message["artifact"]["messages"] = grown
+    openai_formatted = [
+        {"role": "assistant" if m["role"] == "bot" else m["role"], "content": m["message"]}
+        for m in grown
+    ]
+    message["messagesOpenAIFormatted"] = openai_formatted
+    message["artifact"]["messagesOpenAIFormatted"] = openai_formatted
+
+    return {
+        "status-update": json.dumps(STATUS_UPDATE_EVENT).encode(),
+        "end-of-call-report": json.dumps(END_OF_CALL_REPORT_EVENT).encode(),
+        f"end-of-call-report ({turns} turns)": json.dumps(long_report).encode(),
+    }
+
+
+def load_decoder(name: str):
+    if name == "json":
+        return json.loads
+    if name == "orjson":
+        import orjson
+
+        return orjson.loads
+    if name == "slots":
+        sys.modules["msgspec"] = None  # force the fallback
+    from app import vapi_events
+
+    if name == "msgspec" and vapi_events.msgspec is None:
+        raise SystemExit("msgspec is not installed")
+    return vapi_events.decode_event
+
+
+def measure(decode, body: bytes, events: int, repeats: int) -> dict:
+    decode(body)  # warm up (decode plans, caches)
+
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for _ in range(events):
+            decode(body)
+        timings.append((time.perf_counter() - started) / events)
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    decode(body)
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+
+    baseline = tracemalloc.get_traced_memory()[0]
+    kept = [decode(body) for _ in range(events)]
+    retained = (tracemalloc.get_traced_memory()[0] - baseline) / len(kept)
+    tracemalloc.stop()
+
+    return {
+        "bytes": len(body),
+        "decode_us": statistics.median(timings) * 1e6,
+        "peak_kib": peak / 1024,
+        "retained_kib": retained / 1024,
+    }
+
+
+def run_decoder(args):
+    """Child process: measure one decoder, print JSON"""
+    sys.path.insert(0, ROOT)
+    decode = load_decoder(args.decoder)
+    results = {
+        name: measure(decode, body, args.events, args.repeats)
+        for name, body in payloads(args.turns).items()
+    }
+    print(json.dumps(results))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--decoders", nargs="+", choices=DECODERS, default=DECODERS)
+    parser.add_argument("--turns", type=int, default=200, help="messages in the long transcript")
+    parser.add_argument("--events", type=int, default=2000, help="events per timing run")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--decoder", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.decoder:
+        run_decoder(args)
+        return
+
+    results = {}
+    for decoder in args.decoders:
+        child = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--decoder", decoder,
+             "--turns", str(args.turns), "--events", str(args.events),
+             "--repeats", str(args.repeats)],
+            capture_output=True,
+            text=True,
+        )
+        if child.returncode != 0:
+            print(f"{decoder}: skipped ({child.stderr.strip().splitlines()[-1]})")
+            continue
+        results[decoder] = json.loads(child.stdout)
+
+    payload_names = next(iter(results.values()), {}).keys()
+    for payload in payload_names:
+        first = next(iter(results.values()))[payload]
+        print(f"\n{payload}: {first['bytes'] / 1024:.1f} KiB")
+        print(f"{'decoder':>10} {'decode us':>10} {'peak KiB':>10} {'kept KiB':>10}")
+        for decoder, by_payload in results.items():
+            r = by_payload[payload]
+            print(f"{decoder:>10} {r['decode_us']:>10.1f} {r['peak_kib']:>10.1f} {r['retained_kib']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Do-not-call list lookups at tens of millions of numbers.
+
+Writes a suppression list file of ``--numbers`` E.164 numbers (mostly
+North American, some UK), loads it with ``SuppressionList`` and reports the
+load time and memory, the time per lookup of a listed and an unlisted
+number (the index alone and the dial-path check with the key parsing), and
+the batch filter rate for a campaign of ``--batch`` numbers written in
+mixed formats. Finally it reloads the list while another thread keeps
+checking listed numbers, to show a reload never exposes a partial list.
+
+Usage (from the PoC-1 directory):
+    python benchmarks/bench_suppression.py --numbers 10000000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.suppression import SuppressionList, e164_key
+
+
+def random_number():
+    if random.random() < 0.9:
+        return f"+1{random.randint(2_000_000_000, 9_999_999_999)}"
+    return f"+447{random.randint(100_000_000, 999_999_999)}"
+
+
+def national_format(e164):
+    """How a campaign spreadsheet might write the number"""
+    if e164.startswith("+1") and random.random() < 0.5:
+        digits = e164[2:]
+        return f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
+    return e164
+
+
+def per_lookup_us(check, numbers, repeats=3):
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for number in numbers:
+            check(number)
+        best = min(best, time.perf_counter() - started)
+    return best / len(numbers) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--numbers", type=int, default=10_000_000)
+    parser.add_argument("--lookups", type=int, default=200_000)
+    parser.add_argument("--batch", type=int, default=100_000, help="campaign size to filter")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    path = os.path.join(tempfile.mkdtemp(), "suppression_list.txt")
+    started = time.perf_counter()
+    listed = []
+    with open(path, "w") as f:
+        for i in range(args.numbers):
+            number = random_number()
+            if i % max(args.numbers // args.lookups, 1) == 0:
+                listed.append(number)
+            f.write(number + "\n")
+    print(f"wrote {args.numbers} numbers ({os.path.getsize(path) / 1e6:.0f} MB) "
+          f"in {time.perf_counter() - started:.1f} s")
+
+    suppression = SuppressionList(path)
+    started = time.perf_counter()
+    suppression.load()
+    stats = suppression.stats()
+    print(f"loaded {stats['numbers']} distinct numbers in {time.perf_counter() - started:.1f} s, "
+          f"{stats['memory_bytes'] / 1e6:.0f} MB "
+          f"({stats['memory_bytes'] / max(stats['numbers'], 1):.1f} bytes/number)")
+
+    index = suppression._index
+    unlisted = [random_number() for _ in range(args.lookups)]
+    listed_keys = [e164_key(number) for number in listed]
+    unlisted_keys = [e164_key(number) for number in unlisted]
+    print(f"index lookup, listed:    {per_lookup_us(index.__contains__, listed_keys):.3f} us")
+    print(f"index lookup, unlisted:  {per_lookup_us(index.__contains__, unlisted_keys):.3f} us")
+    print(f"is_suppressed, listed:   {per_lookup_us(suppression.is_suppressed, listed):.3f} us")
+    print(f"is_suppressed, unlisted: {per_lookup_us(suppression.is_suppressed, unlisted):.3f} us")
+
+    campaign = [national_format(random.choice((listed, unlisted))[random.randrange(len(listed))])
+                for _ in range(args.batch)]
+    started = time.perf_counter()
+    result = suppression.filter(campaign)
+    elapsed = time.perf_counter() - started
+    print(f"filtered {args.batch} campaign numbers in {elapsed * 1000:.0f} ms "
+          f"({args.batch / elapsed:.0f}/s): {len(result['allowed'])} allowed, "
+          f"{len(result['suppressed'])} suppressed, {len(result['invalid'])} invalid")
+
+    # Listed numbers must stay suppressed throughout a reload
+    with open(path, "a") as f:
+        f.write(random_number() + "\n")
+    misses = checks = 0
+    reloading = True
+
+    def check_while_reloading():
+        nonlocal misses, checks
+        while reloading:
+            for number in listed[:1000]:
+                checks += 1
+                if not suppression.is_suppressed(number):
+                    misses += 1
+
+    checker = threading.Thread(target=check_while_reloading)
+    checker.start()
+    started = time.perf_counter()
+    suppression.reload_if_changed()
+    reloading = False
+    checker.join()
+    print(f"reloaded in {time.perf_counter() - started:.1f} s during {checks} checks: "
+          f"{misses} listed numbers missed")
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
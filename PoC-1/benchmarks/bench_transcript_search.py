@@ -0,0 +1,139 @@
+"""
+Latency of /search/transcripts queries over a large synthetic call history.
+
+Builds a scratch database with ``init_db`` (so the FTS tables and triggers
+are the real ones), fills it with ``--messages`` transcript messages
+across calls spread over ``--days`` days, then reports the median time
+of a set of queries: a rare word, a common word, a prefix, a multi-word
+query, a date-bounded query and a deep page.
+
+Usage (from the PoC-1 directory):
+    python benchmarks/bench_transcript_search.py --messages 1000000
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+COMMON = (
+    "internet connection issue resolved working fine thanks help today "
+    "check please call back tomorrow still slow modem router speed"
+).split()
+FILLER = (
+    "the a is it my and to of in for on with this that was have you can "
+    "yes no okay sure hello hi again now just really"
+).split()
+RARE = ["refund", "cancellation", "technician", "outage", "billing"]
+
+QUERIES = [
+    ("rare word", "technician", {}),
+    ("common word", "internet", {}),
+    ("prefix", "rout*", {}),
+    ("all words", "router still slow", {}),
+    ("last 7 days", "refund", {"days": 7}),
+    ("page 10", "connection", {"offset": 200}),
+]
+
+
+def sentence():
+    words = random.choices(FILLER, k=random.randint(3, 8))
+    words += random.choices(COMMON, k=random.randint(1, 4))
+    if random.random() < 0.01:
+        words.append(random.choice(RARE))
+    random.shuffle(words)
+    return " ".join(words).capitalize() + "."
+
+
+def populate(messages, per_call, days):
+    conn = sqlite3.connect("voice_agent.db")
+    cursor = conn.cursor()
+    now = datetime.now(timezone.utc)
+    written = 0
+    while written < messages:
+        call_id = str(uuid.uuid4())
+        start = now - timedelta(seconds=random.uniform(0, days * 86400))
+        start_ms = int(start.timestamp() * 1000)
+        cursor.execute(
+            "INSERT INTO calls (id, type, status) VALUES (?, 'outboundPhoneCall', 'ended')",
+            (call_id,),
+        )
+        turns = min(per_call, messages - written)
+        cursor.executemany(
+            """
+            INSERT INTO conversations
+            (call_id, role, message, timestamp, seconds_from_start, duration)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """,
+            [
+                (call_id, "bot" if i % 2 else "user", sentence(), start_ms + i * 4000, i * 4.0, 3000)
+                for i in range(turns)
+            ],
+        )
+        cursor.execute(
+            "INSERT INTO call_intents (call_id, intent, summary, created_at) VALUES (?, ?, ?, ?)",
+            (call_id, "report_issue", sentence() + " " + sentence(), start.strftime("%Y-%m-%d %H:%M:%S")),
+        )
+        written += turns
+        if written % 100_000 < per_call:
+            conn.commit()
+    conn.commit()
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--messages", type=int, default=1_000_000)
+    parser.add_argument("--per-call", type=int, default=12, help="messages per call")
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    scratch = tempfile.mkdtemp()
+    os.chdir(scratch)  # init_db uses ./voice_agent.db
+
+    from app.database import init_db
+    from app.transcript_search import search_transcripts
+
+    init_db()
+    started = time.perf_counter()
+    populate(args.messages, args.per_call, args.days)
+    size_mb = os.path.getsize("voice_agent.db") / 1e6
+    print(f"indexed {args.messages} messages in {time.perf_counter() - started:.1f} s "
+          f"({size_mb:.0f} MB database)")
+
+    conn = sqlite3.connect("voice_agent.db")
+    cursor = conn.cursor()
+    print(f"{'query':>14} {'median ms':>10} {'p95 ms':>8} {'hits':>5}")
+    for label, text, options in QUERIES:
+        since = None
+        if "days" in options:
+            since = datetime.now(timezone.utc) - timedelta(days=options["days"])
+        timings = []
+        for _ in range(args.repeats):
+            t = time.perf_counter()
+            hits, _ = search_transcripts(
+                cursor, text, since=since, limit=args.limit, offset=options.get("offset", 0)
+            )
+            timings.append((time.perf_counter() - t) * 1000)
+        timings.sort()
+        p95 = timings[int(0.95 * (len(timings) - 1))]
+        print(f"{label:>14} {statistics.median(timings):>10.1f} {p95:>8.1f} {len(hits):>5}")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,10 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
+import functools
 import logging
+import time
+from utils.log_pipeline import sample_interaction, truncate
+from utils.metrics import AGENT_PROCESS_DURATION, record_timing
 
 logger = logging.getLogger(__name__)
 
@@ -10,6 +14,12 @@ class BaseAgent(ABC):
     def __init__(self, name: str):
         self.name = name
         self.logger = logging.getLogger(f"{__name__}.{name}")
+
+    def __init_subclass__(cls, **kwargs):
+        """Wrap each concrete ``process`` so every agent call is timed"""
+        super().__init_subclass__(**kwargs)
+        if "process" in cls.__dict__:
+            cls.process = _timed_process(cls.__dict__["process"])
     
     @abstractmethod
     async def process(self, message: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
@@ -17,7 +27,35 @@ class BaseAgent(ABC):
         pass
     
     def log_interaction(self, message: str, response: Dict[str, Any]):
-        """Log the interaction for debugging and monitoring"""
-        self.logger.info(f"Agent: {self.name}")
-        self.logger.info(f"Input: {message}")
-        self.logger.info(f"Output: {response}")
+        """Log the interaction for debugging and monitoring
+
+        Emits a single structured record with truncated payloads, subject to
+        ``LOG_INTERACTION_SAMPLE_RATE`` and the agent's own log level.
+        """
+        if not self.logger.isEnabledFor(logging.INFO) or not sample_interaction():
+            return
+        self.logger.info(
+            "Agent interaction",
+            extra={
+                "agent": self.name,
+                "input": truncate(message),
+                "output": truncate(response),
+            },
+        )
+
+
+
+def _timed_process(process):
+    """Record ``process`` latency in ``agent_process_duration_seconds``"""
+
+    @functools.wraps(process)
+    async def wrapper(self, message, context=None):
+        start = time.perf_counter()
+        try:
+            return await process(self, message, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            AGENT_PROCESS_DURATION.observe(elapsed, agent=self.name)
+            record_timing(f"agent-{self.name}", elapsed)
+
+    return wrapper
@@ -0,0 +1,120 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Circuit breaker for a flaky or slow external dependency.
+
+    Outcomes of recent calls are kept in a rolling window; a call counts as
+    bad if it failed or took longer than ``latency_threshold`` seconds. Once
+    ``failure_threshold`` of the last ``window_size`` calls are bad the
+    breaker opens and callers should use their fallback immediately.
+
+    After ``reset_timeout`` seconds an open breaker goes half-open and runs a
+    single probe in the background; callers keep using the fallback until
+    the probe succeeds and the breaker closes again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        window_size: int = 20,
+        latency_threshold: float = 3.0,
+        reset_timeout: float = 30.0,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.latency_threshold = latency_threshold
+        self.reset_timeout = reset_timeout
+        self._outcomes = deque(maxlen=window_size)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_task: Optional[asyncio.Task] = None
+        self.trips = 0
+        self.short_circuited = 0
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Whether a real call should be attempted right now"""
+        if self._state == self.CLOSED:
+            return True
+        self.short_circuited += 1
+        return False
+
+    def record_success(self, latency: float):
+        if self._state == self.HALF_OPEN:
+            if latency <= self.latency_threshold:
+                self._close()
+            else:
+                self._trip("slow probe")
+            return
+        self._record(latency > self.latency_threshold)
+
+    def record_failure(self):
+        if self._state == self.HALF_OPEN:
+            self._trip("failed probe")
+            return
+        self._record(True)
+
+    def maybe_probe(self, probe: Callable[[], Awaitable[Any]]):
+        """Start a background half-open probe if the breaker is due for one.
+
+        ``probe`` must report its own outcome via ``record_success`` or
+        ``record_failure``.
+        """
+        if self._state != self.OPEN or self._probe_task is not None:
+            return
+        if time.monotonic() - self._opened_at < self.reset_timeout:
+            return
+        self._state = self.HALF_OPEN
+        self._probe_task = asyncio.ensure_future(self._run_probe(probe))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self._state,
+            "trips": self.trips,
+            "short_circuited": self.short_circuited,
+            "recent_failures": sum(self._outcomes),
+            "recent_calls": len(self._outcomes),
+        }
+
+    async def _run_probe(self, probe: Callable[[], Awaitable[Any]]):
+        try:
+            await probe()
+        except Exception as e:
+            logger.info(f"Circuit {self.name} probe failed: {e}")
+        finally:
+            self._probe_task = None
+            # A probe that never reported back must not leave us half-open
+            if self._state == self.HALF_OPEN:
+                self._trip("probe without outcome")
+
+    def _record(self, bad: bool):
+        self._outcomes.append(bad)
+        if self._state == self.CLOSED and sum(self._outcomes) >= self.failure_threshold:
+            self._trip(f"{sum(self._outcomes)} bad calls in last {len(self._outcomes)}")
+
+    def _trip(self, reason: str):
+        if self._state == self.CLOSED:
+            self.trips += 1
+        logger.warning(f"Circuit {self.name} opened: {reason}")
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+
+    def _close(self):
+        logger.info(f"Circuit {self.name} closed")
+        self._state = self.CLOSED
+        self._outcomes.clear()
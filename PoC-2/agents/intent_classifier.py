@@ -1,46 +1,49 @@
+import asyncio
 import os
-import openai
+import time
 from typing import Dict, Any
 from agents.base_agent import BaseAgent
-from utils.prompts import INTENT_CLASSIFICATION_PROMPT
+from agents.circuit_breaker import CircuitBreaker
+from utils.templates import INTENT_CLASSIFICATION
 from schemas.models import IntentType
+from utils.metrics import time_external
+from utils.providers import get_openai_client
 import re
 
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "10"))
+# Seconds to wait for the LLM before answering with keyword classification;
+# 0 disables hedging
+INTENT_HEDGE_BUDGET = float(os.getenv("INTENT_HEDGE_BUDGET", "0"))
+PROBE_MESSAGE = "How do I reset my password?"
+
+# Shared by every classifier instance in the process
+openai_breaker = CircuitBreaker(
+    "openai",
+    failure_threshold=int(os.getenv("OPENAI_BREAKER_FAILURES", "5")),
+    window_size=int(os.getenv("OPENAI_BREAKER_WINDOW", "20")),
+    latency_threshold=float(os.getenv("OPENAI_BREAKER_LATENCY", "3.0")),
+    reset_timeout=float(os.getenv("OPENAI_BREAKER_RESET", "30")),
+)
+hedge_stats = {"hedged": 0, "llm_errors": 0}
+_background_calls = set()
+
+
 class IntentClassifierAgent(BaseAgent):
     """Agent responsible for classifying user intent"""
     
     def __init__(self):
         super().__init__("IntentClassifier")
-        self.openai_client = None
-        self.use_openai = False
-        
-        # Try to initialize OpenAI client
-        api_key = os.getenv("OPENAI_API_KEY")
-        if api_key:
-            try:
-                self.openai_client = openai.OpenAI(api_key=api_key)
-                self.use_openai = True
-                self.logger.info("OpenAI client initialized successfully")
-            except Exception as e:
-                self.logger.warning(f"Failed to initialize OpenAI client: {e}")
-                self.use_openai = False
-        else:
-            self.logger.info("OpenAI API key not configured, using keyword-based classification")
+        # Built on first use and shared by every classifier in the process
+        self.openai_client = get_openai_client(OPENAI_TIMEOUT)
+        self.use_openai = self.openai_client is not None
     
     async def process(self, message: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """Classify the intent of the user message"""
         try:
             if self.use_openai:
-                intent, reasoning = await self._classify_with_openai(message)
+                result = await self._classify_with_openai(message)
             else:
-                intent, reasoning = self._classify_with_keywords(message)
-            
-            result = {
-                "intent": intent,
-                "confidence": 0.8 if self.use_openai else 0.6,
-                "reasoning": reasoning,
-                "agent": self.name
-            }
+                result = self.keyword_result(message)
             
             self.log_interaction(message, result)
             return result
@@ -55,43 +58,97 @@ class IntentClassifierAgent(BaseAgent):
                 "error": str(e)
             }
     
-    async def _classify_with_openai(self, message: str) -> tuple:
-        """Classify intent using OpenAI API"""
+    def keyword_result(self, message: str, fallback: str = None) -> Dict[str, Any]:
+        """Classification result from keyword matching only, used as a fallback"""
+        intent, reasoning = self._classify_with_keywords(message)
+        result = {
+            "intent": intent,
+            "confidence": 0.6,
+            "reasoning": reasoning,
+            "agent": self.name
+        }
+        if fallback:
+            result["fallback"] = fallback
+        return result
+    
+    def circuit_status(self) -> Dict[str, Any]:
+        """Circuit breaker state and hedging counters for the OpenAI path"""
+        return {**openai_breaker.stats(), **hedge_stats, "hedge_budget": INTENT_HEDGE_BUDGET}
+    
+    async def _classify_with_openai(self, message: str) -> Dict[str, Any]:
+        """Classify with OpenAI behind the circuit breaker.
+
+        Falls back to keyword classification when the breaker is open, when
+        the call fails, or (in hedged mode) when the LLM has not answered
+        within ``INTENT_HEDGE_BUDGET`` seconds.
+        """
+        if not openai_breaker.allow_request():
+            openai_breaker.maybe_probe(lambda: self._call_openai(PROBE_MESSAGE))
+            return self.keyword_result(message, fallback="circuit_open")
+        
+        call = asyncio.ensure_future(self._call_openai(message))
+        if INTENT_HEDGE_BUDGET > 0:
+            done, _ = await asyncio.wait({call}, timeout=INTENT_HEDGE_BUDGET)
+            if not done:
+                # Let the call finish so the breaker still sees its outcome
+                hedge_stats["hedged"] += 1
+                _background_calls.add(call)
+                call.add_done_callback(_finish_background_call)
+                return self.keyword_result(message, fallback="hedged")
+        
         try:
-            prompt = INTENT_CLASSIFICATION_PROMPT.format(message=message)
-            
-            response = self.openai_client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert intent classification system."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=150,
-                temperature=0.1
-            )
-            
-            content = response.choices[0].message.content.strip()
-            
-            # Parse the response
-            intent_match = re.search(r'INTENT:\s*(\w+)', content)
-            reasoning_match = re.search(r'REASONING:\s*(.+)', content)
-            
-            if intent_match:
-                intent_str = intent_match.group(1).upper()
-                try:
-                    intent = IntentType(intent_str.lower())
-                except ValueError:
-                    intent = IntentType.GENERAL
-            else:
-                intent = IntentType.GENERAL
-            
-            reasoning = reasoning_match.group(1) if reasoning_match else "OpenAI classification"
-            
-            return intent, reasoning
-            
+            intent, reasoning = await call
         except Exception as e:
             self.logger.error(f"OpenAI classification failed: {e}")
-            return self._classify_with_keywords(message)
+            hedge_stats["llm_errors"] += 1
+            return self.keyword_result(message, fallback="error")
+        
+        return {
+            "intent": intent,
+            "confidence": 0.8,
+            "reasoning": reasoning,
+            "agent": self.name
+        }
+    
+    async def _call_openai(self, message: str) -> tuple:
+        """Call the OpenAI API and report the outcome to the circuit breaker"""
+        prompt = INTENT_CLASSIFICATION.render(message=message)
+        
+        start = time.perf_counter()
+        try:
+            with time_external("openai"):
+                response = await self.openai_client.chat.completions.create(
+                    model="gpt-3.5-turbo",
+                    messages=[
+                        {"role": "system", "content": "You are an expert intent classification system."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=150,
+                    temperature=0.1
+                )
+        except Exception:
+            openai_breaker.record_failure()
+            raise
+        openai_breaker.record_success(time.perf_counter() - start)
+        
+        content = response.choices[0].message.content.strip()
+        
+        # Parse the response
+        intent_match = re.search(r'INTENT:\s*(\w+)', content)
+        reasoning_match = re.search(r'REASONING:\s*(.+)', content)
+        
+        if intent_match:
+            intent_str = intent_match.group(1).upper()
+            try:
+                intent = IntentType(intent_str.lower())
+            except ValueError:
+                intent = IntentType.GENERAL
+        else:
+            intent = IntentType.GENERAL
+        
+        reasoning = reasoning_match.group(1) if reasoning_match else "OpenAI classification"
+        
+        return intent, reasoning
     
     def _classify_with_keywords(self, message: str) -> tuple:
         """Classify intent using keyword matching"""
@@ -140,3 +197,11 @@ class IntentClassifierAgent(BaseAgent):
             reasoning = "No specific intent keywords found, classified as general inquiry"
         
         return best_intent, reasoning
+
+
+
+def _finish_background_call(call: asyncio.Future):
+    """Done-callback for hedged LLM calls left running in the background"""
+    _background_calls.discard(call)
+    if not call.cancelled() and call.exception() is not None:
+        hedge_stats["llm_errors"] += 1
@@ -1,60 +1,37 @@
 import os
 from typing import Dict, Any, Optional
 from agents.base_agent import BaseAgent
-from utils.prompts import NOTIFICATION_EMAIL_TEMPLATE, NOTIFICATION_SMS_TEMPLATE
+from utils.templates import NOTIFICATION_EMAIL, NOTIFICATION_SMS
 from models.database import Notification
 from schemas.models import NotificationStatus
 from sqlalchemy.ext.asyncio import AsyncSession
+from utils.metrics import time_external
+from utils.providers import (
+    build_sendgrid_mail,
+    get_sendgrid_client,
+    get_twilio_client,
+    sendgrid_configured,
+    twilio_configured,
+)
 import asyncio
 
 
-try:
-    from sendgrid import SendGridAPIClient
-    from sendgrid.helpers.mail import Mail
-
-    SENDGRID_AVAILABLE = True
-except ImportError:
-    SENDGRID_AVAILABLE = False
-
-try:
-    from twilio.rest import Client as TwilioClient
-
-    TWILIO_AVAILABLE = True
-except ImportError:
-    TWILIO_AVAILABLE = False
-
-
 class NotifyAgent(BaseAgent):
     def __init__(self, db_session: AsyncSession):
         super().__init__("NotifyAgent")
         self.db_session = db_session
 
-        # Initialize SendGrid
-        self.sendgrid_client = None
-        self.sendgrid_from_email = None
-        if SENDGRID_AVAILABLE:
-            api_key = os.getenv("SENDGRID_API_KEY")
-            if api_key:
-                try:
-                    self.sendgrid_client = SendGridAPIClient(api_key)
-                    self.sendgrid_from_email = os.getenv("SENDGRID_FROM_EMAIL")
-                    self.logger.info("SendGrid client initialized")
-                except Exception as e:
-                    self.logger.error(f"Failed to initialize SendGrid: {e}")
-
-        # Initialize Twilio
-        self.twilio_client = None
-        self.twilio_phone = None
-        if TWILIO_AVAILABLE:
-            account_sid = os.getenv("TWILIO_ACCOUNT_SID")
-            auth_token = os.getenv("TWILIO_AUTH_TOKEN")
-            if account_sid and auth_token:
-                try:
-                    self.twilio_client = TwilioClient(account_sid, auth_token)
-                    self.twilio_phone = os.getenv("TWILIO_PHONE_NUMBER")
-                    self.logger.info("Twilio client initialized")
-                except Exception as e:
-                    self.logger.error(f"Failed to initialize Twilio: {e}")
+        # Provider clients are imported and built on the first send
+        self.sendgrid_from_email = os.getenv("SENDGRID_FROM_EMAIL")
+        self.twilio_phone = os.getenv("TWILIO_PHONE_NUMBER")
+
+    @property
+    def sendgrid_client(self):
+        return get_sendgrid_client()
+
+    @property
+    def twilio_client(self):
+        return get_twilio_client()
 
     async def process(
         self, message: str, context: Dict[str, Any] = None
@@ -148,18 +125,19 @@ class NotifyAgent(BaseAgent):
 
         try:
             subject = f"Support Ticket Update - {ticket_number}"
-            formatted_message = NOTIFICATION_EMAIL_TEMPLATE.format(
+            formatted_message = NOTIFICATION_EMAIL.render(
                 subject=subject, message=message, ticket_number=ticket_number
             )
 
-            mail = Mail(
+            mail = build_sendgrid_mail(
                 from_email=self.sendgrid_from_email,
                 to_emails=recipient,
                 subject=subject,
                 html_content=formatted_message.replace("\n", "<br>"),
             )
 
-            response = self.sendgrid_client.send(mail)
+            with time_external("sendgrid"):
+                response = self.sendgrid_client.send(mail)
 
             if response.status_code in [200, 201, 202]:
                 return True, None
@@ -177,7 +155,7 @@ class NotifyAgent(BaseAgent):
             return False, "Twilio not configured"
 
         try:
-            formatted_message = NOTIFICATION_SMS_TEMPLATE.format(
+            formatted_message = NOTIFICATION_SMS.render(
                 message=message, ticket_number=ticket_number
             )
 
@@ -189,9 +167,10 @@ class NotifyAgent(BaseAgent):
                 from_number = self.twilio_phone
                 to_number = recipient
 
-            message_obj = self.twilio_client.messages.create(
-                body=formatted_message, from_=from_number, to=to_number
-            )
+            with time_external("twilio"):
+                message_obj = self.twilio_client.messages.create(
+                    body=formatted_message, from_=from_number, to=to_number
+                )
 
             return True, None
 
@@ -216,8 +195,9 @@ class NotifyAgent(BaseAgent):
 
     def get_notification_capabilities(self) -> Dict[str, bool]:
         """Return available notification capabilities"""
+        # Based on configuration so that status checks do not import the SDKs
         return {
-            "email": self.sendgrid_client is not None,
-            "sms": self.twilio_client is not None,
-            "whatsapp": self.twilio_client is not None,
+            "email": sendgrid_configured(),
+            "sms": twilio_configured(),
+            "whatsapp": twilio_configured(),
         }
@@ -0,0 +1,167 @@
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Union
+from utils.metrics import stage_timer
+
+logger = logging.getLogger(__name__)
+
+# Results of completed stages, keyed by stage name
+StageResults = Dict[str, Any]
+
+
+def _parse_limits(spec: str) -> Dict[str, int]:
+    """Parse ``"IntentClassifier=32,NotifyAgent=8"`` into a mapping"""
+    limits = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        name, limit = item.split("=", 1)
+        limits[name.strip()] = int(limit)
+    return limits
+
+
+AGENT_CONCURRENCY_LIMITS = _parse_limits(os.getenv("AGENT_CONCURRENCY_LIMITS", ""))
+_agent_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+
+def _agent_semaphore(agent_type: str) -> Optional[asyncio.Semaphore]:
+    """Shared per-process semaphore capping concurrent calls to one agent type"""
+    limit = AGENT_CONCURRENCY_LIMITS.get(agent_type)
+    if not limit:
+        return None
+    semaphore = _agent_semaphores.get(agent_type)
+    if semaphore is None:
+        semaphore = _agent_semaphores[agent_type] = asyncio.Semaphore(limit)
+    return semaphore
+
+
+@dataclass
+class Stage:
+    """One step of an agent pipeline.
+
+    ``run`` receives the results of all completed stages. A stage starts as
+    soon as every stage in ``depends_on`` has finished (or been skipped or
+    cancelled). ``when`` can skip a stage based on earlier results.
+
+    A speculative stage starts without waiting for ``confirm_after``; once
+    that stage completes, ``keep_if`` decides whether the speculative work is
+    still wanted, and it is cancelled if not.
+    """
+
+    name: str
+    run: Callable[[StageResults], Awaitable[Any]]
+    depends_on: Tuple[str, ...] = ()
+    timeout: Optional[float] = None
+    fallback: Optional[Callable[[StageResults, BaseException], Any]] = None
+    when: Optional[Callable[[StageResults], bool]] = None
+    agent_type: Union[str, Callable[[StageResults], str], None] = None
+    confirm_after: Optional[str] = None
+    keep_if: Optional[Callable[[StageResults], bool]] = None
+
+
+class StageFailed(Exception):
+    """Raised when a stage without a fallback fails or times out"""
+
+    def __init__(self, stage: str, error: BaseException):
+        super().__init__(f"Stage '{stage}' failed: {error!r}")
+        self.stage = stage
+        self.error = error
+
+
+class PipelineExecutor:
+    """Run ``Stage`` objects concurrently, respecting their dependencies"""
+
+    def __init__(self, stages: list):
+        self.stages = {stage.name: stage for stage in stages}
+        self.outcomes: Dict[str, str] = {}
+        for stage in stages:
+            for dep in stage.depends_on:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown '{dep}'")
+
+    async def run(self, initial: Optional[StageResults] = None) -> StageResults:
+        """Execute all stages and return their results by name.
+
+        Stages with a result in ``initial`` are not run. Skipped and
+        cancelled stages have a result of ``None``; see ``outcomes`` for how
+        each stage finished.
+        """
+        results: StageResults = dict(initial or {})
+        self.outcomes = {name: "provided" for name in results if name in self.stages}
+        waiting = {name: stage for name, stage in self.stages.items() if name not in self.outcomes}
+        running: Dict[asyncio.Task, str] = {}
+
+        try:
+            while waiting or running:
+                for name, stage in list(waiting.items()):
+                    if not all(dep in self.outcomes for dep in stage.depends_on):
+                        continue
+                    del waiting[name]
+                    if stage.when is not None and not stage.when(results):
+                        self._finish(name, None, "skipped", results)
+                        continue
+                    task = asyncio.create_task(self._run_stage(stage, results))
+                    running[task] = name
+
+                if not running:
+                    if waiting:
+                        raise ValueError(f"Unresolvable stage dependencies: {list(waiting)}")
+                    break
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task not in running:
+                        # Speculative work ruled out by a stage that finished with it
+                        continue
+                    name = running.pop(task)
+                    value, outcome = task.result()
+                    self._finish(name, value, outcome, results)
+                    self._confirm_speculative(name, results, running)
+        finally:
+            for task in running:
+                task.cancel()
+
+        return results
+
+    def _finish(self, name: str, value: Any, outcome: str, results: StageResults):
+        results[name] = value
+        self.outcomes[name] = outcome
+
+    def _confirm_speculative(
+        self, completed: str, results: StageResults, running: Dict[asyncio.Task, str]
+    ):
+        """Cancel speculative stages that ``completed`` has ruled out"""
+        for task, name in list(running.items()):
+            stage = self.stages[name]
+            if stage.confirm_after != completed or stage.keep_if is None:
+                continue
+            if not stage.keep_if(results):
+                task.cancel()
+                del running[task]
+                self._finish(name, None, "cancelled", results)
+                logger.debug(f"Cancelled speculative stage {name}")
+
+    async def _run_stage(self, stage: Stage, results: StageResults) -> Tuple[Any, str]:
+        agent_type = stage.agent_type(results) if callable(stage.agent_type) else stage.agent_type
+        semaphore = _agent_semaphore(agent_type) if agent_type else None
+
+        try:
+            with stage_timer(stage.name):
+                if semaphore is None:
+                    value = await asyncio.wait_for(stage.run(results), stage.timeout)
+                else:
+                    async with semaphore:
+                        value = await asyncio.wait_for(stage.run(results), stage.timeout)
+            return value, "done"
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if isinstance(e, asyncio.TimeoutError):
+                logger.warning(f"Stage {stage.name} timed out after {stage.timeout}s")
+            else:
+                logger.error(f"Stage {stage.name} failed: {e}")
+            if stage.fallback is None:
+                raise StageFailed(stage.name, e) from e
+            return stage.fallback(results, e), "fallback"
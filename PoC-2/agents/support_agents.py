@@ -1,12 +1,22 @@
 from typing import Dict, Any, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import func, update
 from agents.base_agent import BaseAgent
-from models.database import FAQ, Ticket, ChatMessage
+from agents.ticket_dedup import ticket_dedup
+from agents.ticket_priority import priority_scorer
+from agents.ticket_queue import ticket_queue
+from models.database import Ticket, ChatMessage
+from models.database import TicketStatus as TicketStatusColumn
 from utils.prompts import FAQ_AGENT_PROMPT, COMPLAINT_AGENT_PROMPT, ACCOUNT_AGENT_PROMPT
 from utils.helpers import generate_ticket_number, extract_keywords
-from schemas.models import IntentType, TicketStatus
-import json
+from utils.faq_cache import FAQEntry, faq_cache
+from utils.templates import (
+    ACCOUNT_RESPONSE,
+    COMPLAINT_DUPLICATE_RESPONSE,
+    COMPLAINT_RESPONSE,
+    FAQ_NO_MATCH,
+)
+from schemas.models import IntentType
 
 class FAQAgent(BaseAgent):
     def __init__(self, db_session: AsyncSession):
@@ -16,8 +26,10 @@ class FAQAgent(BaseAgent):
     async def process(self, message: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """Process FAQ requests"""
         try:
-            
-            relevant_faqs = await self._search_faqs(message)
+            prefetched = context.get("prefetched_faqs") if context else None
+            relevant_faqs = (
+                prefetched if prefetched is not None else await self.search_faqs(message)
+            )
             
             # Generate response using FAQ data
             response = await self._generate_faq_response(message, relevant_faqs)
@@ -40,21 +52,20 @@ class FAQAgent(BaseAgent):
                 "error": str(e)
             }
     
-    async def _search_faqs(self, message: str) -> List[FAQ]:
-        """Search for relevant FAQs based on the message"""
+    async def search_faqs(self, message: str) -> List[FAQEntry]:
+        """Search for relevant FAQs based on the message
+        
+        Reads the in-memory FAQ snapshot, so no database query is made.
+        """
         try:
             # Extract keywords from the message
             keywords = extract_keywords(message)
-            
-            # Query FAQs
-            stmt = select(FAQ).where(FAQ.is_active == True)
-            result = await self.db_session.execute(stmt)
-            all_faqs = result.scalars().all()
+            message_lower = message.lower()
             
             # Score FAQs based on keyword matching
             scored_faqs = []
-            for faq in all_faqs:
-                score = self._calculate_faq_score(message, keywords, faq)
+            for faq in faq_cache.snapshot.entries:
+                score = self._calculate_faq_score(message_lower, keywords, faq)
                 if score > 0:
                     scored_faqs.append((faq, score))
             
@@ -66,59 +77,29 @@ class FAQAgent(BaseAgent):
             self.logger.error(f"Error searching FAQs: {e}")
             return []
     
-    def _calculate_faq_score(self, message: str, keywords: List[str], faq: FAQ) -> float:
+    def _calculate_faq_score(self, message_lower: str, keywords: List[str], faq: FAQEntry) -> float:
         """Calculate relevance score for an FAQ"""
         score = 0.0
-        message_lower = message.lower()
-        faq_text = f"{faq.question} {faq.answer}".lower()
         
         # Check for direct keyword matches
         for keyword in keywords:
-            if keyword in faq_text:
+            if keyword in faq.search_text:
                 score += 1.0
         
         # Check for FAQ-specific keywords if available
-        if faq.keywords:
-            try:
-                faq_keywords = json.loads(faq.keywords)
-                for faq_keyword in faq_keywords:
-                    if faq_keyword.lower() in message_lower:
-                        score += 1.5
-            except:
-                pass
+        for faq_keyword in faq.keywords:
+            if faq_keyword in message_lower:
+                score += 1.5
         
         return score
     
-    async def _generate_faq_response(self, message: str, faqs: List[FAQ]) -> str:
+    async def _generate_faq_response(self, message: str, faqs: List[FAQEntry]) -> str:
         """Generate a response based on found FAQs"""
         if not faqs:
-            return """I don't have a specific FAQ that matches your question, but I'd be happy to help! 
-            
-Here are a few things you can try:
-• Check our help center for more detailed guides
-• Contact our support team for personalized assistance
-• Try rephrasing your question with different keywords
-
-Is there anything specific I can help you with?"""
-        
-        # Use the best matching FAQ
-        best_faq = faqs[0]
-        
-        response = f"""Based on your question, here's what I found:
-
-**Q: {best_faq.question}**
-**A: {best_faq.answer}**
-"""
-        
-        # Add additional FAQs if they're relevant
-        if len(faqs) > 1:
-            response += "\n\n**You might also find these helpful:**\n"
-            for faq in faqs[1:3]:  # Show up to 2 more
-                response += f"• {faq.question}\n"
+            return FAQ_NO_MATCH.render()
         
-        response += "\n\nIf this doesn't answer your question, please let me know and I'll be happy to help further!"
-        
-        return response
+        # Best match plus up to two related questions, pre-rendered per FAQ
+        return faq_cache.render_response(faqs)
 
 class TicketAgent(BaseAgent):
     """Agent for handling complaints and creating tickets"""
@@ -130,8 +111,25 @@ class TicketAgent(BaseAgent):
     async def process(self, message: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """Process complaint and create ticket"""
         try:
+            context = context or {}
+            scope_key = ticket_dedup.scope_key(context) if ticket_dedup.enabled else None
+
+            # Attach repeats of a recent complaint to its existing ticket
+            if scope_key is not None:
+                duplicate = await self._attach_to_duplicate(message, scope_key, context)
+                if duplicate is not None:
+                    self.log_interaction(message, duplicate)
+                    return duplicate
+
             # Create a ticket for the complaint
             ticket = await self._create_ticket(message, context)
+            if scope_key is not None:
+                self._after_commit(
+                    context,
+                    lambda: ticket_dedup.add(
+                        ticket.id, ticket.ticket_number, message, scope_key, context.get("session_id")
+                    ),
+                )
             
             # Generate response
             response = await self._generate_complaint_response(message, ticket.ticket_number)
@@ -155,6 +153,44 @@ class TicketAgent(BaseAgent):
                 "error": str(e)
             }
     
+    async def _attach_to_duplicate(
+        self, message: str, scope_key: str, context: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Count the complaint against a matching open ticket, if there is one"""
+        match = ticket_dedup.find_duplicate(message, scope_key)
+        if match is None:
+            return None
+
+        # Single guarded UPDATE: a ticket resolved since it was indexed is
+        # left alone and the complaint gets a fresh ticket instead
+        result = await self.db_session.execute(
+            update(Ticket)
+            .where(
+                Ticket.id == match.ticket_id,
+                Ticket.status.in_([TicketStatusColumn.OPEN, TicketStatusColumn.IN_PROGRESS]),
+            )
+            .values(duplicate_count=Ticket.duplicate_count + 1)
+        )
+        if result.rowcount == 0:
+            ticket_dedup.discard(match.ticket_id)
+            return None
+
+        if context.get("defer_commit"):
+            await self.db_session.flush()
+        else:
+            await self.db_session.commit()
+
+        session_id = context.get("session_id")
+        return {
+            "response": COMPLAINT_DUPLICATE_RESPONSE.render(ticket_number=match.ticket_number),
+            "agent": self.name,
+            "ticket_number": match.ticket_number,
+            "ticket_id": match.ticket_id,
+            "duplicate_of": match.ticket_id,
+            # The same conversation was already notified about this ticket
+            "requires_notification": session_id is None or session_id != match.session_id,
+        }
+
     async def _create_ticket(self, message: str, context: Dict[str, Any]) -> Ticket:
         """Create a new support ticket"""
         ticket_number = generate_ticket_number()
@@ -162,37 +198,45 @@ class TicketAgent(BaseAgent):
         # Extract title from message (first 100 chars)
         title = message[:100] + "..." if len(message) > 100 else message
         
+        priority_score, priority = priority_scorer.score(message, context)
+        
         ticket = Ticket(
             ticket_number=ticket_number,
             title=title,
             description=message,
-            status=TicketStatus.OPEN,
-            priority="medium",
+            status=TicketStatusColumn.OPEN,
+            priority=priority,
+            priority_score=priority_score,
             customer_email=context.get("customer_email") if context else None,
             customer_phone=context.get("customer_phone") if context else None,
             session_id=context.get("session_id") if context else None
         )
         
         self.db_session.add(ticket)
-        await self.db_session.commit()
-        await self.db_session.refresh(ticket)
+        if context and context.get("defer_commit"):
+            # The batch caller commits the item's rows together; flush assigns the id
+            await self.db_session.flush()
+        else:
+            await self.db_session.commit()
+            await self.db_session.refresh(ticket)
         
+        priority_scorer.record(context)
+        self._after_commit(context, lambda: ticket_queue.push(ticket.id, priority_score))
         return ticket
+
+    @staticmethod
+    def _after_commit(context: Dict[str, Any], publish):
+        """Call ``publish`` (which hands the ticket id to the work queue or
+        the duplicate index) once the ticket is committed: now, or, when the
+        caller defers the commit, from its ``context["after_commit"]`` list"""
+        if context and context.get("defer_commit"):
+            context["after_commit"].append(publish)
+        else:
+            publish()
     
     async def _generate_complaint_response(self, message: str, ticket_number: str) -> str:
         """Generate response for complaint"""
-        return f"""I understand your concern and I'm sorry you're experiencing this issue. I want to make sure we address this properly.
-
-I've created a support ticket for you:
-**Ticket Number: {ticket_number}**
-
-Here's what happens next:
-• Your ticket has been assigned to our support team
-• You'll receive a confirmation email shortly
-• A support specialist will review your case within 24 hours
-• We'll keep you updated on the progress
-
-Your issue is important to us, and we're committed to resolving it as quickly as possible. Is there any additional information you'd like to add to your ticket?"""
+        return COMPLAINT_RESPONSE.render(ticket_number=ticket_number)
 
 class AccountAgent(BaseAgent):
     """Agent for handling account-related inquiries"""
@@ -226,23 +270,4 @@ class AccountAgent(BaseAgent):
     
     async def _generate_account_response(self, message: str, context: Dict[str, Any]) -> str:
         """Generate response for account inquiry"""
-        return """I'd be happy to help you with your account inquiry. 
-
-For security reasons, I cannot access specific account information in this chat. However, I can help you with:
-
-**Common Account Tasks:**
-• Password reset instructions
-• Account verification steps
-• Billing and payment information
-• Profile update procedures
-
-**For Specific Account Issues:**
-To get detailed help with your account, please:
-1. Visit our secure account portal
-2. Contact our account specialists directly
-3. Provide proper verification (email, phone, or security questions)
-
-**Immediate Help:**
-If this is urgent, I can create a priority ticket for our account team to contact you directly. Would you like me to do that?
-
-What specific account issue can I help guide you through?"""
+        return ACCOUNT_RESPONSE.render()
@@ -0,0 +1,252 @@
+"""
+Near-duplicate detection for complaint tickets.
+
+Each open ticket's description is reduced to a MinHash signature over word
+shingles and indexed with locality-sensitive hashing (LSH) bands, so a new
+complaint only compares against tickets sharing at least one band. Entries
+expire after ``TICKET_DEDUP_WINDOW_MINUTES``; matching is limited to a scope
+(the same session, the same customer, or every customer).
+
+With several workers, additions and removals are also published to the
+shared state event log and replayed by the other workers before matching.
+"""
+
+import logging
+import os
+import time
+import zlib
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.database import Ticket, TicketStatus
+from utils.helpers import extract_keywords
+from utils.shared_state import SharedState, shared_state
+
+logger = logging.getLogger(__name__)
+
+TICKET_DEDUP_SCOPE = os.getenv("TICKET_DEDUP_SCOPE", "customer")  # session|customer|global|off
+TICKET_DEDUP_WINDOW_MINUTES = float(os.getenv("TICKET_DEDUP_WINDOW_MINUTES", "60"))
+TICKET_DEDUP_THRESHOLD = float(os.getenv("TICKET_DEDUP_THRESHOLD", "0.6"))
+
+NUM_PERMUTATIONS = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+EVENT_CHANNEL = "ticket_dedup"
+
+# Fixed coefficients so signatures agree across processes and restarts
+_COEFFICIENTS = tuple(
+    (
+        zlib.crc32(f"a{i}".encode()) * 2654435761 % _PRIME or 1,
+        zlib.crc32(f"b{i}".encode()) * 40503 % _PRIME,
+    )
+    for i in range(NUM_PERMUTATIONS)
+)
+
+
+def shingles(text: str) -> Set[str]:
+    """Content words of ``text`` plus adjacent word pairs"""
+    words = extract_keywords(text)
+    pairs = {f"{first} {second}" for first, second in zip(words, words[1:])}
+    return set(words) | pairs
+
+
+def minhash(items: Iterable[str]) -> Tuple[int, ...]:
+    hashes = [zlib.crc32(item.encode()) for item in items]
+    if not hashes:
+        return ()
+    return tuple(
+        min((a * h + b) % _PRIME for h in hashes) & _MAX_HASH for a, b in _COEFFICIENTS
+    )
+
+
+def similarity(first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    if not first or not second:
+        return 0.0
+    return sum(x == y for x, y in zip(first, second)) / NUM_PERMUTATIONS
+
+
+@dataclass
+class DedupEntry:
+    ticket_id: int
+    ticket_number: str
+    scope_key: str
+    session_id: Optional[str]
+    signature: Tuple[int, ...]
+    added_at: float
+
+
+class TicketDedupIndex:
+    """In-memory LSH index of recent open tickets"""
+
+    def __init__(
+        self,
+        scope: str = TICKET_DEDUP_SCOPE,
+        window_seconds: float = TICKET_DEDUP_WINDOW_MINUTES * 60,
+        threshold: float = TICKET_DEDUP_THRESHOLD,
+        shared: Optional[SharedState] = shared_state,
+    ):
+        self.scope = scope
+        self.window_seconds = window_seconds
+        self.threshold = threshold
+        self.shared = shared
+        self._last_event_id = 0
+        self._entries: Dict[int, DedupEntry] = {}
+        self._buckets: Dict[Tuple[str, int, Tuple[int, ...]], Set[int]] = {}
+        self._order = deque()
+
+    @property
+    def enabled(self) -> bool:
+        return self.scope != "off"
+
+    def scope_key(self, context: Dict) -> Optional[str]:
+        """Key identifying who a complaint may be merged with, or None if it
+        cannot be deduplicated under the configured scope"""
+        if self.scope == "global":
+            return "*"
+        if self.scope == "session":
+            return context.get("session_id")
+        if self.scope == "customer":
+            return context.get("customer_email") or context.get("customer_phone")
+        return None
+
+    def find_duplicate(self, message: str, scope_key: str, now: float = None) -> Optional[DedupEntry]:
+        """Return the most similar recent ticket in the same scope, if any"""
+        self.sync()
+        self._expire(now or time.time())
+        signature = minhash(shingles(message))
+        if not signature:
+            return None
+
+        candidates = set()
+        for band in self._bands(scope_key, signature):
+            candidates.update(self._buckets.get(band, ()))
+
+        best, best_score = None, self.threshold
+        for ticket_id in candidates:
+            entry = self._entries[ticket_id]
+            score = similarity(signature, entry.signature)
+            if score >= best_score:
+                best, best_score = entry, score
+        return best
+
+    def add(
+        self,
+        ticket_id: int,
+        ticket_number: str,
+        message: str,
+        scope_key: str,
+        session_id: Optional[str] = None,
+        added_at: float = None,
+    ):
+        signature = minhash(shingles(message))
+        if not signature:
+            return
+        entry = DedupEntry(
+            ticket_id, ticket_number, scope_key, session_id, signature, added_at or time.time()
+        )
+        self._add_entry(entry)
+        if self.shared is not None:
+            self.shared.publish(EVENT_CHANNEL, {"op": "add", **asdict(entry)})
+
+    def discard(self, ticket_id: int):
+        """Drop a ticket, e.g. once it is resolved or closed"""
+        self._discard_entry(ticket_id)
+        if self.shared is not None:
+            self.shared.publish(EVENT_CHANNEL, {"op": "discard", "ticket_id": ticket_id})
+
+    def sync(self):
+        """Apply the additions and removals made by other workers"""
+        if self.shared is None:
+            return
+        self._last_event_id, events = self.shared.events_since(EVENT_CHANNEL, self._last_event_id)
+        for event in events:
+            if event.pop("op") == "add":
+                event["signature"] = tuple(event["signature"])
+                self._add_entry(DedupEntry(**event))
+            else:
+                self._discard_entry(event["ticket_id"])
+
+    def _add_entry(self, entry: DedupEntry):
+        self._discard_entry(entry.ticket_id)
+        self._entries[entry.ticket_id] = entry
+        self._order.append((entry.added_at, entry.ticket_id))
+        for band in self._bands(entry.scope_key, entry.signature):
+            self._buckets.setdefault(band, set()).add(entry.ticket_id)
+
+    def _discard_entry(self, ticket_id: int):
+        entry = self._entries.pop(ticket_id, None)
+        if entry is None:
+            return
+        for band in self._bands(entry.scope_key, entry.signature):
+            ids = self._buckets.get(band)
+            if ids is not None:
+                ids.discard(ticket_id)
+                if not ids:
+                    del self._buckets[band]
+
+    async def warm(self, db: AsyncSession):
+        """Index open tickets created within the window, e.g. after a restart"""
+        if not self.enabled:
+            return
+        if self.shared is not None:
+            # The database already holds everything published so far
+            self._last_event_id = self.shared.last_event_id(EVENT_CHANNEL)
+        # created_at is filled by the database in UTC
+        since = datetime.utcnow() - timedelta(seconds=self.window_seconds)
+        result = await db.execute(
+            select(Ticket)
+            .where(Ticket.status == TicketStatus.OPEN, Ticket.created_at >= since)
+            .order_by(Ticket.created_at)
+        )
+        count = 0
+        for ticket in result.scalars().all():
+            scope_key = self.scope_key(
+                {
+                    "session_id": ticket.session_id,
+                    "customer_email": ticket.customer_email,
+                    "customer_phone": ticket.customer_phone,
+                }
+            )
+            if scope_key is None:
+                continue
+            signature = minhash(shingles(ticket.description))
+            if not signature:
+                continue
+            added_at = (
+                ticket.created_at.replace(tzinfo=timezone.utc).timestamp()
+                if ticket.created_at
+                else time.time()
+            )
+            self._add_entry(
+                DedupEntry(
+                    ticket.id, ticket.ticket_number, scope_key, ticket.session_id, signature, added_at
+                )
+            )
+            count += 1
+        logger.info(f"Indexed {count} open tickets for duplicate detection")
+
+    def _expire(self, now: float):
+        cutoff = now - self.window_seconds
+        while self._order and self._order[0][0] < cutoff:
+            added_at, ticket_id = self._order.popleft()
+            entry = self._entries.get(ticket_id)
+            # Skip stale order records for tickets re-added or discarded since
+            if entry is not None and entry.added_at == added_at:
+                self._discard_entry(ticket_id)
+
+    @staticmethod
+    def _bands(scope_key: str, signature: Tuple[int, ...]):
+        for band in range(BANDS):
+            start = band * ROWS_PER_BAND
+            yield scope_key, band, signature[start:start + ROWS_PER_BAND]
+
+
+ticket_dedup = TicketDedupIndex()
@@ -0,0 +1,148 @@
+"""
+Rule-based priority scoring for new tickets.
+
+A ticket's score (0-100) adds up three signals:
+
+- severity: the strongest severity phrase found in the complaint
+- history: how many tickets the same customer has already opened
+- sentiment: negative words, exclamation marks and shouting
+
+The score is stored on the ticket and mapped to the ``priority`` label.
+With several workers, new tickets are published to the shared state event
+log so every worker's customer history stays current.
+"""
+
+import logging
+import re
+from collections import Counter
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.database import Ticket
+from utils.shared_state import SharedState, shared_state
+
+logger = logging.getLogger(__name__)
+
+BASE_SCORE = 10
+MAX_HISTORY_SCORE = 25
+MAX_SENTIMENT_SCORE = 25
+
+SEVERITY_PHRASES = {
+    "hacked": 50,
+    "fraud": 50,
+    "unauthorized": 45,
+    "security": 45,
+    "data loss": 45,
+    "lost data": 45,
+    "outage": 40,
+    "charged twice": 35,
+    "double charged": 35,
+    "down": 30,
+    "can't log in": 25,
+    "cannot log in": 25,
+    "locked out": 25,
+    "not working": 20,
+    "broken": 20,
+    "refund": 20,
+    "urgent": 20,
+    "asap": 15,
+    "immediately": 15,
+    "error": 15,
+    "crash": 15,
+    "slow": 10,
+    "delay": 10,
+}
+
+NEGATIVE_WORDS = {
+    "angry", "furious", "terrible", "awful", "horrible", "worst", "unacceptable",
+    "ridiculous", "disappointed", "frustrated", "useless", "scam", "never", "again",
+}
+
+# (minimum score, label), highest first
+PRIORITY_LEVELS = ((70, "urgent"), (45, "high"), (20, "medium"), (0, "low"))
+
+EVENT_CHANNEL = "customer_history"
+
+_WORD_RE = re.compile(r"[A-Za-z']+")
+_SEVERITY_PATTERNS = tuple(
+    (re.compile(rf"\b{re.escape(phrase)}\b"), weight) for phrase, weight in SEVERITY_PHRASES.items()
+)
+
+
+class PriorityScorer:
+    def __init__(self, shared: Optional[SharedState] = shared_state):
+        # Tickets opened per customer (email or phone) known to this process
+        self.customer_history: Counter = Counter()
+        self.shared = shared
+        self._last_event_id = 0
+
+    def score(self, message: str, context: Optional[Dict[str, Any]] = None) -> Tuple[int, str]:
+        """Return (score, priority label) for a new complaint"""
+        text = message.lower()
+        severity = max(
+            (weight for pattern, weight in _SEVERITY_PATTERNS if pattern.search(text)),
+            default=0,
+        )
+
+        self.sync()
+        history = 0
+        customer = self.customer_key(context or {})
+        if customer is not None:
+            history = min(self.customer_history[customer] * 5, MAX_HISTORY_SCORE)
+
+        score = BASE_SCORE + severity + history + self._sentiment(message)
+        score = min(score, 100)
+        return score, self.priority_for(score)
+
+    def record(self, context: Optional[Dict[str, Any]]):
+        """Count a ticket created for the customer in ``context``"""
+        customer = self.customer_key(context or {})
+        if customer is not None:
+            self.customer_history[customer] += 1
+            if self.shared is not None:
+                self.shared.publish(EVENT_CHANNEL, customer)
+
+    def sync(self):
+        """Count tickets created by other workers"""
+        if self.shared is None:
+            return
+        self._last_event_id, customers = self.shared.events_since(
+            EVENT_CHANNEL, self._last_event_id
+        )
+        self.customer_history.update(customers)
+
+    async def warm(self, db: AsyncSession):
+        """Seed the customer history from existing tickets"""
+        if self.shared is not None:
+            self._last_event_id = self.shared.last_event_id(EVENT_CHANNEL)
+        for column in (Ticket.customer_email, Ticket.customer_phone):
+            result = await db.execute(
+                select(column, func.count()).where(column.isnot(None)).group_by(column)
+            )
+            for customer, count in result.all():
+                self.customer_history[customer] += count
+        logger.info(f"Loaded ticket history for {len(self.customer_history)} customers")
+
+    @staticmethod
+    def customer_key(context: Dict[str, Any]) -> Optional[str]:
+        return context.get("customer_email") or context.get("customer_phone")
+
+    @staticmethod
+    def priority_for(score: int) -> str:
+        for threshold, label in PRIORITY_LEVELS:
+            if score >= threshold:
+                return label
+        return "low"
+
+    @staticmethod
+    def _sentiment(message: str) -> int:
+        words = _WORD_RE.findall(message)
+        negative = sum(1 for word in words if word.lower() in NEGATIVE_WORDS)
+        shouting = sum(1 for word in words if len(word) > 2 and word.isupper())
+        score = min(negative * 5, 15) + min(message.count("!") * 2, 5) + min(shouting * 2, 5)
+        return min(score, MAX_SENTIMENT_SCORE)
+
+
+priority_scorer = PriorityScorer()
@@ -0,0 +1,105 @@
+"""
+Priority-ordered work queue for support staff.
+
+Each process keeps a heap of open ticket ids ordered by priority score (then
+age). Claiming pops the best candidate and moves it to ``in_progress`` with a
+single ``UPDATE ... WHERE status = 'open'``; only one claimer can match that
+row, so concurrent claims (from this or any other process) never hand out the
+same ticket. A candidate someone else already took is skipped.
+
+The heap is only a hint: it is refilled from the database when it runs empty
+and rebuilt every ``TICKET_QUEUE_REFRESH_SECONDS`` so tickets created by other
+processes are picked up.
+"""
+
+import heapq
+import logging
+import os
+import time
+from typing import List, Optional, Set, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.database import Ticket, TicketStatus
+
+logger = logging.getLogger(__name__)
+
+TICKET_QUEUE_REFILL_SIZE = int(os.getenv("TICKET_QUEUE_REFILL_SIZE", "500"))
+TICKET_QUEUE_REFRESH_SECONDS = float(os.getenv("TICKET_QUEUE_REFRESH_SECONDS", "30"))
+
+
+class TicketWorkQueue:
+    def __init__(
+        self,
+        refill_size: int = TICKET_QUEUE_REFILL_SIZE,
+        refresh_seconds: float = TICKET_QUEUE_REFRESH_SECONDS,
+    ):
+        self.refill_size = refill_size
+        self.refresh_seconds = refresh_seconds
+        self._heap: List[Tuple[int, int]] = []
+        self._queued: Set[int] = set()
+        self._loaded_at = 0.0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, ticket_id: int, priority_score: int):
+        if ticket_id in self._queued:
+            return
+        self._queued.add(ticket_id)
+        heapq.heappush(self._heap, (-(priority_score or 0), ticket_id))
+
+    async def claim(self, db: AsyncSession, agent: str) -> Optional[Ticket]:
+        """Assign the highest-priority open ticket to ``agent``"""
+        if time.monotonic() - self._loaded_at > self.refresh_seconds:
+            await self.refill(db)
+
+        refilled = False
+        while True:
+            if not self._heap:
+                if refilled:
+                    return None
+                await self.refill(db)
+                refilled = True
+                continue
+
+            _, ticket_id = heapq.heappop(self._heap)
+            self._queued.discard(ticket_id)
+
+            result = await db.execute(
+                update(Ticket)
+                .where(Ticket.id == ticket_id, Ticket.status == TicketStatus.OPEN)
+                .values(
+                    status=TicketStatus.IN_PROGRESS,
+                    assigned_to=agent,
+                    claimed_at=func.now(),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 1:
+                await db.commit()
+                ticket = await db.execute(
+                    select(Ticket)
+                    .where(Ticket.id == ticket_id)
+                    .execution_options(populate_existing=True)
+                )
+                return ticket.scalar_one()
+
+    async def refill(self, db: AsyncSession):
+        """Rebuild the heap from the best open tickets in the database"""
+        result = await db.execute(
+            select(Ticket.id, Ticket.priority_score)
+            .where(Ticket.status == TicketStatus.OPEN)
+            .order_by(Ticket.priority_score.desc(), Ticket.id)
+            .limit(self.refill_size)
+        )
+        self._heap = []
+        self._queued = set()
+        for ticket_id, priority_score in result.all():
+            self.push(ticket_id, priority_score)
+        self._loaded_at = time.monotonic()
+        logger.debug(f"Ticket queue refilled with {len(self._heap)} tickets")
+
+
+ticket_queue = TicketWorkQueue()
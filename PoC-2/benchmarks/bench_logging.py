@@ -0,0 +1,95 @@
+"""
+Measure chat pipeline latency with logging off, with synchronous file
+logging, and with the queue-based logging pipeline.
+
+Runs the classifier, router and account agent in keyword mode (no OpenAI,
+no database) so the difference between modes is the cost of logging.
+
+Usage (from the PoC-2 directory):
+    python benchmarks/bench_logging.py --iterations 5000
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.pop("OPENAI_API_KEY", None)
+
+from agents.intent_classifier import IntentClassifierAgent
+from agents.routing_agent import RoutingAgent
+from agents.support_agents import AccountAgent
+from utils.log_pipeline import start_logging, stop_logging
+
+MESSAGE = "I cannot login to my account after the password update, please help"
+
+
+async def run_pipeline(classifier, router, account_agent):
+    intent_result = await classifier.process(MESSAGE)
+    routing = await router.process(MESSAGE, {"intent": intent_result["intent"]})
+    return await account_agent.process(MESSAGE, {"intent": routing["intent"]})
+
+
+async def measure(iterations: int) -> list:
+    classifier = IntentClassifierAgent()
+    router = RoutingAgent()
+    account_agent = AccountAgent(None)
+
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await run_pipeline(classifier, router, account_agent)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def configure(mode: str, log_file: str):
+    root = logging.getLogger()
+    stop_logging()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    logging.disable(logging.NOTSET)
+
+    if mode == "off":
+        logging.disable(logging.CRITICAL)
+    elif mode == "sync":
+        handler = logging.FileHandler(log_file)
+        handler.setFormatter(
+            logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+        )
+        root.addHandler(handler)
+        root.setLevel(logging.INFO)
+    elif mode == "queue":
+        start_logging(level="INFO", log_file=log_file, json_format=True, console=False)
+
+
+def report(mode: str, timings: list):
+    timings_us = sorted(t * 1e6 for t in timings)
+    p95 = timings_us[int(len(timings_us) * 0.95) - 1]
+    print(
+        f"{mode:>6}: mean {statistics.mean(timings_us):8.1f} us  "
+        f"p50 {statistics.median(timings_us):8.1f} us  p95 {p95:8.1f} us"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--modes", default="off,sync,queue")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in args.modes.split(","):
+            configure(mode, os.path.join(tmp, f"{mode}.log"))
+            asyncio.run(measure(200))  # warm-up
+            report(mode, asyncio.run(measure(args.iterations)))
+        stop_logging()
+
+
+if __name__ == "__main__":
+    main()
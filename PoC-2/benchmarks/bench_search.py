@@ -0,0 +1,158 @@
+"""
+Latency of ``GET /api/search`` queries over a large SQLite database.
+
+Fills a scratch database with ``--messages`` chat messages and
+``--tickets`` tickets spread over ``--days`` days. The rows go in through
+plain INSERTs, so the FTS5 triggers index them as the application would
+(the insert rate includes that maintenance). Then it reports the median
+and p95 time of a set of searches: a rare word, a common word, a prefix,
+several words, the last day only, tickets only and the fifth page of a
+common word.
+
+Usage (from the PoC-2 directory):
+    python benchmarks/bench_search.py --messages 1000000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from database.search import decode_cursor, init_search, search
+from models.database import Base, ChatMessage, Ticket
+
+COMMON = (
+    "internet connection issue resolved working fine thanks help today "
+    "check please account password reset still slow modem router speed"
+).split()
+FILLER = (
+    "the a is it my and to of in for on with this that was have you can "
+    "yes no okay sure hello hi again now just really"
+).split()
+RARE = ["refund", "cancellation", "technician", "outage", "billing"]
+
+QUERIES = [
+    ("rare word", "technician", {}),
+    ("common word", "internet", {}),
+    ("prefix", "rout*", {}),
+    ("all words", "router still slow", {}),
+    ("last day", "refund", {"days": 1}),
+    ("tickets only", "outage", {"kinds": ["ticket"]}),
+    ("page 5", "connection", {"pages": 5}),
+]
+
+
+def sentence():
+    words = random.choices(FILLER, k=random.randint(3, 8))
+    words += random.choices(COMMON, k=random.randint(1, 4))
+    if random.random() < 0.01:
+        words.append(random.choice(RARE))
+    random.shuffle(words)
+    return " ".join(words).capitalize() + "."
+
+
+def populate(engine, model, rows, days, make_row):
+    """Insert rows in created_at order, as the application writes them"""
+    start = datetime.utcnow() - timedelta(days=days)
+    step = days * 86400 / max(rows, 1)
+    batch = []
+    with engine.begin() as conn:
+        for i in range(1, rows + 1):
+            row = make_row(i)
+            row["created_at"] = row["updated_at"] = start + timedelta(seconds=i * step)
+            batch.append(row)
+            if len(batch) == 10000:
+                conn.execute(model.__table__.insert(), batch)
+                batch = []
+        if batch:
+            conn.execute(model.__table__.insert(), batch)
+
+
+def chat_row(i):
+    return {
+        "session_id": f"session-{i // 6}",
+        "user_message": sentence(),
+        "bot_response": sentence() + " " + sentence(),
+    }
+
+
+def ticket_row(i):
+    return {
+        "ticket_number": f"TKT-{i:08d}",
+        "title": sentence(),
+        "description": sentence() + " " + sentence(),
+    }
+
+
+async def run_queries(path, limit, repeats):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    print(f"{'query':>14} {'median ms':>10} {'p95 ms':>8} {'hits':>5}")
+    async with AsyncSession(engine) as db:
+        for label, query, options in QUERIES:
+            since = None
+            if "days" in options:
+                since = datetime.utcnow() - timedelta(days=options["days"])
+            kinds = options.get("kinds", ["chat", "ticket"])
+
+            # Cursor of the page before the one timed
+            after = None
+            for _ in range(options.get("pages", 1) - 1):
+                _, cursor = await search(db, query, kinds, since=since, after=after, limit=limit)
+                after = decode_cursor(cursor)
+
+            timings = []
+            for _ in range(repeats):
+                started = time.perf_counter()
+                hits, _ = await search(db, query, kinds, since=since, after=after, limit=limit)
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            p95 = timings[int(0.95 * (len(timings) - 1))]
+            print(f"{label:>14} {statistics.median(timings):>10.1f} {p95:>8.1f} {len(hits):>5}")
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--messages", type=int, default=1_000_000)
+    parser.add_argument("--tickets", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    path = os.path.join(tempfile.mkdtemp(), "search_bench.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        if not init_search(conn):
+            raise SystemExit("This SQLite build has no FTS5")
+
+    started = time.perf_counter()
+    populate(engine, ChatMessage, args.messages, args.days, chat_row)
+    populate(engine, Ticket, args.tickets, args.days, ticket_row)
+    elapsed = time.perf_counter() - started
+    rows = args.messages + args.tickets
+    print(f"inserted and indexed {rows} rows in {elapsed:.1f} s ({rows / elapsed:.0f} rows/s, "
+          f"{os.path.getsize(path) / 1e6:.0f} MB database)")
+    engine.dispose()
+
+    asyncio.run(run_queries(path, args.limit, args.repeats))
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Compare response rendering with inline f-strings (the previous agent code)
+against the precompiled templates and per-snapshot FAQ response cache.
+
+For each case prints time per response and the number of memory blocks
+still allocated per response when all results are kept alive, i.e. how
+many new objects each response costs.
+
+Usage (from the PoC-2 directory):
+    python benchmarks/bench_templates.py --iterations 100000
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.database import FAQ
+from utils.faq_cache import FAQCache, FAQEntry, FAQSnapshot
+from utils.templates import ACCOUNT_RESPONSE, COMPLAINT_RESPONSE
+
+FAQS = [
+    FAQ(
+        id=i,
+        question=f"How do I change setting number {i}?",
+        answer=f"Open Settings, find option {i} and follow the instructions shown. " * 3,
+        category="General",
+        keywords=json.dumps(["setting", "change", str(i)]),
+    )
+    for i in range(1, 6)
+]
+
+
+def legacy_faq_response(faqs) -> str:
+    best_faq = faqs[0]
+    response = f"""Based on your question, here's what I found:
+
+**Q: {best_faq.question}**
+**A: {best_faq.answer}**
+"""
+    if len(faqs) > 1:
+        response += "\n\n**You might also find these helpful:**\n"
+        for faq in faqs[1:3]:
+            response += f"• {faq.question}\n"
+    response += "\n\nIf this doesn't answer your question, please let me know and I'll be happy to help further!"
+    return response
+
+
+def legacy_complaint_response(ticket_number: str) -> str:
+    return f"""I understand your concern and I'm sorry you're experiencing this issue. I want to make sure we address this properly.
+
+I've created a support ticket for you:
+**Ticket Number: {ticket_number}**
+
+Here's what happens next:
+• Your ticket has been assigned to our support team
+• You'll receive a confirmation email shortly
+• A support specialist will review your case within 24 hours
+• We'll keep you updated on the progress
+
+Your issue is important to us, and we're committed to resolving it as quickly as possible. Is there any additional information you'd like to add to your ticket?"""
+
+
+def measure(name: str, render, iterations: int):
+    render()  # warm caches
+    gc.collect()
+    gc.disable()
+    results = []
+    blocks_before = sys.getallocatedblocks()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        results.append(render())
+    elapsed = time.perf_counter() - start
+    blocks = sys.getallocatedblocks() - blocks_before
+    gc.enable()
+    # The results list itself accounts for a handful of blocks
+    print(
+        f"{name:<28} {elapsed / iterations * 1e9:8.0f} ns/response  "
+        f"{blocks / iterations:6.2f} blocks/response"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=100000)
+    args = parser.parse_args()
+
+    cache = FAQCache()
+    entries = tuple(FAQEntry.from_model(faq) for faq in FAQS)
+    cache._snapshot = FAQSnapshot(
+        version=1, entries=entries, by_id={entry.id: entry for entry in entries}
+    )
+    top = list(entries[:3])
+    assert cache.render_response(top) == legacy_faq_response(FAQS[:3])
+    assert COMPLAINT_RESPONSE.render(ticket_number="TKT-1") == legacy_complaint_response("TKT-1")
+
+    measure("faq f-string", lambda: legacy_faq_response(FAQS[:3]), args.iterations)
+    measure("faq cached", lambda: cache.render_response(top), args.iterations)
+    measure(
+        "complaint f-string",
+        lambda: legacy_complaint_response("TKT-20250101000000-ABC123"),
+        args.iterations,
+    )
+    measure(
+        "complaint compiled",
+        lambda: COMPLAINT_RESPONSE.render(ticket_number="TKT-20250101000000-ABC123"),
+        args.iterations,
+    )
+    measure("account compiled", ACCOUNT_RESPONSE.render, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Compare OFFSET pagination with the keyset pagination used by
+``GET /api/tickets`` on a SQLite tickets table.
+
+Fills a scratch database with ``--rows`` tickets, then times fetching one
+page at increasing depths. OFFSET has to walk every skipped row, so its cost
+grows with depth; a keyset page is an index range scan and stays flat.
+Tickets are created 20 per second, as batch creation does, and every keyset
+page is checked against the matching OFFSET page.
+
+Usage (from the PoC-2 directory):
+    python benchmarks/bench_ticket_pages.py --rows 1000000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from models.database import Base, Ticket, TicketStatus
+from routers.tickets import build_ticket_query
+
+STATUSES = list(TicketStatus)
+PRIORITIES = ["low", "medium", "high", "urgent"]
+
+
+def populate(engine, rows: int):
+    start = datetime(2024, 1, 1)
+    batch = []
+    with engine.begin() as conn:
+        for i in range(1, rows + 1):
+            batch.append(
+                {
+                    "id": i,
+                    "ticket_number": f"TKT-{i:08d}",
+                    "title": f"Ticket {i}",
+                    "description": "Something is not working",
+                    "status": random.choice(STATUSES),
+                    "priority": random.choice(PRIORITIES),
+                    "customer_email": f"user{i % 5000}@example.com",
+                    "created_at": start + timedelta(seconds=i // 20),
+                    "updated_at": start + timedelta(seconds=i // 20),
+                }
+            )
+            if len(batch) == 10000:
+                conn.execute(Ticket.__table__.insert(), batch)
+                batch = []
+        if batch:
+            conn.execute(Ticket.__table__.insert(), batch)
+        # Stored as the created_at server default writes it: whole seconds
+        conn.exec_driver_sql(
+            "UPDATE tickets SET created_at = substr(created_at, 1, 19), "
+            "updated_at = substr(updated_at, 1, 19)"
+        )
+
+
+def time_page(session: Session, query, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        session.execute(query).all()
+    return (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "tickets_bench.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    print(f"Inserting {args.rows} tickets...")
+    populate(engine, args.rows)
+
+    with Session(engine) as session:
+        print(f"{'depth':>10} {'status':>8} {'offset ms':>10} {'keyset ms':>10}")
+        for fraction in (0, 0.1, 0.5, 0.9):
+            depth = int(args.rows * fraction)
+            for status in (None, TicketStatus.OPEN):
+                offset_query = (
+                    select(Ticket)
+                    .order_by(Ticket.created_at.desc(), Ticket.id.desc())
+                    .offset(depth)
+                    .limit(args.page_size)
+                )
+                if status is not None:
+                    offset_query = offset_query.where(Ticket.status == status)
+
+                # The last row of the previous page is what the cursor encodes
+                boundary = session.execute(
+                    select(Ticket.created_at, Ticket.id)
+                    .order_by(Ticket.created_at.desc(), Ticket.id.desc())
+                    .offset(depth)
+                    .limit(1)
+                ).first()
+                keyset_query = build_ticket_query(
+                    status=status, after=tuple(boundary), limit=args.page_size
+                )
+
+                next_offset_page = offset_query.offset(depth + 1) if status is None else None
+                if next_offset_page is not None:
+                    expected = [ticket.id for ticket in session.scalars(next_offset_page)]
+                    got = [ticket.id for ticket in session.scalars(keyset_query)]
+                    assert got == expected, f"keyset page at depth {depth} differs from OFFSET"
+
+                offset_ms = time_page(session, offset_query, args.repeat) * 1000
+                keyset_ms = time_page(session, keyset_query, args.repeat) * 1000
+                label = status.value if status else "any"
+                print(f"{depth:>10} {label:>8} {offset_ms:>10.2f} {keyset_ms:>10.2f}")
+
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Throughput of PoC-2 with 1, 2, 4, ... workers under gunicorn.
+
+For each worker count the script starts ``gunicorn -c gunicorn.conf.py
+main:app`` on a scratch database, drives it from several client processes
+for ``--duration`` seconds and reports requests per second and scaling
+efficiency against the single-worker run. The default target is
+``/api/classify-intent`` in keyword mode (no OpenAI key), a CPU-bound path
+with no database writes, so throughput should grow close to linearly until
+workers plus client processes exceed the available cores.
+
+Usage (from the PoC-2 directory):
+    python benchmarks/load_test.py --workers 1 2 4 --duration 15
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MESSAGES = [
+    "How do I reset my password?",
+    "My order arrived broken and nobody answers my emails",
+    "I want to update my billing address",
+    "What are your business hours?",
+]
+
+
+async def drive(url: str, path: str, concurrency: int, duration: float) -> tuple:
+    completed = 0
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async with httpx.AsyncClient(
+        base_url=url, limits=httpx.Limits(max_connections=concurrency), timeout=30
+    ) as client:
+
+        async def worker(offset: int):
+            nonlocal completed, errors
+            i = offset
+            while time.perf_counter() < deadline:
+                message = MESSAGES[i % len(MESSAGES)]
+                i += 1
+                try:
+                    response = await client.post(path, json={"message": message})
+                    if response.status_code == 200:
+                        completed += 1
+                    else:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return completed, errors
+
+
+def client_process(args):
+    return asyncio.run(drive(*args))
+
+
+def wait_until_ready(url: str, timeout: float = 60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{url}/api/agent-status", timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError("Server did not start")
+
+
+def run(workers: int, args) -> tuple:
+    scratch = tempfile.mkdtemp()
+    port = args.port
+    url = f"http://127.0.0.1:{port}"
+    env = {
+        **os.environ,
+        "WEB_CONCURRENCY": str(workers),
+        "BIND": f"127.0.0.1:{port}",
+        "DATABASE_URL": f"sqlite:///{scratch}/load_test.db",
+        "SHARED_STATE_PATH": f"{scratch}/shared_state.db",
+        "LOG_LEVEL": "WARNING",
+    }
+    env.pop("OPENAI_API_KEY", None)
+
+    server = subprocess.Popen(
+        ["gunicorn", "-c", "gunicorn.conf.py", "main:app"],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_ready(url)
+        job = (url, args.path, args.concurrency, args.duration)
+        with multiprocessing.Pool(args.clients) as pool:
+            results = pool.map(client_process, [job] * args.clients)
+    finally:
+        server.terminate()
+        server.wait()
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    completed = sum(done for done, _ in results)
+    errors = sum(failed for _, failed in results)
+    return completed / args.duration, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--clients", type=int, default=4, help="client processes")
+    parser.add_argument("--concurrency", type=int, default=32, help="connections per client")
+    parser.add_argument("--path", default="/api/classify-intent")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    print(f"{'workers':>8} {'req/s':>10} {'errors':>8} {'efficiency':>11}")
+    baseline = None
+    for workers in args.workers:
+        rate, errors = run(workers, args)
+        baseline = baseline or rate / workers
+        efficiency = rate / (baseline * workers)
+        print(f"{workers:>8} {rate:>10.1f} {errors:>8} {efficiency:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,48 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateColumn
 import os
+import time
 from dotenv import load_dotenv
+from utils.metrics import DB_QUERIES, DB_QUERY_DURATION, record_timing
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./support_system.db")
+SQL_ECHO = os.getenv("SQL_ECHO", "false").lower() == "true"
 
 # Async database setup
 if DATABASE_URL.startswith("sqlite"):
     # For SQLite
     ASYNC_DATABASE_URL = DATABASE_URL.replace("sqlite:///", "sqlite+aiosqlite:///")
-    engine = create_async_engine(ASYNC_DATABASE_URL, echo=True)
+    engine = create_async_engine(ASYNC_DATABASE_URL, echo=SQL_ECHO)
 else:
     # For PostgreSQL
     ASYNC_DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
-    engine = create_async_engine(ASYNC_DATABASE_URL, echo=True)
+    engine = create_async_engine(ASYNC_DATABASE_URL, echo=SQL_ECHO)
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    operation = statement.lstrip().split(None, 1)[0].lower() if statement else "unknown"
+    DB_QUERIES.inc(operation=operation)
+    DB_QUERY_DURATION.observe(elapsed, operation=operation)
+    record_timing("db", elapsed)
+
+
+@event.listens_for(engine.sync_engine, "handle_error")
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
 
 AsyncSessionLocal = async_sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
@@ -29,7 +55,37 @@ async def get_db():
         finally:
             await session.close()
 
+def _migrate_existing_tables(sync_conn, metadata):
+    """create_all only creates missing tables; add the columns and indexes
+    introduced since an existing table was created. New columns must be
+    nullable or carry a server default."""
+    inspector = inspect(sync_conn)
+    dialect = sync_conn.dialect
+    for table in metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            definition = CreateColumn(column).compile(dialect=dialect)
+            sync_conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {definition}")
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+    # Tickets used to be written with the API's status values ('open')
+    # instead of the enum names the column stores ('OPEN')
+    if inspector.has_table("tickets"):
+        sync_conn.exec_driver_sql(
+            "UPDATE tickets SET status = UPPER(status) "
+            "WHERE status IN ('open', 'in_progress', 'resolved', 'closed')"
+        )
+
+
 async def init_db():
     from models.database import Base
+    from database.search import init_search
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_migrate_existing_tables, Base.metadata)
+        await conn.run_sync(init_search)
@@ -0,0 +1,419 @@
+"""
+Full-text search over chat messages and tickets.
+
+The index depends on the database behind ``DATABASE_URL``:
+
+- SQLite: external-content FTS5 tables ``chat_messages_fts`` and
+  ``tickets_fts``, kept in step with their source rows by triggers.
+- PostgreSQL: a stored generated ``search_vector`` tsvector column on each
+  table with a GIN index; PostgreSQL recomputes it on every insert/update.
+
+Either way the index is maintained by the database as rows are written, so
+the application's inserts are unchanged. Matches are ranked (bm25 on
+SQLite, ``ts_rank_cd`` on PostgreSQL; titles and user messages weigh more
+than descriptions and bot responses) and pages are fetched by keyset on
+(score, kind, id). Ranking costs time per matching row, so a word that
+appears in a large share of all rows is ranked among its
+``SEARCH_MAX_CANDIDATES`` most recent matches per table only.
+"""
+
+import base64
+import binascii
+import logging
+import os
+import re
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.database import Timestamp
+
+
+logger = logging.getLogger(__name__)
+
+SEARCH_MAX_CANDIDATES = int(os.getenv("SEARCH_MAX_CANDIDATES", "5000"))
+
+KINDS = ("chat", "ticket")
+HIGHLIGHT = ("<mark>", "</mark>")
+SNIPPET_TOKENS = 16
+
+# kind -> (table, (column, weight) pairs); the first column weighs more
+_TABLES = {
+    "chat": ("chat_messages", (("user_message", 2.0), ("bot_response", 1.0))),
+    "ticket": ("tickets", (("title", 3.0), ("description", 1.0))),
+}
+# Extra columns returned with each hit
+_DETAIL_COLUMNS = {
+    "chat": "s.session_id, NULL AS ticket_number, NULL AS title, s.created_at",
+    "ticket": "s.session_id, s.ticket_number, s.title, s.created_at",
+}
+
+
+# --- Index setup -----------------------------------------------------------
+
+def init_search(sync_conn) -> bool:
+    """Create the search index for the current dialect (run inside
+    ``init_db``). Returns False if full-text search is unavailable."""
+    if sync_conn.dialect.name == "sqlite":
+        return _init_sqlite(sync_conn)
+    if sync_conn.dialect.name == "postgresql":
+        _init_postgresql(sync_conn)
+        return True
+    logger.warning(f"Full-text search is not supported on {sync_conn.dialect.name}")
+    return False
+
+
+def _init_sqlite(sync_conn) -> bool:
+    for table, weighted in _TABLES.values():
+        fts = f"{table}_fts"
+        columns = [column for column, _ in weighted]
+        column_list = ", ".join(columns)
+        new_values = ", ".join(f"new.{column}" for column in columns)
+        old_values = ", ".join(f"old.{column}" for column in columns)
+
+        exists = sync_conn.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,)
+        ).first() is not None
+        try:
+            sync_conn.exec_driver_sql(
+                f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                    {column_list}, content='{table}', content_rowid='id',
+                    tokenize='porter unicode61', prefix='2 3 4'
+                )
+            """
+            )
+        except OperationalError as e:
+            logger.warning(f"Full-text search disabled, FTS5 not available: {e}")
+            return False
+
+        sync_conn.exec_driver_sql(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+                INSERT INTO {fts} (rowid, {column_list}) VALUES (new.id, {new_values});
+            END
+        """
+        )
+        sync_conn.exec_driver_sql(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {column_list})
+                VALUES ('delete', old.id, {old_values});
+            END
+        """
+        )
+        sync_conn.exec_driver_sql(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {column_list} ON {table} BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {column_list})
+                VALUES ('delete', old.id, {old_values});
+                INSERT INTO {fts} (rowid, {column_list}) VALUES (new.id, {new_values});
+            END
+        """
+        )
+        if not exists:
+            # Index rows written before search existed
+            sync_conn.exec_driver_sql(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+    return True
+
+
+def _init_postgresql(sync_conn):
+    for table, weighted in _TABLES.values():
+        (first, _), (second, _) = weighted
+        sync_conn.exec_driver_sql(
+            f"""
+            ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce({first}, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce({second}, '')), 'B')
+            ) STORED
+        """
+        )
+        sync_conn.exec_driver_sql(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_search ON {table} USING GIN (search_vector)"
+        )
+
+
+# --- Queries ---------------------------------------------------------------
+
+def _terms(query: str) -> List[Tuple[str, bool]]:
+    """(word, is_prefix) for every word of ``query``; a trailing ``*`` makes
+    a word a prefix"""
+    return [(word, prefix == "*") for word, prefix in re.findall(r"(\w+)(\*?)", query)]
+
+
+def fts5_query(terms) -> str:
+    """FTS5 query matching all terms. Words are quoted, so FTS5 operators and
+    punctuation in user input are taken literally."""
+    return " ".join(f'"{word}"' + ("*" if prefix else "") for word, prefix in terms)
+
+
+def tsquery(terms) -> str:
+    """``to_tsquery`` input matching all terms; only word characters reach
+    it, so user input cannot inject tsquery operators"""
+    return " & ".join(word + (":*" if prefix else "") for word, prefix in terms)
+
+
+def encode_cursor(score: float, kind: str, row_id: int) -> str:
+    raw = f"{score!r}|{kind}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str, int]:
+    """Raises ValueError for a malformed cursor"""
+    try:
+        score, kind, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        if kind not in KINDS:
+            raise ValueError(f"Unknown kind {kind!r}")
+        return float(score), kind, int(row_id)
+    except (UnicodeDecodeError, binascii.Error) as e:
+        raise ValueError(str(e))
+
+
+def _naive_utc(moment: Optional[datetime]) -> Optional[datetime]:
+    """created_at is stored as naive UTC"""
+    if moment is not None and moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+def _keyset(kind: str, after) -> Tuple[str, dict]:
+    """Condition on ``score``/``id`` selecting rows of ``kind`` that sort
+    after the cursor in (score desc, kind, id desc) order"""
+    if after is None:
+        return "", {}
+    score, after_kind, after_id = after
+    if kind == after_kind:
+        tie = "id < :after_id"
+    elif kind > after_kind:
+        tie = "1 = 1"
+    else:
+        tie = "1 = 0"
+    return (
+        f"WHERE score < :after_score OR (score = :after_score AND {tie})",
+        {"after_score": score, "after_id": after_id},
+    )
+
+
+def _with_dates(statement, params):
+    if "since" in params:
+        statement = statement.bindparams(bindparam("since", type_=Timestamp))
+    if "until" in params:
+        statement = statement.bindparams(bindparam("until", type_=Timestamp))
+    return statement
+
+
+async def _rank_sqlite(db, kind, terms, since, until, after, count):
+    """(score, kind, id) of the ``count`` best matches of one kind after
+    ``after``"""
+    table, weighted = _TABLES[kind]
+    fts = f"{table}_fts"
+    params = {"match": fts5_query(terms)}
+    filters = [f"{fts} MATCH :match"]
+    join = ""
+    if since is not None or until is not None:
+        # created_at is not in the index. Bound the rowids first (through
+        # the (created_at, id) index) so FTS5 only walks rows in the
+        # window, then check the dates exactly on what is left.
+        join = f"JOIN {table} s ON s.id = {fts}.rowid"
+        bounds = []
+        if since is not None:
+            params["since"] = since
+            bounds.append("created_at >= :since")
+            filters.append("s.created_at >= :since")
+        if until is not None:
+            params["until"] = until
+            bounds.append("created_at < :until")
+            filters.append("s.created_at < :until")
+        low, high = (
+            await db.execute(
+                _with_dates(
+                    text(f"SELECT MIN(id), MAX(id) FROM {table} WHERE {' AND '.join(bounds)}"),
+                    params,
+                ),
+                params,
+            )
+        ).one()
+        if low is None:
+            return []
+        params.update(low=low, high=high)
+        filters.append(f"{fts}.rowid BETWEEN :low AND :high")
+    where = " AND ".join(filters)
+
+    # Ranking scores every matching row, so for very common words only the
+    # most recent candidates (highest rowids, which FTS5 walks cheaply) are
+    # ranked
+    floor = (
+        await db.execute(
+            _with_dates(
+                text(
+                    f"""
+                    SELECT {fts}.rowid FROM {fts} {join}
+                    WHERE {where}
+                    ORDER BY {fts}.rowid DESC
+                    LIMIT 1 OFFSET :skip
+                """
+                ),
+                params,
+            ),
+            {**params, "skip": SEARCH_MAX_CANDIDATES - 1},
+        )
+    ).scalar()
+
+    weights = ", ".join(str(weight) for _, weight in weighted)
+    keyset, keyset_params = _keyset(kind, after)
+    result = await db.execute(
+        _with_dates(
+            text(
+                f"""
+                SELECT score, id FROM (
+                    SELECT -bm25({fts}, {weights}) AS score, {fts}.rowid AS id
+                    FROM {fts} {join}
+                    WHERE {where} AND {fts}.rowid >= :floor
+                ) {keyset}
+                ORDER BY score DESC, id DESC
+                LIMIT :count
+            """
+            ),
+            params,
+        ),
+        {**params, **keyset_params, "floor": floor or 0, "count": count},
+    )
+    return [(score, kind, row_id) for score, row_id in result.all()]
+
+
+async def _rank_postgresql(db, kind, terms, since, until, after, count):
+    table, _ = _TABLES[kind]
+    params = {"tsquery": tsquery(terms), "cap": SEARCH_MAX_CANDIDATES, "count": count}
+    filters = ["search_vector @@ to_tsquery('english', :tsquery)"]
+    if since is not None:
+        params["since"] = since
+        filters.append("created_at >= :since")
+    if until is not None:
+        params["until"] = until
+        filters.append("created_at < :until")
+    keyset, keyset_params = _keyset(kind, after)
+    result = await db.execute(
+        _with_dates(
+            text(
+                f"""
+                WITH candidates AS (
+                    SELECT id, search_vector FROM {table}
+                    WHERE {' AND '.join(filters)}
+                    ORDER BY id DESC
+                    LIMIT :cap
+                )
+                SELECT score, id FROM (
+                    SELECT ts_rank_cd(search_vector, to_tsquery('english', :tsquery)) AS score, id
+                    FROM candidates
+                ) ranked {keyset}
+                ORDER BY score DESC, id DESC
+                LIMIT :count
+            """
+            ),
+            params,
+        ),
+        {**params, **keyset_params},
+    )
+    return [(score, kind, row_id) for score, row_id in result.all()]
+
+
+async def _details(db, dialect, kind, terms, ids):
+    """{id: (session_id, ticket_number, title, created_at, snippet)} for the
+    hits on a page"""
+    if not ids:
+        return {}
+    table, weighted = _TABLES[kind]
+    open_mark, close_mark = HIGHLIGHT
+    if dialect == "sqlite":
+        fts = f"{table}_fts"
+        sql = f"""
+            SELECT s.id, {_DETAIL_COLUMNS[kind]},
+                   snippet({fts}, -1, :open_mark, :close_mark, '…', {SNIPPET_TOKENS})
+            FROM {fts} JOIN {table} s ON s.id = {fts}.rowid
+            WHERE {fts} MATCH :match AND {fts}.rowid IN :ids
+        """
+        params = {"match": fts5_query(terms)}
+    else:
+        (first, _), (second, _) = weighted
+        sql = f"""
+            SELECT s.id, {_DETAIL_COLUMNS[kind]},
+                   ts_headline(
+                       'english',
+                       coalesce(s.{first}, '') || ' … ' || coalesce(s.{second}, ''),
+                       to_tsquery('english', :tsquery),
+                       'StartSel=' || :open_mark || ', StopSel=' || :close_mark
+                       || ', MaxWords={SNIPPET_TOKENS}, MinWords=5'
+                   )
+            FROM {table} s
+            WHERE s.id IN :ids
+        """
+        params = {"tsquery": tsquery(terms)}
+    statement = text(sql).bindparams(bindparam("ids", expanding=True))
+    result = await db.execute(
+        statement, {**params, "ids": ids, "open_mark": open_mark, "close_mark": close_mark}
+    )
+    return {row[0]: tuple(row[1:]) for row in result.all()}
+
+
+async def search(
+    db: AsyncSession,
+    query: str,
+    kinds=KINDS,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    after: Optional[Tuple[float, str, int]] = None,
+    limit: int = 20,
+):
+    """Best matches for ``query`` among chat messages and/or tickets.
+
+    ``since``/``until`` bound ``created_at``; ``after`` is the
+    (score, kind, id) of the last hit of the previous page. Returns
+    (hits, next_cursor) where next_cursor is None on the last page.
+    """
+    terms = _terms(query)
+    if not terms:
+        return [], None
+    since, until = _naive_utc(since), _naive_utc(until)
+    dialect = db.bind.dialect.name
+    rank = _rank_sqlite if dialect == "sqlite" else _rank_postgresql
+
+    # The best limit + 1 of each kind cover the page and tell whether
+    # another one follows; snippets are built for the page only
+    ranked = []
+    for kind in kinds:
+        ranked += await rank(db, kind, terms, since, until, after, limit + 1)
+    ranked.sort(key=lambda hit: (-hit[0], hit[1], -hit[2]))
+    page = ranked[:limit]
+
+    details = {
+        kind: await _details(
+            db, dialect, kind, terms, [row_id for _, hit_kind, row_id in page if hit_kind == kind]
+        )
+        for kind in kinds
+    }
+    hits = []
+    for score, kind, row_id in page:
+        session_id, ticket_number, title, created_at, snippet = details[kind][row_id]
+        if isinstance(created_at, str):
+            created_at = datetime.fromisoformat(created_at)
+        hits.append(
+            {
+                "kind": kind,
+                "id": row_id,
+                "score": score,
+                "snippet": snippet,
+                "session_id": session_id,
+                "ticket_number": ticket_number,
+                "title": title,
+                "created_at": created_at,
+            }
+        )
+
+    next_cursor = None
+    if len(ranked) > limit:
+        next_cursor = encode_cursor(*page[-1])
+    return hits, next_cursor
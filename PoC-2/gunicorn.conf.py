@@ -0,0 +1,39 @@
+"""
+Gunicorn settings for running PoC-2 with several uvicorn workers:
+
+    gunicorn -c gunicorn.conf.py main:app
+
+Database setup (``init_db`` and the sample FAQs) runs once in a separate
+process before any worker starts; the workers skip it and share their
+caches through ``utils.shared_state``.
+"""
+
+import multiprocessing
+import os
+import subprocess
+import sys
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.getenv("WORKER_TIMEOUT", "60"))
+graceful_timeout = 30
+keepalive = 5
+
+# The app is imported in each worker after the fork: it starts threads
+# (logging) and opens database connections that must not be shared
+preload_app = False
+
+
+def on_starting(server):
+    os.environ["SKIP_STARTUP_TASKS"] = "true"
+    os.environ.setdefault("SHARED_STATE_ENABLED", "true")
+
+    # A child process keeps the master free of app state
+    server.log.info("Running startup tasks")
+    subprocess.run(
+        [sys.executable, "-c", "import asyncio, main; asyncio.run(main.run_startup_tasks())"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env={**os.environ, "SKIP_STARTUP_TASKS": "false"},
+        check=True,
+    )
@@ -2,42 +2,96 @@ from fastapi import FastAPI, Depends, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from contextlib import asynccontextmanager
+from pydantic import ValidationError
+import asyncio
+import json
 import logging
+import os
+import time
 import uuid
 from datetime import datetime
 
 # Import our modules
-from database.connection import get_db, init_db
-from schemas.models import ChatRequest, ChatResponse, IntentClassificationResponse
+from database.connection import get_db, init_db, AsyncSessionLocal
+from schemas.models import (
+    ChatRequest,
+    ChatResponse,
+    IntentClassificationResponse,
+    IntentType,
+)
 from agents.intent_classifier import IntentClassifierAgent
 from agents.routing_agent import RoutingAgent
 from agents.support_agents import FAQAgent, TicketAgent, AccountAgent
 from agents.notify_agent import NotifyAgent
+from agents.pipeline import PipelineExecutor, Stage
+from agents.ticket_dedup import ticket_dedup
+from agents.ticket_priority import priority_scorer
 from models.database import ChatMessage, FAQ
 from utils.helpers import setup_logging, generate_session_id
-from utils.prompts import *
+from utils.log_pipeline import stop_logging
+from utils.faq_cache import faq_cache, poll_faq_version
+from utils.response_cache import CachedResponse, response_cache
+from routers.faqs import router as faq_router
+from routers.search import router as search_router
+from routers.tickets import router as ticket_router
+from utils.metrics import (
+    AGENT_PROCESS_DURATION,
+    HTTP_REQUEST_DURATION,
+    render_prometheus,
+    server_timing_header,
+    stage_timer,
+    start_request_timings,
+)
 
 
 logger = setup_logging()
 
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "50000"))
+
+# Intents whose answers have no side effects and may be served from cache
+CACHEABLE_INTENTS = {IntentType.FAQ, IntentType.GENERAL}
+
+PIPELINE_CLASSIFY_TIMEOUT = float(os.getenv("PIPELINE_CLASSIFY_TIMEOUT", "10"))
+PIPELINE_ROUTE_TIMEOUT = float(os.getenv("PIPELINE_ROUTE_TIMEOUT", "2"))
+PIPELINE_SUPPORT_TIMEOUT = float(os.getenv("PIPELINE_SUPPORT_TIMEOUT", "15"))
+PIPELINE_NOTIFY_TIMEOUT = float(os.getenv("PIPELINE_NOTIFY_TIMEOUT", "10"))
+
+
+async def run_startup_tasks():
+    """One-off database setup. With several workers the launcher runs this
+    once before forking and sets SKIP_STARTUP_TASKS for the workers."""
+    await init_db()
+    await populate_sample_faqs()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events"""
     # Startup
     logger.info("Starting AI Multi-Agent Chat Support System")
-    await init_db()
-    await populate_sample_faqs()
+    if os.getenv("SKIP_STARTUP_TASKS", "false").lower() != "true":
+        await run_startup_tasks()
+    async with AsyncSessionLocal() as db:
+        await faq_cache.load(db)
+        await ticket_dedup.warm(db)
+        await priority_scorer.warm(db)
+    faq_poller = asyncio.create_task(poll_faq_version(AsyncSessionLocal))
     yield
     # Shutdown
     logger.info("Shutting down AI Multi-Agent Chat Support System")
+    faq_poller.cancel()
+    stop_logging()
 
 
 app = FastAPI(lifespan=lifespan)
+app.include_router(faq_router)
+app.include_router(ticket_router)
+app.include_router(search_router)
 
 # Add CORS middleware
 app.add_middleware(
@@ -49,12 +103,36 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def metrics_middleware(request: Request, call_next):
+    """Record request latency; add a Server-Timing header when the client
+    sends ``X-Server-Timing: 1``"""
+    timings = start_request_timings()
+    start = time.perf_counter()
+    response = await call_next(request)
+    elapsed = time.perf_counter() - start
+
+    route = request.scope.get("route")
+    HTTP_REQUEST_DURATION.observe(
+        elapsed,
+        method=request.method,
+        path=route.path if route else "unmatched",
+        status=response.status_code,
+    )
+
+    if request.headers.get("x-server-timing") == "1":
+        timings["total"] = elapsed
+        response.headers["Server-Timing"] = server_timing_header(timings)
+
+    return response
+
+
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
 
 
-async def get_agents(db: AsyncSession = Depends(get_db)):
-    """Get all agents with database session"""
+def build_agents(db: AsyncSession) -> dict:
+    """Build the full agent set bound to a database session"""
     return {
         "intent_classifier": IntentClassifierAgent(),
         "router": RoutingAgent(),
@@ -65,78 +143,268 @@ async def get_agents(db: AsyncSession = Depends(get_db)):
     }
 
 
+async def get_agents(db: AsyncSession = Depends(get_db)):
+    """Get all agents with database session"""
+    return build_agents(db)
+
+
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
     """The main chat interface"""
     return templates.TemplateResponse("index.html", {"request": request})
 
 
-@app.post("/api/chat", response_model=ChatResponse)
-async def chat_endpoint(
-    chat_request: ChatRequest,
-    db: AsyncSession = Depends(get_db),
-    agents: dict = Depends(get_agents),
-):
-    """Main chat endpoint that processes user messages through the agent pipeline"""
-    try:
-        session_id = chat_request.session_id or generate_session_id()
+SUPPORT_FALLBACK_RESPONSE = (
+    "I apologize, but I'm taking longer than expected to handle your request. "
+    "Please try again in a moment or contact our support team directly."
+)
 
-        logger.info(f"Processing chat request - Session: {session_id}")
 
-        intent_result = await agents["intent_classifier"].process(chat_request.message)
-        intent = intent_result["intent"]
+async def prefetch_faqs(message: str) -> list:
+    """Search the in-memory FAQ snapshot ahead of routing"""
+    return await FAQAgent(None).search_faqs(message)
 
-        routing_context = {"intent": intent}
-        routing_result = await agents["router"].process(
-            chat_request.message, routing_context
+
+async def run_chat_pipeline(
+    chat_request: ChatRequest,
+    agents: dict,
+    notify: bool = True,
+    defer_commit: bool = False,
+    persist=None,
+    after_commit: list = None,
+    classification: dict = None,
+) -> dict:
+    """Run a message through classifier, router, support agent and notifier.
+
+    Stages run on a ``PipelineExecutor``: the FAQ search is prefetched while
+    the message is classified and cancelled if routing picks another agent,
+    and ``persist`` (if given) runs alongside notification. Every stage has a
+    timeout with a fallback so one slow agent cannot stall the request.
+
+    Returns the support agent result together with the resolved intent,
+    target agent and session id. With ``defer_commit`` agents only flush their
+    rows so the caller can commit them with its own; what must wait for that
+    commit (queueing a new ticket) is appended to ``after_commit`` for the
+    caller to run once it has committed. A ``classification`` already made
+    by the caller is used instead of classifying the message again.
+    """
+    session_id = chat_request.session_id or generate_session_id()
+    message = chat_request.message
+
+    logger.info(f"Processing chat request - Session: {session_id}")
+
+    agent_map = {
+        "FAQAgent": agents["faq_agent"],
+        "TicketAgent": agents["ticket_agent"],
+        "AccountAgent": agents["account_agent"],
+    }
+
+    async def classify(results):
+        return await agents["intent_classifier"].process(message)
+
+    async def route(results):
+        return await agents["router"].process(
+            message, {"intent": results["classify"]["intent"]}
         )
-        target_agent_name = routing_result["target_agent"]
 
+    async def support(results):
         support_context = {
-            "intent": intent,
+            "intent": results["classify"]["intent"],
             "session_id": session_id,
             "customer_email": chat_request.customer_email,
             "customer_phone": chat_request.customer_phone,
+            "defer_commit": defer_commit,
+            "after_commit": after_commit,
+            "prefetched_faqs": results.get("faq_prefetch"),
+        }
+        support_agent = agent_map.get(
+            results["route"]["target_agent"], agents["faq_agent"]
+        )
+        return await support_agent.process(message, support_context)
+
+    async def send_notification(results):
+        agent_result = results["support"]
+        notification_context = {
+            "recipient_email": chat_request.customer_email,
+            "recipient_phone": chat_request.customer_phone,
+            "notification_type": "email" if chat_request.customer_email else "sms",
+            "session_id": session_id,
+            "ticket_number": agent_result.get("ticket_number"),
+            "ticket_id": agent_result.get("ticket_id"),
         }
+        notification_message = f"Your support request has been received. {agent_result.get('response', '')}"
+        return await agents["notify_agent"].process(
+            notification_message, notification_context
+        )
 
-        agent_map = {
-            "FAQAgent": agents["faq_agent"],
-            "TicketAgent": agents["ticket_agent"],
-            "AccountAgent": agents["account_agent"],
+    async def persist_message(results):
+        return await persist(pipeline_result(results))
+
+    def pipeline_result(results) -> dict:
+        return {
+            "session_id": session_id,
+            "intent": results["classify"]["intent"],
+            "target_agent": results["route"]["target_agent"],
+            "agent_result": results["support"],
         }
 
-        support_agent = agent_map.get(target_agent_name, agents["faq_agent"])
-        agent_result = await support_agent.process(
-            chat_request.message, support_context
+    stages = [
+        Stage(
+            "classify",
+            classify,
+            timeout=PIPELINE_CLASSIFY_TIMEOUT,
+            fallback=lambda results, e: agents["intent_classifier"].keyword_result(message),
+            agent_type="IntentClassifier",
+        ),
+        Stage(
+            "faq_prefetch",
+            lambda results: prefetch_faqs(message),
+            timeout=PIPELINE_SUPPORT_TIMEOUT,
+            fallback=lambda results, e: None,
+            confirm_after="route",
+            keep_if=lambda results: results["route"]["target_agent"] == "FAQAgent",
+        ),
+        Stage(
+            "route",
+            route,
+            depends_on=("classify",),
+            timeout=PIPELINE_ROUTE_TIMEOUT,
+            fallback=lambda results, e: {"target_agent": "FAQAgent"},
+        ),
+        Stage(
+            "support",
+            support,
+            depends_on=("route", "faq_prefetch"),
+            timeout=PIPELINE_SUPPORT_TIMEOUT,
+            fallback=lambda results, e: {"response": SUPPORT_FALLBACK_RESPONSE},
+            agent_type=lambda results: results["route"]["target_agent"],
+        ),
+        Stage(
+            "notify",
+            send_notification,
+            depends_on=("support",),
+            timeout=PIPELINE_NOTIFY_TIMEOUT,
+            fallback=lambda results, e: {"notification_sent": False, "error": str(e)},
+            when=lambda results: bool(
+                notify
+                and results["support"].get("requires_notification")
+                and (chat_request.customer_email or chat_request.customer_phone)
+            ),
+            agent_type="NotifyAgent",
+        ),
+    ]
+    if persist is not None:
+        # The executor logs the failure; the response and notification go ahead
+        stages.append(
+            Stage(
+                "persist",
+                persist_message,
+                depends_on=("support",),
+                fallback=lambda results, e: None,
+            )
         )
 
-        if agent_result.get("requires_notification") and (
-            chat_request.customer_email or chat_request.customer_phone
-        ):
-            notification_context = {
-                "recipient_email": chat_request.customer_email,
-                "recipient_phone": chat_request.customer_phone,
-                "notification_type": "email" if chat_request.customer_email else "sms",
-                "session_id": session_id,
-                "ticket_number": agent_result.get("ticket_number"),
-                "ticket_id": agent_result.get("ticket_id"),
-            }
+    initial = {"classify": classification} if classification is not None else None
+    results = await PipelineExecutor(stages).run(initial)
+    return pipeline_result(results)
 
-            notification_message = f"Your support request has been received. {agent_result.get('response', '')}"
-            await agents["notify_agent"].process(
-                notification_message, notification_context
-            )
 
-        chat_message = ChatMessage(
-            session_id=session_id,
-            user_message=chat_request.message,
-            bot_response=agent_result["response"],
-            intent=intent,
-            agent_type=target_agent_name,
+async def classify_message(agents: dict, message: str) -> dict:
+    """Intent of ``message`` with the pipeline's classify timeout and
+    keyword fallback"""
+    classifier = agents["intent_classifier"]
+    with stage_timer("classify"):
+        try:
+            return await asyncio.wait_for(
+                classifier.process(message), PIPELINE_CLASSIFY_TIMEOUT
+            )
+        except Exception as e:
+            logger.warning(f"Intent classification failed, using keywords: {e!r}")
+            return classifier.keyword_result(message)
+
+
+async def respond_from_cache(
+    chat_request: ChatRequest, cached: CachedResponse, db: AsyncSession
+) -> ChatResponse:
+    """Answer from the response cache, skipping straight to persisting the
+    ``ChatMessage``"""
+    session_id = chat_request.session_id or generate_session_id()
+    logger.info(f"Serving cached response - Session: {session_id}")
+
+    with stage_timer("persist"):
+        db.add(
+            ChatMessage(
+                session_id=session_id,
+                user_message=chat_request.message,
+                bot_response=cached.response,
+                intent=cached.intent,
+                agent_type=cached.agent_type,
+            )
         )
-        db.add(chat_message)
         await db.commit()
 
+    return ChatResponse(
+        response=cached.response,
+        intent=cached.intent,
+        agent_type=cached.agent_type,
+        session_id=session_id,
+        created_at=datetime.now(),
+    )
+
+
+@app.post("/api/chat", response_model=ChatResponse)
+async def chat_endpoint(
+    chat_request: ChatRequest,
+    db: AsyncSession = Depends(get_db),
+    agents: dict = Depends(get_agents),
+):
+    """Main chat endpoint that processes user messages through the agent pipeline"""
+    try:
+        faq_version = faq_cache.snapshot.version
+        classification = None
+        if response_cache is not None:
+            # Classify first: a complaint worded like a cached FAQ question
+            # must still reach the ticket agent
+            classification = await classify_message(agents, chat_request.message)
+            if classification["intent"] in CACHEABLE_INTENTS:
+                cached = response_cache.lookup(chat_request.message, faq_version)
+                if cached is not None:
+                    return await respond_from_cache(chat_request, cached, db)
+
+        async def persist(pipeline_result: dict):
+            # Own session: this overlaps with the notify stage, which uses db
+            async with AsyncSessionLocal() as session:
+                session.add(
+                    ChatMessage(
+                        session_id=pipeline_result["session_id"],
+                        user_message=chat_request.message,
+                        bot_response=pipeline_result["agent_result"]["response"],
+                        intent=pipeline_result["intent"],
+                        agent_type=pipeline_result["target_agent"],
+                    )
+                )
+                await session.commit()
+
+        pipeline_result = await run_chat_pipeline(
+            chat_request, agents, persist=persist, classification=classification
+        )
+        session_id = pipeline_result["session_id"]
+        intent = pipeline_result["intent"]
+        target_agent_name = pipeline_result["target_agent"]
+        agent_result = pipeline_result["agent_result"]
+
+        if (
+            response_cache is not None
+            and intent in CACHEABLE_INTENTS
+            and target_agent_name == "FAQAgent"
+            and "error" not in agent_result
+        ):
+            response_cache.store(
+                chat_request.message,
+                faq_version,
+                CachedResponse(agent_result["response"], intent, target_agent_name),
+            )
+
         return ChatResponse(
             response=agent_result["response"],
             intent=intent,
@@ -151,6 +419,198 @@ async def chat_endpoint(
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+async def read_batch_items(request: Request) -> list:
+    """Read batch items from a JSON array, a ``{"requests": [...]}`` body,
+    an NDJSON body or an NDJSON file uploaded as multipart form data"""
+    content_type = request.headers.get("content-type", "")
+
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None:
+            raise HTTPException(status_code=400, detail="Missing 'file' upload")
+        raw = await upload.read()
+        is_ndjson = True
+    else:
+        raw = await request.body()
+        is_ndjson = "ndjson" in content_type or "jsonlines" in content_type
+
+    try:
+        if is_ndjson:
+            items = [json.loads(line) for line in raw.splitlines() if line.strip()]
+        else:
+            payload = json.loads(raw)
+            items = payload.get("requests") if isinstance(payload, dict) else payload
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid batch payload: {str(e)}")
+
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Batch payload must be a list")
+    if len(items) > BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(items)} items (max {BATCH_MAX_ITEMS})",
+        )
+
+    return items
+
+
+async def stream_batch(items: list, worker_factory, concurrency: int):
+    """Process items with a bounded pool of workers and yield NDJSON lines
+    in completion order.
+
+    ``worker_factory`` is an async context manager factory yielding a
+    coroutine function ``handle(index, chat_request) -> dict``; each worker
+    enters it once, so per-worker resources such as DB sessions are reused
+    across all items that worker processes.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    next_index = iter(range(len(items)))
+
+    async def worker():
+        try:
+            async with worker_factory() as handle:
+                for index in next_index:
+                    try:
+                        chat_request = ChatRequest.model_validate(items[index])
+                    except ValidationError as e:
+                        await queue.put(
+                            {"index": index, "status": "error", "error": e.errors()}
+                        )
+                        continue
+                    try:
+                        result = await handle(index, chat_request)
+                        await queue.put({"index": index, "status": "ok", **result})
+                    except Exception as e:
+                        logger.error(f"Batch item {index} failed: {e}")
+                        await queue.put(
+                            {"index": index, "status": "error", "error": str(e)}
+                        )
+        except Exception as e:
+            logger.error(f"Batch worker failed: {e}")
+        finally:
+            await queue.put(None)
+
+    workers = [
+        asyncio.create_task(worker())
+        for _ in range(max(1, min(concurrency, len(items))))
+    ]
+    try:
+        remaining = len(workers)
+        while remaining:
+            line = await queue.get()
+            if line is None:
+                remaining -= 1
+                continue
+            yield json.dumps(line, default=str) + "\n"
+    finally:
+        for task in workers:
+            task.cancel()
+
+
+@asynccontextmanager
+async def chat_batch_worker(notify: bool):
+    """Per-worker DB session and agents for ``/api/chat/batch``.
+
+    Each item's ticket and chat message are committed together before its
+    result is streamed, so an ``ok`` line is never for rows that were later
+    rolled back, and on SQLite no worker holds the write lock across
+    another item's agent calls.
+    """
+    async with AsyncSessionLocal() as db:
+        agents = build_agents(db)
+
+        async def handle(index: int, chat_request: ChatRequest) -> dict:
+            after_commit = []
+            try:
+                pipeline_result = await run_chat_pipeline(
+                    chat_request,
+                    agents,
+                    notify=notify,
+                    defer_commit=True,
+                    after_commit=after_commit,
+                )
+                agent_result = pipeline_result["agent_result"]
+                db.add(
+                    ChatMessage(
+                        session_id=pipeline_result["session_id"],
+                        user_message=chat_request.message,
+                        bot_response=agent_result["response"],
+                        intent=pipeline_result["intent"],
+                        agent_type=pipeline_result["target_agent"],
+                    )
+                )
+                await db.commit()
+            except Exception:
+                # Reported as an error for this item; the next starts clean
+                await db.rollback()
+                raise
+            for publish in after_commit:
+                publish()
+
+            return ChatResponse(
+                response=agent_result["response"],
+                intent=pipeline_result["intent"],
+                agent_type=pipeline_result["target_agent"],
+                session_id=pipeline_result["session_id"],
+                ticket_number=agent_result.get("ticket_number"),
+                created_at=datetime.now(),
+            ).model_dump(mode="json")
+
+        yield handle
+
+
+@asynccontextmanager
+async def classify_batch_worker():
+    """Per-worker intent classifier for ``/api/classify-intent/batch``"""
+    classifier = IntentClassifierAgent()
+
+    async def handle(index: int, chat_request: ChatRequest) -> dict:
+        result = await classifier.process(chat_request.message)
+        return IntentClassificationResponse(
+            intent=result["intent"],
+            confidence=result["confidence"],
+            reasoning=result.get("reasoning"),
+        ).model_dump(mode="json")
+
+    yield handle
+
+
+@app.post("/api/chat/batch")
+async def chat_batch_endpoint(
+    request: Request, notify: bool = False, concurrency: int = BATCH_CONCURRENCY
+):
+    """Run many chat messages through the agent pipeline.
+
+    Accepts a JSON array of ``ChatRequest`` objects, ``{"requests": [...]}``,
+    or NDJSON (as the body or an uploaded ``file``). Results are streamed
+    back as NDJSON in completion order, each tagged with its input ``index``.
+    Notifications are skipped unless ``notify=true`` so replays of old
+    backlogs do not contact customers again.
+    """
+    items = await read_batch_items(request)
+    logger.info(f"Processing chat batch of {len(items)} items")
+    concurrency = max(1, min(concurrency, BATCH_CONCURRENCY))
+
+    return StreamingResponse(
+        stream_batch(items, lambda: chat_batch_worker(notify), concurrency),
+        media_type="application/x-ndjson",
+    )
+
+
+@app.post("/api/classify-intent/batch")
+async def classify_intent_batch(request: Request, concurrency: int = BATCH_CONCURRENCY):
+    """Classify many messages; same input and output format as ``/api/chat/batch``"""
+    items = await read_batch_items(request)
+    logger.info(f"Classifying batch of {len(items)} items")
+    concurrency = max(1, min(concurrency, BATCH_CONCURRENCY))
+
+    return StreamingResponse(
+        stream_batch(items, classify_batch_worker, concurrency),
+        media_type="application/x-ndjson",
+    )
+
+
 @app.post("/api/classify-intent", response_model=IntentClassificationResponse)
 async def classify_intent(
     chat_request: ChatRequest, agents: dict = Depends(get_agents)
@@ -178,18 +638,27 @@ async def agent_status(agents: dict = Depends(get_agents)):
 
         openai_available = agents["intent_classifier"].use_openai
 
+        def agent_stats(agent) -> dict:
+            stats = AGENT_PROCESS_DURATION.summary(agent=agent.name)
+            return {
+                "status": "active",
+                "processed": stats["count"],
+                "avg_latency_ms": round(stats["mean"] * 1000, 2),
+            }
+
         return {
             "agents": {
                 "intent_classifier": {
-                    "status": "active",
+                    **agent_stats(agents["intent_classifier"]),
                     "openai_enabled": openai_available,
+                    "circuit_breaker": agents["intent_classifier"].circuit_status(),
                 },
-                "router": {"status": "active"},
-                "faq_agent": {"status": "active"},
-                "ticket_agent": {"status": "active"},
-                "account_agent": {"status": "active"},
+                "router": agent_stats(agents["router"]),
+                "faq_agent": agent_stats(agents["faq_agent"]),
+                "ticket_agent": agent_stats(agents["ticket_agent"]),
+                "account_agent": agent_stats(agents["account_agent"]),
                 "notify_agent": {
-                    "status": "active",
+                    **agent_stats(agents["notify_agent"]),
                     "capabilities": notify_capabilities,
                 },
             },
@@ -201,6 +670,14 @@ async def agent_status(agents: dict = Depends(get_agents)):
         raise HTTPException(status_code=500, detail=f"Status check error: {str(e)}")
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Pipeline, database and external call metrics in Prometheus text format"""
+    return PlainTextResponse(
+        render_prometheus(), media_type="text/plain; version=0.0.4"
+    )
+
+
 @app.get("/api/chat-history/{session_id}")
 async def get_chat_history(session_id: str, db: AsyncSession = Depends(get_db)):
     """Get chat history for a session"""
@@ -287,6 +764,7 @@ async def populate_sample_faqs():
                 faq = FAQ(**faq_data)
                 db.add(faq)
 
+            await faq_cache.bump_version(db)
             await db.commit()
             logger.info(f"Populated {len(sample_faqs)} sample FAQs")
 
@@ -297,4 +775,12 @@ async def populate_sample_faqs():
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    if workers > 1:
+        # Same setup as gunicorn.conf.py: run startup tasks once, share caches
+        asyncio.run(run_startup_tasks())
+        os.environ["SKIP_STARTUP_TASKS"] = "true"
+        os.environ.setdefault("SHARED_STATE_ENABLED", "true")
+        uvicorn.run("main:app", host="0.0.0.0", port=8000, workers=workers)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=8000)
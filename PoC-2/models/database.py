@@ -1,10 +1,22 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, Boolean, Index
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 import enum
 
 Base = declarative_base()
 
+# SQLite stores server_default=func.now() as text without fractional
+# seconds; bound datetimes use the same format so that comparisons (keyset
+# cursors, date filters) are exact. SQLite's default adds ".ffffff", which
+# sorts after every row of the same second.
+Timestamp = DateTime().with_variant(
+    sqlite.DATETIME(
+        storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+    ),
+    "sqlite",
+)
+
 class IntentType(enum.Enum):
     FAQ = "faq"
     COMPLAINT = "complaint"
@@ -31,8 +43,11 @@ class ChatMessage(Base):
     bot_response = Column(Text)
     intent = Column(Enum(IntentType))
     agent_type = Column(String(100))
-    created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    created_at = Column(Timestamp, server_default=func.now())
+    updated_at = Column(Timestamp, server_default=func.now(), onupdate=func.now())
+
+    # Date-bounded search narrows chat messages by (created_at, id)
+    __table_args__ = (Index("ix_chat_messages_created_id", "created_at", "id"),)
 
 class Ticket(Base):
     __tablename__ = "tickets"
@@ -46,8 +61,24 @@ class Ticket(Base):
     customer_email = Column(String(255))
     customer_phone = Column(String(20))
     session_id = Column(String(255), index=True)
-    created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    duplicate_count = Column(Integer, nullable=False, default=0, server_default="0")
+    priority_score = Column(Integer, nullable=False, default=0, server_default="0")
+    assigned_to = Column(String(100))
+    claimed_at = Column(Timestamp)
+    created_at = Column(Timestamp, server_default=func.now())
+    updated_at = Column(Timestamp, server_default=func.now(), onupdate=func.now())
+
+    # Ticket listings are ordered newest first by (created_at, id); each
+    # filter gets an index that serves both the filter and the ordering
+    __table_args__ = (
+        Index("ix_tickets_created_id", "created_at", "id"),
+        Index("ix_tickets_status_created_id", "status", "created_at", "id"),
+        Index("ix_tickets_priority_created_id", "priority", "created_at", "id"),
+        Index("ix_tickets_email_created_id", "customer_email", "created_at", "id"),
+        Index("ix_tickets_phone_created_id", "customer_phone", "created_at", "id"),
+        # Work queue refill: best open tickets first, oldest first on ties
+        Index("ix_tickets_status_score_id", "status", priority_score.desc(), "id"),
+    )
 
 class FAQ(Base):
     __tablename__ = "faqs"
@@ -75,3 +106,10 @@ class Notification(Base):
     ticket_id = Column(Integer, index=True)
     created_at = Column(DateTime, server_default=func.now())
     sent_at = Column(DateTime)
+
+class CacheVersion(Base):
+    __tablename__ = "cache_versions"
+    
+    name = Column(String(100), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
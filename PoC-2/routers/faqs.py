@@ -0,0 +1,107 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+import json
+import logging
+
+from database.connection import get_db
+from models.database import FAQ
+from schemas.models import FAQCreate, FAQResponse, FAQUpdate
+from utils.faq_cache import FAQEntry, faq_cache
+
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api/admin/faqs", tags=["faqs"])
+
+
+def _to_response(faq: FAQ) -> FAQResponse:
+    return FAQResponse.model_validate(FAQEntry.from_model(faq))
+
+
+@router.get("", response_model=List[FAQResponse])
+async def list_faqs():
+    """List active FAQs from the in-memory snapshot"""
+    return [FAQResponse.model_validate(entry) for entry in faq_cache.snapshot.entries]
+
+
+@router.get("/version")
+async def faq_version():
+    """Version of the FAQ snapshot served by this process"""
+    snapshot = faq_cache.snapshot
+    return {"version": snapshot.version, "count": len(snapshot.entries)}
+
+
+@router.get("/{faq_id}", response_model=FAQResponse)
+async def get_faq(faq_id: int):
+    """Get one active FAQ"""
+    entry = faq_cache.snapshot.by_id.get(faq_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="FAQ not found")
+    return FAQResponse.model_validate(entry)
+
+
+@router.post("", response_model=FAQResponse, status_code=201)
+async def create_faq(faq_data: FAQCreate, db: AsyncSession = Depends(get_db)):
+    """Create an FAQ and publish a new snapshot"""
+    try:
+        faq = FAQ(
+            question=faq_data.question,
+            answer=faq_data.answer,
+            category=faq_data.category,
+            keywords=json.dumps(faq_data.keywords),
+        )
+        db.add(faq)
+        await faq_cache.bump_version(db)
+        await db.commit()
+        await faq_cache.load(db)
+
+        return _to_response(faq)
+
+    except Exception as e:
+        logger.error(f"Error creating FAQ: {e}")
+        raise HTTPException(status_code=500, detail=f"FAQ create error: {str(e)}")
+
+
+@router.put("/{faq_id}", response_model=FAQResponse)
+async def update_faq(
+    faq_id: int, faq_data: FAQUpdate, db: AsyncSession = Depends(get_db)
+):
+    """Update an FAQ (only the fields provided) and publish a new snapshot"""
+    faq = await db.get(FAQ, faq_id)
+    if faq is None:
+        raise HTTPException(status_code=404, detail="FAQ not found")
+
+    try:
+        changes = faq_data.model_dump(exclude_unset=True)
+        if "keywords" in changes:
+            changes["keywords"] = json.dumps(changes["keywords"] or [])
+        for field_name, value in changes.items():
+            setattr(faq, field_name, value)
+
+        await faq_cache.bump_version(db)
+        await db.commit()
+        await faq_cache.load(db)
+
+        return _to_response(faq)
+
+    except Exception as e:
+        logger.error(f"Error updating FAQ {faq_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"FAQ update error: {str(e)}")
+
+
+@router.delete("/{faq_id}", status_code=204)
+async def delete_faq(faq_id: int, db: AsyncSession = Depends(get_db)):
+    """Deactivate an FAQ; the row is kept so it can be restored with PUT"""
+    faq = await db.get(FAQ, faq_id)
+    if faq is None:
+        raise HTTPException(status_code=404, detail="FAQ not found")
+
+    try:
+        faq.is_active = False
+        await faq_cache.bump_version(db)
+        await db.commit()
+        await faq_cache.load(db)
+
+    except Exception as e:
+        logger.error(f"Error deleting FAQ {faq_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"FAQ delete error: {str(e)}")
@@ -0,0 +1,58 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import List, Optional
+import logging
+
+from database.connection import get_db
+from database.search import KINDS, decode_cursor, search
+from schemas.models import SearchHit, SearchPage
+
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api/search", tags=["search"])
+
+MAX_PAGE_SIZE = 100
+
+
+@router.get("", response_model=SearchPage)
+async def search_messages_and_tickets(
+    q: str = Query(min_length=1, max_length=500),
+    kind: List[str] = Query(default=list(KINDS)),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=20, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_db),
+):
+    """Chat messages and tickets matching all words of ``q`` (``word*``
+    matches a prefix), best first; pass ``next_cursor`` back as ``cursor``
+    to fetch the following page"""
+    unknown = set(kind) - set(KINDS)
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown kind: {', '.join(sorted(unknown))}")
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    try:
+        hits, next_cursor = await search(
+            db,
+            q,
+            kinds=[k for k in KINDS if k in kind],
+            since=since,
+            until=until,
+            after=after,
+            limit=limit,
+        )
+    except OperationalError as e:
+        # e.g. an SQLite build without FTS5
+        logger.error(f"Search unavailable: {e}")
+        raise HTTPException(status_code=503, detail="Search is unavailable")
+    except Exception as e:
+        logger.error(f"Error searching for {q!r}: {e}")
+        raise HTTPException(status_code=500, detail=f"Search error: {str(e)}")
+
+    return SearchPage(items=[SearchHit(**hit) for hit in hits], next_cursor=next_cursor)
@@ -0,0 +1,206 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import Optional, Tuple
+import base64
+import binascii
+import logging
+
+from agents.ticket_dedup import ticket_dedup
+from agents.ticket_queue import ticket_queue
+from database.connection import get_db
+from models.database import Ticket
+from models.database import TicketStatus as TicketStatusColumn
+from schemas.models import (
+    TicketClaim,
+    TicketPage,
+    TicketResponse,
+    TicketStatus,
+    TicketStatusUpdate,
+)
+
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api/tickets", tags=["tickets"])
+
+MAX_PAGE_SIZE = 200
+
+# Target status -> statuses a ticket may move from
+ALLOWED_TRANSITIONS = {
+    TicketStatus.OPEN: (TicketStatus.IN_PROGRESS, TicketStatus.RESOLVED),
+    TicketStatus.IN_PROGRESS: (TicketStatus.OPEN,),
+    TicketStatus.RESOLVED: (TicketStatus.OPEN, TicketStatus.IN_PROGRESS),
+    TicketStatus.CLOSED: (TicketStatus.OPEN, TicketStatus.IN_PROGRESS, TicketStatus.RESOLVED),
+}
+
+
+def encode_cursor(ticket: Ticket) -> str:
+    raw = f"{ticket.created_at.isoformat()}|{ticket.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        created_at, ticket_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(ticket_id)
+    except (ValueError, UnicodeDecodeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def build_ticket_query(
+    status: Optional[TicketStatus] = None,
+    priority: Optional[str] = None,
+    customer_email: Optional[str] = None,
+    customer_phone: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    after: Optional[Tuple[datetime, int]] = None,
+    limit: int = 50,
+):
+    """Newest-first ticket query. ``after`` is the (created_at, id) of the
+    last row of the previous page, so every page is an index range scan
+    regardless of how deep it is"""
+    query = select(Ticket)
+    if status is not None:
+        query = query.where(Ticket.status == TicketStatusColumn(status.value))
+    if priority is not None:
+        query = query.where(Ticket.priority == priority)
+    if customer_email is not None:
+        query = query.where(Ticket.customer_email == customer_email)
+    if customer_phone is not None:
+        query = query.where(Ticket.customer_phone == customer_phone)
+    if created_from is not None:
+        query = query.where(Ticket.created_at >= created_from)
+    if created_to is not None:
+        query = query.where(Ticket.created_at < created_to)
+    if after is not None:
+        # Typed like the columns, so the cursor is bound in the stored format
+        cursor = tuple_(*after, types=(Ticket.created_at.type, Ticket.id.type))
+        query = query.where(tuple_(Ticket.created_at, Ticket.id) < cursor)
+    return query.order_by(Ticket.created_at.desc(), Ticket.id.desc()).limit(limit)
+
+
+@router.get("", response_model=TicketPage)
+async def list_tickets(
+    status: Optional[TicketStatus] = None,
+    priority: Optional[str] = Query(default=None, pattern="^(low|medium|high|urgent)$"),
+    customer_email: Optional[str] = None,
+    customer_phone: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=50, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_db),
+):
+    """List tickets newest first; pass ``next_cursor`` back as ``cursor`` to
+    fetch the following page"""
+    after = decode_cursor(cursor) if cursor else None
+    try:
+        # Fetch one extra row to know whether another page exists
+        result = await db.execute(
+            build_ticket_query(
+                status,
+                priority,
+                customer_email,
+                customer_phone,
+                created_from,
+                created_to,
+                after,
+                limit + 1,
+            )
+        )
+        tickets = result.scalars().all()
+
+        next_cursor = encode_cursor(tickets[limit - 1]) if len(tickets) > limit else None
+        return TicketPage(
+            items=[TicketResponse.model_validate(ticket) for ticket in tickets[:limit]],
+            next_cursor=next_cursor,
+        )
+
+    except Exception as e:
+        logger.error(f"Error listing tickets: {e}")
+        raise HTTPException(status_code=500, detail=f"Ticket list error: {str(e)}")
+
+
+@router.post("/next", response_model=TicketResponse, responses={204: {"description": "No open tickets"}})
+async def claim_next_ticket(claim: TicketClaim, db: AsyncSession = Depends(get_db)):
+    """Assign the highest-priority open ticket to the calling agent and move
+    it to in_progress. Safe to call concurrently from many agents."""
+    try:
+        ticket = await ticket_queue.claim(db, claim.agent)
+    except Exception as e:
+        logger.error(f"Error claiming ticket for {claim.agent}: {e}")
+        raise HTTPException(status_code=500, detail=f"Ticket claim error: {str(e)}")
+
+    if ticket is None:
+        return Response(status_code=204)
+    return TicketResponse.model_validate(ticket)
+
+
+@router.get("/by-number/{ticket_number}", response_model=TicketResponse)
+async def get_ticket_by_number(ticket_number: str, db: AsyncSession = Depends(get_db)):
+    """Look up a ticket by the number shown to the customer"""
+    result = await db.execute(select(Ticket).where(Ticket.ticket_number == ticket_number))
+    ticket = result.scalar_one_or_none()
+    if ticket is None:
+        raise HTTPException(status_code=404, detail="Ticket not found")
+    return TicketResponse.model_validate(ticket)
+
+
+@router.get("/{ticket_id}", response_model=TicketResponse)
+async def get_ticket(ticket_id: int, db: AsyncSession = Depends(get_db)):
+    ticket = await db.get(Ticket, ticket_id)
+    if ticket is None:
+        raise HTTPException(status_code=404, detail="Ticket not found")
+    return TicketResponse.model_validate(ticket)
+
+
+@router.patch("/{ticket_id}/status", response_model=TicketResponse)
+async def update_ticket_status(
+    ticket_id: int, status_update: TicketStatusUpdate, db: AsyncSession = Depends(get_db)
+):
+    """Move a ticket to a new status.
+
+    The transition is a single UPDATE guarded by the allowed source statuses,
+    so concurrent updates cannot both succeed from the same state.
+    """
+    target = status_update.status
+    sources = [TicketStatusColumn(source.value) for source in ALLOWED_TRANSITIONS[target]]
+    values = {"status": TicketStatusColumn(target.value)}
+    if target == TicketStatus.OPEN:
+        # Reopened tickets go back to the work queue unassigned
+        values.update(assigned_to=None, claimed_at=None)
+    try:
+        result = await db.execute(
+            update(Ticket)
+            .where(Ticket.id == ticket_id, Ticket.status.in_(sources))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+    except Exception as e:
+        logger.error(f"Error updating ticket {ticket_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Ticket update error: {str(e)}")
+
+    ticket = (
+        await db.execute(
+            select(Ticket)
+            .where(Ticket.id == ticket_id)
+            .execution_options(populate_existing=True)
+        )
+    ).scalar_one_or_none()
+    if ticket is None:
+        raise HTTPException(status_code=404, detail="Ticket not found")
+    if result.rowcount == 0:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Cannot change ticket status from {ticket.status.value} to {target.value}",
+        )
+
+    if target in (TicketStatus.RESOLVED, TicketStatus.CLOSED):
+        # New complaints should no longer be attached to this ticket
+        ticket_dedup.discard(ticket_id)
+    elif target == TicketStatus.OPEN:
+        ticket_queue.push(ticket_id, ticket.priority_score)
+    return TicketResponse.model_validate(ticket)
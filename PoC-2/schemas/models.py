@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List
 from datetime import datetime
 from enum import Enum
@@ -57,18 +57,83 @@ class TicketResponse(BaseModel):
     priority: str
     customer_email: Optional[str]
     customer_phone: Optional[str]
+    session_id: Optional[str] = None
+    duplicate_count: int = 0
+    priority_score: int = 0
+    assigned_to: Optional[str] = None
+    claimed_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
 
+    @field_validator("status", mode="before")
+    @classmethod
+    def _status_value(cls, value):
+        # ORM rows carry the models.database enum
+        return getattr(value, "value", value)
+
     class Config:
         from_attributes = True
 
 
+class TicketPage(BaseModel):
+    items: List[TicketResponse]
+    next_cursor: Optional[str] = None
+
+
+class SearchHit(BaseModel):
+    kind: str  # "chat" or "ticket"
+    id: int
+    score: float
+    snippet: str
+    session_id: Optional[str] = None
+    ticket_number: Optional[str] = None
+    title: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+
+class SearchPage(BaseModel):
+    items: List[SearchHit]
+    next_cursor: Optional[str] = None
+
+
+class TicketStatusUpdate(BaseModel):
+    status: TicketStatus
+
+
+class TicketClaim(BaseModel):
+    agent: str = Field(..., min_length=1, max_length=100)
+
+
+class FAQCreate(BaseModel):
+    question: str = Field(..., min_length=1)
+    answer: str = Field(..., min_length=1)
+    category: Optional[str] = Field(default=None, max_length=100)
+    keywords: List[str] = []
+
+
+class FAQUpdate(BaseModel):
+    question: Optional[str] = Field(default=None, min_length=1)
+    answer: Optional[str] = Field(default=None, min_length=1)
+    category: Optional[str] = Field(default=None, max_length=100)
+    keywords: Optional[List[str]] = None
+    is_active: Optional[bool] = None
+
+    @field_validator("question", "answer", "is_active")
+    @classmethod
+    def _not_null(cls, value):
+        # Optional only so the field may be left out; the column is NOT NULL
+        # (question, answer) or filtered on (is_active)
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
+
+
 class FAQResponse(BaseModel):
     id: int
     question: str
     answer: str
     category: Optional[str]
+    keywords: List[str] = []
 
     class Config:
         from_attributes = True
@@ -0,0 +1,50 @@
+"""
+Shared fixtures: the app runs against a scratch SQLite database, with the
+keyword intent classifier (no OpenAI key) and no notification providers.
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+POC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DB_DIR = tempfile.mkdtemp()
+
+# Set before the app's modules read their configuration on import
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(DB_DIR, 'support_system.db')}"
+os.environ["SHARED_STATE_PATH"] = os.path.join(DB_DIR, "shared_state.db")
+for name in ("OPENAI_API_KEY", "SENDGRID_API_KEY", "TWILIO_ACCOUNT_SID", "TWILIO_AUTH_TOKEN"):
+    os.environ.pop(name, None)
+
+sys.path.insert(0, POC_DIR)
+os.chdir(POC_DIR)  # static files and templates are mounted relative to it
+
+
+@pytest.fixture
+def client():
+    """Test client for the app; each test starts without tickets, chat
+    messages or notifications"""
+    from fastapi.testclient import TestClient
+    from main import app
+
+    with TestClient(app) as client:
+        client.portal.call(clear_tables)
+        yield client
+
+
+async def clear_tables():
+    from sqlalchemy import delete
+    from agents.ticket_dedup import ticket_dedup
+    from agents.ticket_queue import ticket_queue
+    from database.connection import AsyncSessionLocal
+    from models.database import ChatMessage, Notification, Ticket
+
+    async with AsyncSessionLocal() as db:
+        for model in (Ticket, ChatMessage, Notification):
+            await db.execute(delete(model))
+        await db.commit()
+        await ticket_queue.refill(db)
+        for ticket_id in list(ticket_dedup._entries):
+            ticket_dedup.discard(ticket_id)
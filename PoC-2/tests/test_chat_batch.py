@@ -0,0 +1,77 @@
+import json
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.database import ChatMessage
+
+
+def run_batch(client, messages):
+    items = [
+        {"message": message, "customer_email": f"customer{i}@example.com"}
+        for i, message in enumerate(messages)
+    ]
+    response = client.post("/api/chat/batch", params={"concurrency": 8}, json=items)
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    return {line["index"]: line for line in lines}
+
+
+def stored_ticket_numbers(client):
+    response = client.get("/api/tickets", params={"limit": 200})
+    return {ticket["ticket_number"] for ticket in response.json()["items"]}
+
+
+def test_every_ok_item_is_stored(client):
+    lines = run_batch(client, [f"I want to complain, order {i} arrived broken" for i in range(40)])
+
+    assert all(line["status"] == "ok" for line in lines.values())
+    assert {line["ticket_number"] for line in lines.values()} == stored_ticket_numbers(client)
+
+
+def test_failed_commit_is_reported(client, monkeypatch):
+    commit = AsyncSession.commit
+
+    async def failing_commit(session):
+        if any(
+            isinstance(row, ChatMessage) and "order 3 " in row.user_message for row in session.new
+        ):
+            raise RuntimeError("database is locked")
+        await commit(session)
+
+    monkeypatch.setattr(AsyncSession, "commit", failing_commit)
+    lines = run_batch(client, [f"I want to complain, order {i} arrived broken" for i in range(6)])
+
+    assert lines[3]["status"] == "error"
+    ok = {line["ticket_number"] for line in lines.values() if line["status"] == "ok"}
+    assert len(ok) == 5
+    assert ok == stored_ticket_numbers(client)
+
+
+def test_rolled_back_ticket_is_not_queued_or_indexed(client, monkeypatch):
+    from agents.ticket_dedup import ticket_dedup
+    from agents.ticket_queue import ticket_queue
+
+    commit = AsyncSession.commit
+
+    async def failing_commit(session):
+        if any(isinstance(row, ChatMessage) for row in session.new):
+            raise RuntimeError("database is locked")
+        await commit(session)
+
+    monkeypatch.setattr(AsyncSession, "commit", failing_commit)
+    lines = run_batch(client, ["I want to complain, my order arrived broken"])
+    monkeypatch.setattr(AsyncSession, "commit", commit)
+
+    assert lines[0]["status"] == "error"
+    assert len(ticket_queue) == 0
+    assert not ticket_dedup._entries
+
+    # The same complaint later gets a ticket of its own
+    response = client.post(
+        "/api/chat",
+        json={
+            "message": "I want to complain, my order arrived broken",
+            "customer_email": "customer0@example.com",
+        },
+    )
+    assert response.json()["ticket_number"] in stored_ticket_numbers(client)
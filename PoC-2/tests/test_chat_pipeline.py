@@ -0,0 +1,67 @@
+import asyncio
+
+from database.connection import AsyncSessionLocal
+from main import build_agents, run_chat_pipeline
+from schemas.models import ChatRequest
+
+
+class SlowNotifier:
+    """Stands in for NotifyAgent; still sending when persist fails"""
+
+    def __init__(self):
+        self.sent = False
+
+    async def process(self, message, context=None):
+        await asyncio.sleep(0.05)
+        self.sent = True
+        return {"notification_sent": True}
+
+
+def test_persist_failure_keeps_response_and_notification(client):
+    notifier = SlowNotifier()
+
+    async def persist(pipeline_result):
+        raise RuntimeError("database is locked")
+
+    async def run():
+        async with AsyncSessionLocal() as db:
+            agents = {**build_agents(db), "notify_agent": notifier}
+            return await run_chat_pipeline(
+                ChatRequest(
+                    message="I want to complain, my order arrived broken",
+                    customer_email="customer@example.com",
+                ),
+                agents,
+                persist=persist,
+            )
+
+    result = client.portal.call(run)
+
+    assert result["agent_result"]["ticket_number"]
+    assert notifier.sent
+
+
+def test_speculative_stage_finishing_with_its_confirmation():
+    from agents.pipeline import PipelineExecutor, Stage
+
+    async def instant(results):
+        return "done"
+
+    stages = [
+        Stage("route", instant),
+        Stage(
+            "prefetch",
+            instant,
+            confirm_after="route",
+            keep_if=lambda results: False,
+        ),
+    ]
+    executor = PipelineExecutor(stages)
+    results = asyncio.run(executor.run())
+
+    # Finished together, the speculative result may be kept or dropped
+    assert results["route"] == "done"
+    assert (results["prefetch"], executor.outcomes["prefetch"]) in (
+        ("done", "done"),
+        (None, "cancelled"),
+    )
@@ -0,0 +1,30 @@
+import pytest
+
+
+@pytest.fixture
+def faq(client):
+    response = client.post(
+        "/api/admin/faqs",
+        json={"question": "Do you ship abroad?", "answer": "Yes", "category": "Shipping"},
+    )
+    assert response.status_code in (200, 201)
+    faq = response.json()
+    yield faq
+    client.delete(f"/api/admin/faqs/{faq['id']}")
+
+
+@pytest.mark.parametrize("field", ["question", "answer", "is_active"])
+def test_update_rejects_null(client, faq, field):
+    response = client.put(f"/api/admin/faqs/{faq['id']}", json={field: None})
+    assert response.status_code == 422
+
+
+def test_update_changes_only_given_fields(client, faq):
+    response = client.put(
+        f"/api/admin/faqs/{faq['id']}", json={"answer": "To most countries", "category": None}
+    )
+    assert response.status_code == 200
+    updated = response.json()
+    assert updated["answer"] == "To most countries"
+    assert updated["question"] == faq["question"]
+    assert updated["category"] is None
@@ -0,0 +1,41 @@
+import main
+from utils.response_cache import ResponseCache
+
+
+def chat(client, message):
+    response = client.post(
+        "/api/chat", json={"message": message, "customer_email": "customer@example.com"}
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_complaint_worded_like_cached_question_gets_a_ticket(client, monkeypatch):
+    cache = ResponseCache(shared=None)
+    monkeypatch.setattr(main, "response_cache", cache)
+
+    question = chat(client, "What are your weekend business hours?")
+    assert question["intent"] == "faq"
+    assert cache.lookup("weekend business hours", main.faq_cache.snapshot.version)
+
+    # Shares three of its four content words with the cached question
+    complaint = chat(client, "weekend business hours wrong")
+    assert complaint["intent"] == "complaint"
+    assert complaint["ticket_number"]
+
+
+def test_cached_answer_serves_the_same_question(client, monkeypatch):
+    monkeypatch.setattr(main, "response_cache", ResponseCache(shared=None))
+    served = []
+    respond_from_cache = main.respond_from_cache
+
+    async def spy(chat_request, cached, db):
+        served.append(chat_request.message)
+        return await respond_from_cache(chat_request, cached, db)
+
+    monkeypatch.setattr(main, "respond_from_cache", spy)
+
+    first = chat(client, "What are your weekend business hours?")
+    again = chat(client, "what are your weekend business hours please")
+    assert again["response"] == first["response"]
+    assert served == ["what are your weekend business hours please"]
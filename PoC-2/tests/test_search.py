@@ -0,0 +1,31 @@
+def test_since_includes_its_own_second(client):
+    from sqlalchemy import text
+    from database.connection import AsyncSessionLocal
+
+    async def insert_messages():
+        # As written by the created_at server default: no fractional seconds
+        async with AsyncSessionLocal() as db:
+            for created_at in ("2024-01-01 09:59:59", "2024-01-01 10:00:00", "2024-01-01 10:00:01"):
+                await db.execute(
+                    text(
+                        "INSERT INTO chat_messages (session_id, user_message, created_at) "
+                        "VALUES ('search', 'my parcel is missing', :created_at)"
+                    ),
+                    {"created_at": created_at},
+                )
+            await db.commit()
+
+    client.portal.call(insert_messages)
+
+    response = client.get(
+        "/api/search",
+        params={
+            "q": "parcel",
+            "kind": "chat",
+            "since": "2024-01-01T10:00:00",
+            "until": "2024-01-01T10:00:01",
+        },
+    )
+    assert response.status_code == 200
+    hits = response.json()["items"]
+    assert [hit["created_at"] for hit in hits] == ["2024-01-01T10:00:00"]
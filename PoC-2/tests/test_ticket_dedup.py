@@ -0,0 +1,49 @@
+from agents.ticket_dedup import ticket_dedup
+from database.connection import AsyncSessionLocal
+
+COMPLAINT = "I want to complain, my order 1234 arrived broken and nobody answers my emails"
+
+
+def complain(client, email="repeat@example.com"):
+    response = client.post("/api/chat", json={"message": COMPLAINT, "customer_email": email})
+    assert response.status_code == 200
+    return response.json()["ticket_number"]
+
+
+def list_tickets(client):
+    response = client.get("/api/tickets")
+    assert response.status_code == 200
+    return response.json()["items"]
+
+
+def test_repeated_complaints_share_a_ticket(client):
+    numbers = {complain(client) for _ in range(3)}
+
+    tickets = list_tickets(client)
+    assert len(numbers) == 1
+    assert len(tickets) == 1
+    assert tickets[0]["duplicate_count"] == 2
+
+
+def test_other_customers_get_their_own_ticket(client):
+    complain(client, "first@example.com")
+    complain(client, "second@example.com")
+
+    assert len(list_tickets(client)) == 2
+
+
+def test_warm_indexes_tickets_created_through_chat(client):
+    first = complain(client)
+
+    # As after a restart: the index is rebuilt from the database
+    for ticket_id in list(ticket_dedup._entries):
+        ticket_dedup.discard(ticket_id)
+
+    async def warm():
+        async with AsyncSessionLocal() as db:
+            await ticket_dedup.warm(db)
+
+    client.portal.call(warm)
+
+    assert complain(client) == first
+    assert list_tickets(client)[0]["duplicate_count"] == 1
@@ -0,0 +1,89 @@
+def complain(client, message, email="customer@example.com"):
+    response = client.post(
+        "/api/chat", json={"message": message, "customer_email": email}
+    )
+    assert response.status_code == 200
+    assert response.json()["ticket_number"]
+    return response.json()
+
+
+def test_chat_ticket_is_listed(client):
+    created = complain(client, "I want to complain, my order arrived broken")
+
+    response = client.get("/api/tickets", params={"status": "open", "limit": 1})
+    assert response.status_code == 200
+    page = response.json()
+    assert [ticket["ticket_number"] for ticket in page["items"]] == [created["ticket_number"]]
+    assert page["items"][0]["status"] == "open"
+
+
+def test_startup_fixes_lowercase_statuses(client):
+    from sqlalchemy import text
+    from database.connection import AsyncSessionLocal, init_db
+
+    async def insert_old_ticket():
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                text(
+                    "INSERT INTO tickets (ticket_number, title, description, status, priority) "
+                    "VALUES ('TKT-OLD', 'Old', 'Written before the fix', 'open', 'medium')"
+                )
+            )
+            await db.commit()
+
+    client.portal.call(insert_old_ticket)
+    client.portal.call(init_db)
+
+    response = client.get("/api/tickets", params={"status": "open"})
+    assert response.status_code == 200
+    assert [ticket["ticket_number"] for ticket in response.json()["items"]] == ["TKT-OLD"]
+
+
+def test_chat_ticket_can_be_claimed(client):
+    created = complain(client, "I want to complain, my refund never arrived")
+
+    response = client.post("/api/tickets/next", json={"agent": "alice"})
+    assert response.status_code == 200
+    ticket = response.json()
+    assert ticket["ticket_number"] == created["ticket_number"]
+    assert ticket["status"] == "in_progress"
+    assert ticket["assigned_to"] == "alice"
+
+    # Nothing left to hand out
+    assert client.post("/api/tickets/next", json={"agent": "bob"}).status_code == 204
+
+
+def test_pages_through_tickets_created_in_one_second(client):
+    from sqlalchemy import text
+    from database.connection import AsyncSessionLocal
+
+    async def insert_tickets():
+        # As written by the created_at server default: no fractional seconds
+        async with AsyncSessionLocal() as db:
+            for i in range(5):
+                await db.execute(
+                    text(
+                        "INSERT INTO tickets "
+                        "(ticket_number, title, description, status, priority, created_at) "
+                        "VALUES (:number, 'Batch', 'Created in one second', 'OPEN', 'medium', "
+                        "'2024-01-01 10:00:00')"
+                    ),
+                    {"number": f"TKT-SAME-{i}"},
+                )
+            await db.commit()
+
+    client.portal.call(insert_tickets)
+
+    seen, cursor = [], None
+    for _ in range(5):
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/tickets", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        seen += [ticket["ticket_number"] for ticket in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert cursor is None
+    assert seen == [f"TKT-SAME-{i}" for i in reversed(range(5))]
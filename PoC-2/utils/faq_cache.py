@@ -0,0 +1,159 @@
+"""
+In-memory FAQ snapshot shared by all agents in a process.
+
+Agents read ``faq_cache.snapshot`` without locks or database queries. FAQ
+writes bump a row in ``cache_versions`` in the same transaction and then
+reload the snapshot, which is swapped in with a single assignment. Other
+worker processes notice the new version through ``poll_faq_version``.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.database import FAQ, CacheVersion
+from utils.templates import FAQ_ANSWER_BLOCK, FAQ_RELATED_LINE, render_faq_response
+
+logger = logging.getLogger(__name__)
+
+FAQ_CACHE_NAME = "faqs"
+FAQ_VERSION_POLL_SECONDS = float(os.getenv("FAQ_VERSION_POLL_SECONDS", "5"))
+FAQ_RESPONSE_CACHE_SIZE = int(os.getenv("FAQ_RESPONSE_CACHE_SIZE", "1024"))
+
+
+@dataclass(frozen=True)
+class FAQEntry:
+    """Immutable FAQ row with search fields and response pieces precomputed"""
+
+    id: int
+    question: str
+    answer: str
+    category: Optional[str]
+    keywords: Tuple[str, ...]
+    search_text: str
+    answer_block: str
+    related_line: str
+
+    @classmethod
+    def from_model(cls, faq: FAQ) -> "FAQEntry":
+        keywords = ()
+        if faq.keywords:
+            try:
+                keywords = tuple(keyword.lower() for keyword in json.loads(faq.keywords))
+            except (ValueError, TypeError, AttributeError):
+                logger.warning(f"Ignoring malformed keywords on FAQ {faq.id}")
+        return cls(
+            id=faq.id,
+            question=faq.question,
+            answer=faq.answer,
+            category=faq.category,
+            keywords=keywords,
+            search_text=f"{faq.question} {faq.answer}".lower(),
+            answer_block=FAQ_ANSWER_BLOCK.render(question=faq.question, answer=faq.answer),
+            related_line=FAQ_RELATED_LINE.render(question=faq.question),
+        )
+
+
+@dataclass(frozen=True)
+class FAQSnapshot:
+    version: int
+    entries: Tuple[FAQEntry, ...] = ()
+    by_id: Dict[int, FAQEntry] = field(default_factory=dict)
+    # Rendered answers keyed by the ids of the top matches; a new snapshot
+    # starts empty, so FAQ edits invalidate it automatically
+    responses: Dict[Tuple[int, ...], str] = field(default_factory=dict, compare=False)
+
+
+class FAQCache:
+    def __init__(self):
+        self._snapshot = FAQSnapshot(version=-1)
+
+    @property
+    def snapshot(self) -> FAQSnapshot:
+        return self._snapshot
+
+    async def load(self, db: AsyncSession) -> FAQSnapshot:
+        """Build a new snapshot from the database and swap it in"""
+        # Read the version first: a write landing between the two queries
+        # leaves us with a stale version, which only costs one extra reload
+        version = await self.current_version(db)
+        result = await db.execute(select(FAQ).where(FAQ.is_active == True).order_by(FAQ.id))
+        entries = tuple(FAQEntry.from_model(faq) for faq in result.scalars().all())
+
+        self._snapshot = FAQSnapshot(
+            version=version,
+            entries=entries,
+            by_id={entry.id: entry for entry in entries},
+        )
+        logger.info(f"Loaded {len(entries)} FAQs (version {version})")
+        return self._snapshot
+
+    async def refresh_if_stale(self, db: AsyncSession) -> bool:
+        """Reload the snapshot if another process has changed the FAQs"""
+        if await self.current_version(db) == self._snapshot.version:
+            return False
+        await self.load(db)
+        return True
+
+    def render_response(self, faqs: List[FAQEntry]) -> str:
+        """Render the answer for the best match plus up to two related
+        questions, reusing the cached text for the same combination"""
+        top = tuple(faqs[:3])
+        snapshot = self._snapshot
+        key = tuple(faq.id for faq in top)
+        # Entries from an older snapshot (e.g. a prefetch racing a reload)
+        # are rendered but not cached
+        cacheable = all(snapshot.by_id.get(faq.id) is faq for faq in top)
+
+        if cacheable:
+            cached = snapshot.responses.get(key)
+            if cached is not None:
+                return cached
+
+        response = render_faq_response(
+            top[0].answer_block, tuple(faq.related_line for faq in top[1:])
+        )
+        if cacheable:
+            if len(snapshot.responses) >= FAQ_RESPONSE_CACHE_SIZE:
+                snapshot.responses.clear()
+            snapshot.responses[key] = response
+        return response
+
+    @staticmethod
+    async def current_version(db: AsyncSession) -> int:
+        result = await db.execute(
+            select(CacheVersion.version).where(CacheVersion.name == FAQ_CACHE_NAME)
+        )
+        return result.scalar() or 0
+
+    @staticmethod
+    async def bump_version(db: AsyncSession):
+        """Increment the FAQ version; call inside the transaction that
+        changes the FAQs, before committing"""
+        result = await db.execute(
+            update(CacheVersion)
+            .where(CacheVersion.name == FAQ_CACHE_NAME)
+            .values(version=CacheVersion.version + 1)
+        )
+        if result.rowcount == 0:
+            db.add(CacheVersion(name=FAQ_CACHE_NAME, version=1))
+
+
+faq_cache = FAQCache()
+
+
+async def poll_faq_version(session_factory, interval: float = FAQ_VERSION_POLL_SECONDS):
+    """Background task reloading the snapshot when the FAQ version changes"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with session_factory() as db:
+                await faq_cache.refresh_if_stale(db)
+        except Exception as e:
+            logger.error(f"FAQ version poll failed: {e}")
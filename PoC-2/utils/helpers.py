@@ -1,27 +1,25 @@
 import logging
-import os
 from datetime import datetime
 from typing import Optional
 
 def setup_logging():
-    """Setup logging configuration"""
-    log_level = os.getenv("LOG_LEVEL", "INFO")
-    
-    logging.basicConfig(
-        level=getattr(logging, log_level),
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('support_system.log'),
-            logging.StreamHandler()
-        ]
-    )
-    
+    """Setup logging configuration
+
+    Logging goes through a queue to a background listener thread; see
+    ``utils.log_pipeline`` for the ``LOG_*`` environment variables.
+    """
+    from utils.log_pipeline import configure_from_env
+
+    configure_from_env()
+
     return logging.getLogger(__name__)
 
 def generate_ticket_number() -> str:
     """Generate a unique ticket number"""
+    import uuid
     timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-    return f"TKT-{timestamp}"
+    # Suffix keeps numbers unique when many tickets are created per second
+    return f"TKT-{timestamp}-{uuid.uuid4().hex[:6].upper()}"
 
 def generate_session_id() -> str:
     """Generate a unique session ID"""
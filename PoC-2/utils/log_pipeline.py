@@ -0,0 +1,168 @@
+"""
+Non-blocking structured logging for the support system.
+
+Records are put on an in-memory queue by a ``QueueHandler`` on the calling
+(event-loop) thread and written to the console and log file by a
+``QueueListener`` thread, so request handling never waits on file I/O.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+LOG_MAX_FIELD_CHARS = int(os.getenv("LOG_MAX_FIELD_CHARS", "300"))
+LOG_MAX_LIST_ITEMS = int(os.getenv("LOG_MAX_LIST_ITEMS", "5"))
+LOG_INTERACTION_SAMPLE_RATE = float(os.getenv("LOG_INTERACTION_SAMPLE_RATE", "1.0"))
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+# Attributes every LogRecord has; anything else was passed through ``extra``
+_RESERVED_ATTRS = set(
+    logging.LogRecord("", 0, "", 0, "", None, None).__dict__
+) | {"message", "asctime"}
+
+
+def truncate(value: Any, limit: int = LOG_MAX_FIELD_CHARS) -> Any:
+    """Return a copy of ``value`` small enough to log.
+
+    Strings are cut to ``limit`` characters, lists to ``LOG_MAX_LIST_ITEMS``
+    items, and nested dicts/lists are truncated recursively.
+    """
+    if isinstance(value, str):
+        if len(value) <= limit:
+            return value
+        return f"{value[:limit]}...(+{len(value) - limit} chars)"
+    if isinstance(value, dict):
+        return {key: truncate(item, limit) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        items = [truncate(item, limit) for item in value[:LOG_MAX_LIST_ITEMS]]
+        if len(value) > LOG_MAX_LIST_ITEMS:
+            items.append(f"...(+{len(value) - LOG_MAX_LIST_ITEMS} items)")
+        return items
+    if value is None or isinstance(value, (int, float, bool)):
+        return value
+    return truncate(str(value), limit)
+
+
+def sample_interaction() -> bool:
+    """Decide whether an agent interaction record should be emitted"""
+    if LOG_INTERACTION_SAMPLE_RATE >= 1.0:
+        return True
+    return random.random() < LOG_INTERACTION_SAMPLE_RATE
+
+
+def _extra_fields(record: logging.LogRecord) -> dict:
+    return {
+        key: value
+        for key, value in record.__dict__.items()
+        if key not in _RESERVED_ATTRS and not key.startswith("_")
+    }
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(_extra_fields(record))
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Classic text format with any structured fields appended as JSON"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = _extra_fields(record)
+        if fields:
+            line = f"{line} {json.dumps(fields, default=str)}"
+        return line
+
+
+def _parse_agent_levels(spec: str) -> dict:
+    """Parse ``"FAQAgent=WARNING,IntentClassifier=DEBUG"`` into a mapping"""
+    levels = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        name, level = item.split("=", 1)
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def start_logging(
+    level: str = "INFO",
+    log_file: Optional[str] = "support_system.log",
+    json_format: bool = False,
+    agent_levels: Optional[dict] = None,
+    console: bool = True,
+) -> logging.Logger:
+    """Route all logging through a queue drained by a background listener"""
+    global _listener
+
+    stop_logging()
+
+    formatter = (
+        JsonFormatter()
+        if json_format
+        else TextFormatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    )
+    handlers = [logging.StreamHandler()] if console else []
+    if log_file:
+        handlers.append(logging.FileHandler(log_file))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(getattr(logging, level.upper(), logging.INFO))
+
+    for agent_name, agent_level in (agent_levels or {}).items():
+        logging.getLogger(f"agents.base_agent.{agent_name}").setLevel(agent_level)
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    _listener.start()
+
+    return root
+
+
+def stop_logging():
+    """Flush queued records and stop the background listener"""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def configure_from_env() -> logging.Logger:
+    """Start the logging pipeline using ``LOG_*`` environment variables"""
+    return start_logging(
+        level=os.getenv("LOG_LEVEL", "INFO"),
+        log_file=os.getenv("LOG_FILE", "support_system.log") or None,
+        json_format=os.getenv("LOG_FORMAT", "text").lower() == "json",
+        agent_levels=_parse_agent_levels(os.getenv("AGENT_LOG_LEVELS", "")),
+    )
+
+
+atexit.register(stop_logging)
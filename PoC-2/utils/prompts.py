@@ -83,3 +83,67 @@ NOTIFICATION_SMS_TEMPLATE = """
 Ref: {ticket_number}
 - Support Team
 """
+
+FAQ_NO_MATCH_RESPONSE = """I don't have a specific FAQ that matches your question, but I'd be happy to help! 
+            
+Here are a few things you can try:
+• Check our help center for more detailed guides
+• Contact our support team for personalized assistance
+• Try rephrasing your question with different keywords
+
+Is there anything specific I can help you with?"""
+
+FAQ_RESPONSE_HEADER = """Based on your question, here's what I found:
+
+"""
+
+FAQ_ANSWER_BLOCK = """**Q: {question}**
+**A: {answer}**
+"""
+
+FAQ_RELATED_HEADER = "\n\n**You might also find these helpful:**\n"
+
+FAQ_RELATED_LINE = "• {question}\n"
+
+FAQ_RESPONSE_FOOTER = "\n\nIf this doesn't answer your question, please let me know and I'll be happy to help further!"
+
+COMPLAINT_RESPONSE_TEMPLATE = """I understand your concern and I'm sorry you're experiencing this issue. I want to make sure we address this properly.
+
+I've created a support ticket for you:
+**Ticket Number: {ticket_number}**
+
+Here's what happens next:
+• Your ticket has been assigned to our support team
+• You'll receive a confirmation email shortly
+• A support specialist will review your case within 24 hours
+• We'll keep you updated on the progress
+
+Your issue is important to us, and we're committed to resolving it as quickly as possible. Is there any additional information you'd like to add to your ticket?"""
+
+ACCOUNT_RESPONSE = """I'd be happy to help you with your account inquiry. 
+
+For security reasons, I cannot access specific account information in this chat. However, I can help you with:
+
+**Common Account Tasks:**
+• Password reset instructions
+• Account verification steps
+• Billing and payment information
+• Profile update procedures
+
+**For Specific Account Issues:**
+To get detailed help with your account, please:
+1. Visit our secure account portal
+2. Contact our account specialists directly
+3. Provide proper verification (email, phone, or security questions)
+
+**Immediate Help:**
+If this is urgent, I can create a priority ticket for our account team to contact you directly. Would you like me to do that?
+
+What specific account issue can I help guide you through?"""
+
+COMPLAINT_DUPLICATE_RESPONSE_TEMPLATE = """I understand your concern and I'm sorry you're experiencing this issue.
+
+We're already aware of this problem and our team is actively working on it. I've added your report to the existing support ticket:
+**Ticket Number: {ticket_number}**
+
+We'll keep you updated on the progress, and you don't need to report it again. Is there any additional information you'd like to add to your ticket?"""
@@ -0,0 +1,126 @@
+"""
+Lazily built clients for the external providers (OpenAI, SendGrid, Twilio).
+
+The SDKs are large import trees, so they are only imported the first time a
+client is requested, and only when the provider's keys are configured. Each
+client is built once per process and shared by every agent instance.
+
+``OPENAI_BASE_URL``, ``SENDGRID_API_HOST`` and ``TWILIO_API_BASE_URL`` point
+the clients at other endpoints, e.g. the local stand-ins in
+``benchmarks/mock_providers.py`` used for load tests.
+"""
+
+import importlib.util
+import logging
+import os
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+TWILIO_API_URL = "https://api.twilio.com"
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def openai_configured() -> bool:
+    return bool(os.getenv("OPENAI_API_KEY")) and _installed("openai")
+
+
+def sendgrid_configured() -> bool:
+    return bool(os.getenv("SENDGRID_API_KEY")) and _installed("sendgrid")
+
+
+def twilio_configured() -> bool:
+    return (
+        bool(os.getenv("TWILIO_ACCOUNT_SID"))
+        and bool(os.getenv("TWILIO_AUTH_TOKEN"))
+        and _installed("twilio")
+    )
+
+
+@lru_cache(maxsize=None)
+def get_openai_client(timeout: float):
+    """Shared AsyncOpenAI client, or None if OpenAI is not configured"""
+    if not openai_configured():
+        logger.info("OpenAI API key not configured, using keyword-based classification")
+        return None
+    try:
+        import openai
+
+        # Retries are left to the circuit breaker and hedging in the classifier
+        client = openai.AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            base_url=os.getenv("OPENAI_BASE_URL") or None,
+            timeout=timeout,
+            max_retries=0,
+        )
+        logger.info("OpenAI client initialized successfully")
+        return client
+    except Exception as e:
+        logger.warning(f"Failed to initialize OpenAI client: {e}")
+        return None
+
+
+@lru_cache(maxsize=None)
+def get_sendgrid_client():
+    """Shared SendGrid client, or None if SendGrid is not configured"""
+    if not sendgrid_configured():
+        return None
+    try:
+        from sendgrid import SendGridAPIClient
+
+        client = SendGridAPIClient(
+            os.getenv("SENDGRID_API_KEY"),
+            host=os.getenv("SENDGRID_API_HOST", "https://api.sendgrid.com"),
+        )
+        logger.info("SendGrid client initialized")
+        return client
+    except Exception as e:
+        logger.error(f"Failed to initialize SendGrid: {e}")
+        return None
+
+
+def build_sendgrid_mail(**kwargs):
+    """``sendgrid.helpers.mail.Mail``; only call once a client exists"""
+    from sendgrid.helpers.mail import Mail
+
+    return Mail(**kwargs)
+
+
+@lru_cache(maxsize=None)
+def get_twilio_client():
+    """Shared Twilio REST client, or None if Twilio is not configured"""
+    if not twilio_configured():
+        return None
+    try:
+        from twilio.rest import Client as TwilioClient
+
+        client = TwilioClient(
+            os.getenv("TWILIO_ACCOUNT_SID"),
+            os.getenv("TWILIO_AUTH_TOKEN"),
+            http_client=_twilio_http_client(os.getenv("TWILIO_API_BASE_URL")),
+        )
+        logger.info("Twilio client initialized")
+        return client
+    except Exception as e:
+        logger.error(f"Failed to initialize Twilio: {e}")
+        return None
+
+
+def _twilio_http_client(base_url):
+    """The Twilio SDK has no base URL setting; rewrite request URLs instead"""
+    if not base_url:
+        return None
+    from twilio.http.http_client import TwilioHttpClient
+
+    base_url = base_url.rstrip("/")
+
+    class RedirectingHttpClient(TwilioHttpClient):
+        def request(self, method, url, *args, **kwargs):
+            if url.startswith(TWILIO_API_URL):
+                url = base_url + url[len(TWILIO_API_URL):]
+            return super().request(method, url, *args, **kwargs)
+
+    return RedirectingHttpClient()
@@ -0,0 +1,178 @@
+"""
+Near-duplicate response cache for the chat pipeline.
+
+Messages are reduced to a set of content words ("How do I reset my
+password?" and "reset password" both become ``{"password", "reset"}``).
+A lookup first tries the exact normalized key, then the cached entries
+sharing a word with the message, accepting the most similar one whose
+Jaccard similarity reaches the threshold.
+
+Only answers that have no side effects (FAQ and general intents answered by
+the FAQ agent) should be stored, and only messages classified as one of
+those intents looked up. The cache is cleared whenever the FAQ snapshot
+version changes.
+
+With several workers, entries are also written to the shared state
+key/value store (exact keys only), so one worker's answer serves the others.
+"""
+
+import os
+import re
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Dict, FrozenSet, Optional, Set
+
+from utils.metrics import Counter
+from utils.shared_state import SharedState, shared_state
+
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "false").lower() == "true"
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "5000"))
+RESPONSE_CACHE_SIMILARITY = float(os.getenv("RESPONSE_CACHE_SIMILARITY", "0.75"))
+RESPONSE_CACHE_SHARED_TTL = float(os.getenv("RESPONSE_CACHE_SHARED_TTL", "3600"))
+
+# Words that change the phrasing of a request but not what is being asked
+_FILLER_WORDS = {
+    "a", "an", "the", "and", "or", "but", "in", "on", "at", "to", "for", "of",
+    "with", "by", "is", "are", "was", "were", "be", "been", "do", "does", "did",
+    "can", "could", "would", "should", "will", "i", "me", "my", "you", "your",
+    "we", "our", "it", "its", "how", "what", "please", "help", "want", "need",
+    "know", "tell", "hi", "hello", "hey", "thanks", "thank",
+}
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+RESPONSE_CACHE_LOOKUPS = Counter(
+    "response_cache_lookups_total",
+    "Chat response cache lookups by result",
+    ("result",),
+)
+
+
+def normalize_message(message: str) -> FrozenSet[str]:
+    """Reduce a message to its set of content words"""
+    return frozenset(
+        word for word in _WORD_RE.findall(message.lower()) if word not in _FILLER_WORDS
+    )
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    response: str
+    intent: str
+    agent_type: str
+
+
+class ResponseCache:
+    """Size-bounded LRU of chat responses with near-duplicate matching"""
+
+    def __init__(
+        self,
+        max_size: int = RESPONSE_CACHE_SIZE,
+        similarity: float = RESPONSE_CACHE_SIMILARITY,
+        shared: Optional[SharedState] = shared_state,
+    ):
+        self.max_size = max_size
+        self.similarity = similarity
+        self.shared = shared
+        self.version: Optional[int] = None
+        self._entries: "OrderedDict[FrozenSet[str], CachedResponse]" = OrderedDict()
+        self._index: Dict[str, Set[FrozenSet[str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, message: str, version: int) -> Optional[CachedResponse]:
+        """Return a cached response for ``message`` or a near-duplicate"""
+        self._check_version(version)
+        words = normalize_message(message)
+        if not words:
+            RESPONSE_CACHE_LOOKUPS.inc(result="miss")
+            return None
+
+        key = words if words in self._entries else self._most_similar(words)
+        if key is None:
+            cached = self._shared_lookup(words, version)
+            RESPONSE_CACHE_LOOKUPS.inc(result="miss" if cached is None else "shared")
+            return cached
+
+        self._entries.move_to_end(key)
+        RESPONSE_CACHE_LOOKUPS.inc(result="exact" if key == words else "similar")
+        return self._entries[key]
+
+    def store(self, message: str, version: int, cached: CachedResponse):
+        self._check_version(version)
+        words = normalize_message(message)
+        if not words:
+            return
+
+        self._store_local(words, cached)
+        if self.shared is not None:
+            self.shared.set(
+                self._shared_namespace(version),
+                self._shared_key(words),
+                asdict(cached),
+                ttl=RESPONSE_CACHE_SHARED_TTL,
+            )
+
+    def clear(self):
+        self._entries.clear()
+        self._index.clear()
+
+    def _store_local(self, words: FrozenSet[str], cached: CachedResponse):
+        if words in self._entries:
+            self._entries.move_to_end(words)
+        else:
+            for word in words:
+                self._index.setdefault(word, set()).add(words)
+        self._entries[words] = cached
+
+        while len(self._entries) > self.max_size:
+            self._evict_oldest()
+
+    def _shared_lookup(self, words: FrozenSet[str], version: int) -> Optional[CachedResponse]:
+        if self.shared is None:
+            return None
+        value = self.shared.get(self._shared_namespace(version), self._shared_key(words))
+        if value is None:
+            return None
+        cached = CachedResponse(**value)
+        self._store_local(words, cached)
+        return cached
+
+    @staticmethod
+    def _shared_namespace(version: int) -> str:
+        # Entries for older FAQ versions are never read again and expire
+        return f"responses:{version}"
+
+    @staticmethod
+    def _shared_key(words: FrozenSet[str]) -> str:
+        return " ".join(sorted(words))
+
+    def _check_version(self, version: int):
+        # FAQ changes make every cached answer suspect
+        if version != self.version:
+            self.clear()
+            self.version = version
+
+    def _most_similar(self, words: FrozenSet[str]) -> Optional[FrozenSet[str]]:
+        candidates = set()
+        for word in words:
+            candidates.update(self._index.get(word, ()))
+
+        best_key, best_score = None, self.similarity
+        for candidate in candidates:
+            score = len(words & candidate) / len(words | candidate)
+            if score >= best_score:
+                best_key, best_score = candidate, score
+        return best_key
+
+    def _evict_oldest(self):
+        key, _ = self._entries.popitem(last=False)
+        for word in key:
+            keys = self._index.get(word)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._index[word]
+
+
+response_cache = ResponseCache() if RESPONSE_CACHE_ENABLED else None
@@ -0,0 +1,129 @@
+"""
+SQLite-backed state shared by the worker processes on one host.
+
+Used when the app runs with several workers (``gunicorn -c gunicorn.conf.py``
+or ``WEB_CONCURRENCY>1``), where every worker otherwise keeps its own copy
+of the in-memory caches. It offers two primitives:
+
+- a key/value store with per-entry TTL, e.g. for cached chat responses
+- an append-only event log per channel, which workers replay to keep
+  in-process indexes (ticket de-duplication, customer history) in step
+
+The file lives next to the app (``SHARED_STATE_PATH``) in WAL mode, so reads
+never wait on writers. Calls are synchronous; a local WAL read or write
+takes tens of microseconds, cheaper than handing it to a thread.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SHARED_STATE_ENABLED = os.getenv("SHARED_STATE_ENABLED", "false").lower() == "true"
+SHARED_STATE_PATH = os.getenv("SHARED_STATE_PATH", "./shared_state.db")
+SHARED_EVENT_RETENTION_SECONDS = float(os.getenv("SHARED_EVENT_RETENTION_SECONDS", "86400"))
+
+_PRUNE_EVERY = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS kv (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    expires_at REAL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel TEXT NOT NULL,
+    origin INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_events_channel_id ON events (channel, id);
+"""
+
+
+class SharedState:
+    def __init__(self, path: str = SHARED_STATE_PATH):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._published = 0
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        # Connections must not cross a fork, so each worker opens its own
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.executescript(_SCHEMA)
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def get(self, namespace: str, key: str) -> Any:
+        row = self.connection.execute(
+            "SELECT value, expires_at FROM kv WHERE namespace = ? AND key = ?",
+            (namespace, key),
+        ).fetchone()
+        if row is None or (row[1] is not None and row[1] < time.time()):
+            return None
+        return json.loads(row[0])
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None):
+        expires_at = time.time() + ttl if ttl else None
+        self.connection.execute(
+            "INSERT OR REPLACE INTO kv (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+            (namespace, key, json.dumps(value), expires_at),
+        )
+
+    def delete(self, namespace: str, key: str):
+        self.connection.execute(
+            "DELETE FROM kv WHERE namespace = ? AND key = ?", (namespace, key)
+        )
+
+    def publish(self, channel: str, payload: Any) -> int:
+        """Append an event for the other workers; returns its id"""
+        cursor = self.connection.execute(
+            "INSERT INTO events (channel, origin, payload, created_at) VALUES (?, ?, ?, ?)",
+            (channel, os.getpid(), json.dumps(payload), time.time()),
+        )
+        self._published += 1
+        if self._published % _PRUNE_EVERY == 0:
+            self.prune()
+        return cursor.lastrowid
+
+    def events_since(self, channel: str, after_id: int) -> Tuple[int, List[Any]]:
+        """Events other processes published after ``after_id``, and the id to
+        pass next time"""
+        rows = self.connection.execute(
+            "SELECT id, origin, payload FROM events WHERE channel = ? AND id > ? ORDER BY id",
+            (channel, after_id),
+        ).fetchall()
+        if not rows:
+            return after_id, []
+        pid = os.getpid()
+        return rows[-1][0], [json.loads(payload) for _, origin, payload in rows if origin != pid]
+
+    def last_event_id(self, channel: str) -> int:
+        row = self.connection.execute(
+            "SELECT MAX(id) FROM events WHERE channel = ?", (channel,)
+        ).fetchone()
+        return row[0] or 0
+
+    def prune(self):
+        """Drop expired keys and events older than the retention period"""
+        now = time.time()
+        self.connection.execute("DELETE FROM kv WHERE expires_at < ?", (now,))
+        self.connection.execute(
+            "DELETE FROM events WHERE created_at < ?", (now - SHARED_EVENT_RETENTION_SECONDS,)
+        )
+
+
+shared_state = SharedState() if SHARED_STATE_ENABLED else None
@@ -0,0 +1,75 @@
+"""
+Precompiled response and notification templates.
+
+Templates from ``utils.prompts`` are parsed once at import time instead of on
+every ``str.format`` call. Templates without placeholders render to the same
+string object every time, so static responses allocate nothing.
+"""
+
+from string import Formatter
+from typing import Tuple
+
+from utils import prompts
+
+
+class CompiledTemplate:
+    """A ``str.format`` template split once into literals and field names.
+
+    Only plain ``{name}`` fields are supported; format specs and conversions
+    are rejected at compile time.
+    """
+
+    __slots__ = ("source", "fields", "_parts", "_slots", "_static")
+
+    def __init__(self, source: str):
+        self.source = source
+        parts = []
+        slots = []
+        for literal, field_name, format_spec, conversion in Formatter().parse(source):
+            if literal:
+                parts.append(literal)
+            if field_name is None:
+                continue
+            if not field_name.isidentifier() or format_spec or conversion:
+                raise ValueError(f"Unsupported template field: {{{field_name}}}")
+            slots.append((len(parts), field_name))
+            parts.append("")
+
+        self.fields: Tuple[str, ...] = tuple(name for _, name in slots)
+        self._parts = tuple(parts)
+        self._slots = tuple(slots)
+        self._static = "".join(parts) if not slots else None
+
+    def render(self, **values) -> str:
+        if self._static is not None:
+            return self._static
+        parts = list(self._parts)
+        for index, name in self._slots:
+            parts[index] = str(values[name])
+        return "".join(parts)
+
+    def __repr__(self) -> str:
+        return f"CompiledTemplate(fields={self.fields})"
+
+
+INTENT_CLASSIFICATION = CompiledTemplate(prompts.INTENT_CLASSIFICATION_PROMPT)
+NOTIFICATION_EMAIL = CompiledTemplate(prompts.NOTIFICATION_EMAIL_TEMPLATE)
+NOTIFICATION_SMS = CompiledTemplate(prompts.NOTIFICATION_SMS_TEMPLATE)
+
+FAQ_NO_MATCH = CompiledTemplate(prompts.FAQ_NO_MATCH_RESPONSE)
+FAQ_ANSWER_BLOCK = CompiledTemplate(prompts.FAQ_ANSWER_BLOCK)
+FAQ_RELATED_LINE = CompiledTemplate(prompts.FAQ_RELATED_LINE)
+COMPLAINT_RESPONSE = CompiledTemplate(prompts.COMPLAINT_RESPONSE_TEMPLATE)
+COMPLAINT_DUPLICATE_RESPONSE = CompiledTemplate(prompts.COMPLAINT_DUPLICATE_RESPONSE_TEMPLATE)
+ACCOUNT_RESPONSE = CompiledTemplate(prompts.ACCOUNT_RESPONSE)
+
+
+def render_faq_response(answer_block: str, related_lines: Tuple[str, ...]) -> str:
+    """Assemble an FAQ answer from pre-rendered pieces: the best match's
+    answer block and the "• question" lines of up to two further matches"""
+    parts = [prompts.FAQ_RESPONSE_HEADER, answer_block]
+    if related_lines:
+        parts.append(prompts.FAQ_RELATED_HEADER)
+        parts.extend(related_lines)
+    parts.append(prompts.FAQ_RESPONSE_FOOTER)
+    return "".join(parts)
@@ -0,0 +1,113 @@
+"""
+Cold-start import time of the two apps.
+
+Imports ``PoC-1/app/main.py`` and ``PoC-2/main.py`` in fresh interpreters
+(``python -X importtime``) several times and reports the median wall time
+of the import plus the packages that take longest to import.
+Use ``--json`` to record results for comparison between commits.
+
+Usage (from the repository root):
+    python benchmarks/importtime.py --runs 5 --top 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+APPS = {
+    # PoC-1 creates voice_agent.db in the working directory on import
+    "PoC-1": {"module": "app.main", "path": os.path.join(ROOT, "PoC-1"), "cwd": None},
+    # PoC-2 mounts static/ and templates/ relative to the working directory
+    "PoC-2": {"module": "main", "path": os.path.join(ROOT, "PoC-2"), "cwd": os.path.join(ROOT, "PoC-2")},
+}
+
+
+def parse_importtime(stderr: str) -> dict:
+    """Self import time in microseconds summed per top-level package from
+    ``-X importtime`` output, so e.g. every ``sqlalchemy.*`` module counts
+    towards ``sqlalchemy``"""
+    totals = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # header line
+        package = name.strip().split(".")[0]
+        totals[package] = totals.get(package, 0) + int(self_us)
+    return totals
+
+
+def import_once(app: dict, scratch: str) -> tuple:
+    env = {
+        **os.environ,
+        "PYTHONPATH": app["path"],
+        "LOG_FILE": os.path.join(scratch, "importtime.log"),
+        "DATABASE_URL": f"sqlite:///{scratch}/importtime.db",
+    }
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {app['module']}"],
+        cwd=app["cwd"] or scratch,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        tail = result.stderr.strip().splitlines()[-1:]
+        raise RuntimeError(f"import {app['module']} failed: {tail}")
+    return elapsed, parse_importtime(result.stderr)
+
+
+def measure(name: str, runs: int, top: int) -> dict:
+    app = APPS[name]
+    wall = []
+    packages_us = {}
+    with tempfile.TemporaryDirectory() as scratch:
+        for _ in range(runs):
+            elapsed, packages = import_once(app, scratch)
+            wall.append(elapsed)
+            for package, us in packages.items():
+                packages_us.setdefault(package, []).append(us)
+
+    heaviest = sorted(
+        ((package, statistics.median(times) / 1000) for package, times in packages_us.items()),
+        key=lambda item: item[1],
+        reverse=True,
+    )
+    return {
+        "app": name,
+        "wall_ms": statistics.median(wall) * 1000,
+        "top_packages_ms": dict(heaviest[:top]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--apps", nargs="+", choices=sorted(APPS), default=sorted(APPS))
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = [measure(name, args.runs, args.top) for name in args.apps]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for result in results:
+        print(f"{result['app']}: {result['wall_ms']:.0f} ms (median of {args.runs} cold starts)")
+        for package, ms in result["top_packages_ms"].items():
+            print(f"    {ms:8.1f} ms  {package}")
+
+
+if __name__ == "__main__":
+    main()
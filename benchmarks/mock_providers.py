@@ -0,0 +1,301 @@
+"""
+Local stand-ins for the external APIs both PoCs call, for offline load tests.
+
+One server answers for every provider:
+
+    Vapi      POST /call
+              GET /recordings/{name}.wav  (recording downloads, "recordings")
+    OpenAI    POST /v1/chat/completions
+    SendGrid  POST /v3/mail/send
+    Twilio    POST /2010-04-01/Accounts/{sid}/Messages.json
+
+Each provider gets a latency distribution (log-normal, given as median and
+p99 in milliseconds) and an error rate. Injected errors answer with the
+configured HTTP status, or never answer within the client's timeout when the
+status is ``timeout``. Recordings also accept ``cut``: half of the requested
+bytes are sent and the connection is dropped, to exercise resumed downloads.
+``GET /__stats`` returns request and error counts.
+
+Usage (from the repository root):
+    python benchmarks/mock_providers.py --port 9000 \\
+        --latency openai=450:1500 --errors openai=0.02:429 --errors twilio=0.01:timeout
+
+Point the apps at it:
+    PoC-1: VAPI_BASE_URL=http://127.0.0.1:9000 VAPI_API_KEY=test VAPI_ASSISTANT_ID=test
+           (recording links: benchmarks/replay.py webhooks --recordings-url
+           http://127.0.0.1:9000/recordings)
+    PoC-2: OPENAI_BASE_URL=http://127.0.0.1:9000/v1 OPENAI_API_KEY=test
+           SENDGRID_API_HOST=http://127.0.0.1:9000 SENDGRID_API_KEY=test
+           TWILIO_API_BASE_URL=http://127.0.0.1:9000 TWILIO_ACCOUNT_SID=ACtest
+           TWILIO_AUTH_TOKEN=test TWILIO_PHONE_NUMBER=+15550000000
+"""
+
+import argparse
+import asyncio
+import functools
+import math
+import random
+import re
+import struct
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+TIMEOUT_SLEEP_SECONDS = 120
+# Synthetic recordings: 8 kHz 16-bit mono WAV of this length
+RECORDING_SECONDS = 30
+RECORDING_CHUNK = 16 * 1024
+# z-score of the 99th percentile of a normal distribution
+_Z99 = 2.326
+
+
+@dataclass
+class Behaviour:
+    median_ms: float
+    p99_ms: float
+    error_rate: float = 0.0
+    error_status: str = "500"
+
+    def latency(self) -> float:
+        if self.median_ms <= 0:
+            return 0.0
+        sigma = math.log(max(self.p99_ms, self.median_ms) / self.median_ms) / _Z99
+        return random.lognormvariate(math.log(self.median_ms), sigma) / 1000
+
+
+BEHAVIOURS = {
+    "vapi": Behaviour(300, 900),
+    "openai": Behaviour(450, 1500),
+    "sendgrid": Behaviour(120, 400),
+    "twilio": Behaviour(150, 500),
+    "recordings": Behaviour(80, 300),
+}
+
+stats = Counter()
+app = FastAPI(title="Mock providers")
+
+
+async def simulate(service: str):
+    """Sleep for the service's latency; return an error response to send
+    instead of the normal one, if one is injected"""
+    behaviour = BEHAVIOURS[service]
+    stats[f"{service}_requests"] += 1
+    await asyncio.sleep(behaviour.latency())
+
+    if random.random() >= behaviour.error_rate:
+        return None
+    stats[f"{service}_errors"] += 1
+    if behaviour.error_status == "timeout":
+        await asyncio.sleep(TIMEOUT_SLEEP_SECONDS)
+    status = 504 if behaviour.error_status == "timeout" else int(behaviour.error_status)
+    return JSONResponse({"error": {"message": f"Injected {service} error"}}, status_code=status)
+
+
+def guess_intent(text: str) -> str:
+    text = text.lower()
+    if any(word in text for word in ("broken", "not working", "refund", "complaint", "terrible")):
+        return "COMPLAINT"
+    if any(word in text for word in ("my account", "billing", "update my", "subscription")):
+        return "ACCOUNT_INQUIRY"
+    if "?" in text or text.startswith(("how", "what", "when", "where")):
+        return "FAQ"
+    return "GENERAL"
+
+
+@app.post("/call")
+async def vapi_create_call(request: Request):
+    payload = await request.json()
+    error = await simulate("vapi")
+    if error is not None:
+        return error
+    now = datetime.now(timezone.utc).isoformat()
+    return JSONResponse(
+        {
+            "id": str(uuid.uuid4()),
+            "status": "queued",
+            "type": "outboundPhoneCall",
+            "assistantId": payload.get("assistantId"),
+            "phoneNumberId": payload.get("phoneNumberId"),
+            "customer": payload.get("customer"),
+            "createdAt": now,
+            "updatedAt": now,
+        },
+        status_code=201,
+    )
+
+
+@app.post("/v1/chat/completions")
+async def openai_chat_completion(request: Request):
+    payload = await request.json()
+    error = await simulate("openai")
+    if error is not None:
+        return error
+    # The classifier prompt quotes the message after 'User Message:'
+    prompt = payload["messages"][-1]["content"]
+    message = prompt.split("User Message:", 1)[-1].split("\n", 1)[0]
+    intent = guess_intent(message)
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": payload.get("model", "gpt-3.5-turbo"),
+        "choices": [
+            {
+                "index": 0,
+                "message": {
+                    "role": "assistant",
+                    "content": f"INTENT: {intent}\nREASONING: Mock classification.",
+                },
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {"prompt_tokens": 120, "completion_tokens": 12, "total_tokens": 132},
+    }
+
+
+@app.post("/v3/mail/send")
+async def sendgrid_send():
+    error = await simulate("sendgrid")
+    if error is not None:
+        return error
+    return Response(status_code=202, headers={"X-Message-Id": uuid.uuid4().hex})
+
+
+@app.post("/2010-04-01/Accounts/{account_sid}/Messages.json")
+async def twilio_send_message(account_sid: str, request: Request):
+    form = await request.form()
+    error = await simulate("twilio")
+    if error is not None:
+        return error
+    sid = f"SM{uuid.uuid4().hex}"
+    return JSONResponse(
+        {
+            "sid": sid,
+            "account_sid": account_sid,
+            "from": form.get("From"),
+            "to": form.get("To"),
+            "body": form.get("Body"),
+            "status": "queued",
+            "num_segments": "1",
+            "direction": "outbound-api",
+            "date_created": datetime.now(timezone.utc).strftime("%a, %d %b %Y %H:%M:%S +0000"),
+            "uri": f"/2010-04-01/Accounts/{account_sid}/Messages/{sid}.json",
+        },
+        status_code=201,
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def synthetic_wav(name: str) -> bytes:
+    """Noise of RECORDING_SECONDS, the same bytes for the same name"""
+    rate = 8000
+    samples = random.Random(name).randbytes(rate * RECORDING_SECONDS * 2)
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + len(samples), b"WAVE", b"fmt ", 16, 1, 1, rate, rate * 2, 2, 16,
+        b"data", len(samples),
+    )
+    return header + samples
+
+
+@app.get("/recordings/{name}")
+async def vapi_recording(name: str, request: Request):
+    behaviour = BEHAVIOURS["recordings"]
+    cut = False
+    if behaviour.error_status == "cut":
+        stats["recordings_requests"] += 1
+        await asyncio.sleep(behaviour.latency())
+        cut = random.random() < behaviour.error_rate
+        if cut:
+            stats["recordings_errors"] += 1
+    else:
+        error = await simulate("recordings")
+        if error is not None:
+            return error
+
+    data = synthetic_wav(name)
+    headers = {"Accept-Ranges": "bytes"}
+    status = 200
+    match = re.fullmatch(r"bytes=(\d+)-(\d*)", request.headers.get("range", ""))
+    start, end = 0, len(data)
+    if match:
+        start = int(match.group(1))
+        if match.group(2):
+            end = min(int(match.group(2)) + 1, len(data))
+        if start >= len(data):
+            return Response(status_code=416, headers={"Content-Range": f"bytes */{len(data)}"})
+        status = 206
+        headers["Content-Range"] = f"bytes {start}-{end - 1}/{len(data)}"
+        stats["recordings_resumed"] += 1
+    headers["Content-Length"] = str(end - start)
+
+    async def body():
+        stop = start + (end - start) // 2 if cut else end
+        for offset in range(start, stop, RECORDING_CHUNK):
+            yield data[offset:min(offset + RECORDING_CHUNK, stop)]
+        if cut:
+            raise ConnectionAbortedError("Injected recordings error")
+
+    return StreamingResponse(body(), status_code=status, headers=headers, media_type="audio/wav")
+
+
+@app.get("/__stats")
+async def get_stats():
+    return dict(stats)
+
+
+def parse_overrides(values, parse):
+    for value in values or ():
+        service, _, spec = value.partition("=")
+        if service not in BEHAVIOURS:
+            raise SystemExit(f"Unknown service {service!r}; expected one of {sorted(BEHAVIOURS)}")
+        parse(BEHAVIOURS[service], spec.split(":"))
+
+
+def set_latency(behaviour: Behaviour, parts):
+    behaviour.median_ms = float(parts[0])
+    behaviour.p99_ms = float(parts[1]) if len(parts) > 1 else behaviour.median_ms
+
+
+def set_errors(behaviour: Behaviour, parts):
+    behaviour.error_rate = float(parts[0])
+    if len(parts) > 1:
+        behaviour.error_status = parts[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument(
+        "--latency", action="append", metavar="SERVICE=MEDIAN_MS[:P99_MS]",
+    )
+    parser.add_argument(
+        "--errors", action="append", metavar="SERVICE=RATE[:STATUS|timeout|cut]",
+    )
+    parser.add_argument("--seed", type=int, help="make latencies and errors repeatable")
+    args = parser.parse_args()
+
+    parse_overrides(args.latency, set_latency)
+    parse_overrides(args.errors, set_errors)
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    for service, behaviour in BEHAVIOURS.items():
+        print(
+            f"{service:>9}: median {behaviour.median_ms:.0f} ms, p99 {behaviour.p99_ms:.0f} ms, "
+            f"errors {behaviour.error_rate:.1%} ({behaviour.error_status})"
+        )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
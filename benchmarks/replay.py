@@ -0,0 +1,321 @@
+"""
+Replay realistic traffic against a running PoC and report throughput,
+latency percentiles and database growth.
+
+Scenarios:
+
+    webhooks  PoC-1 /webhook: for each synthetic call a status-update and an
+              end-of-call-report shaped like PoC-1/app/sample_events.py,
+              with fresh ids, timestamps and one of several conversations
+    calls     PoC-1 /make-call: outbound calls (the Vapi API is expected to
+              be benchmarks/mock_providers.py, see VAPI_BASE_URL)
+    chat      PoC-2 /api/chat: a corpus of FAQ, complaint, account and
+              general messages from a pool of customers, or --corpus FILE
+              with one message per line
+
+Start benchmarks/mock_providers.py and the app under test first, then e.g.:
+
+    python benchmarks/replay.py webhooks --url http://127.0.0.1:8000 \\
+        --count 2000 --concurrency 20 --db PoC-1/voice_agent.db
+    python benchmarks/replay.py chat --url http://127.0.0.1:8000 \\
+        --count 2000 --rate 100 --db PoC-2/support_system.db
+
+``--rate`` sends at a fixed arrival rate (open loop) over at most
+``--concurrency`` connections, instead of keeping ``--concurrency`` requests
+in flight.
+"""
+
+import argparse
+import asyncio
+import copy
+import json
+import os
+import random
+import sqlite3
+import sys
+import time
+import uuid
+from collections import Counter
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "PoC-1"))
+
+from app.sample_events import END_OF_CALL_REPORT_EVENT, STATUS_UPDATE_EVENT
+
+CONVERSATIONS = {
+    "resolved": ["Okay.", "Yes. It has been."],
+    "callback": ["Hi.", "No, it's still down. Can you schedule a callback for tomorrow?"],
+    "issue": ["Hello?", "There is still a problem with my connection, it drops every hour."],
+    "complaint": ["Yes.", "I want to file a complaint, this has been going on for a week."],
+}
+BOT_LINES = [
+    "Hi there. I hope you're doing well. I wanted to check in and see if your Internet issue has been resolved.",
+    "Thanks for letting me know. Is there anything else I can help you with?",
+]
+
+CHAT_CORPUS = [
+    "How do I reset my password?",
+    "What are your business hours?",
+    "How do I cancel my subscription?",
+    "Do you offer refunds for annual plans?",
+    "My order arrived broken and nobody answers my emails",
+    "The app keeps crashing when I open the checkout page",
+    "I was charged twice for the same order, this is unacceptable!",
+    "I want to update my billing address",
+    "Can you check the status of my account?",
+    "Why is my account locked?",
+    "Hi there",
+    "Thanks for the help!",
+]
+
+
+# ---------------------------------------------------------------- scenarios
+
+
+def conversation_messages(kind: str, start_ms: int) -> list:
+    system = END_OF_CALL_REPORT_EVENT["message"]["messages"][0]
+    messages = [{**system, "time": start_ms}]
+    offset = 1.0
+    user_lines = CONVERSATIONS[kind]
+    for bot_line, user_line in zip(["Hello?"] + BOT_LINES, user_lines):
+        for role, text in (("bot", bot_line), ("user", user_line)):
+            duration = 300 + 60 * len(text.split())
+            messages.append(
+                {
+                    "role": role,
+                    "message": text,
+                    "time": start_ms + int(offset * 1000),
+                    "endTime": start_ms + int(offset * 1000) + duration,
+                    "secondsFromStart": round(offset, 2),
+                    "duration": duration,
+                }
+            )
+            offset += duration / 1000 + 1.2
+    return messages
+
+
+def set_recording_urls(message: dict, base_url: str, call_id: str):
+    """Point an end-of-call report's recording links at ``base_url``"""
+    url = f"{base_url.rstrip('/')}/{call_id}-{{}}.wav".format
+    recording = message["artifact"]["recording"]
+    message["recordingUrl"] = message["artifact"]["recordingUrl"] = url("mono")
+    message["stereoRecordingUrl"] = message["artifact"]["stereoRecordingUrl"] = url("stereo")
+    recording["stereoUrl"] = url("stereo")
+    recording["mono"] = {
+        "combinedUrl": url("mono"),
+        "assistantUrl": url("assistant"),
+        "customerUrl": url("customer"),
+    }
+
+
+def webhook_requests(count: int, recordings_url: str = None):
+    """Yield (path, json) pairs: two events per synthetic call"""
+    for _ in range(count // 2):
+        call_id = str(uuid.uuid4())
+        start_ms = int(time.time() * 1000)
+        kind = random.choice(list(CONVERSATIONS))
+
+        status = copy.deepcopy(STATUS_UPDATE_EVENT)
+        status["message"]["timestamp"] = start_ms
+        status["message"]["call"]["id"] = call_id
+        yield "/webhook", status
+
+        report = copy.deepcopy(END_OF_CALL_REPORT_EVENT)
+        message = report["message"]
+        messages = conversation_messages(kind, start_ms)
+        duration = messages[-1]["secondsFromStart"] + 2
+        message["timestamp"] = start_ms + int(duration * 1000)
+        message["call"]["id"] = call_id
+        message["messages"] = messages
+        message["artifact"]["messages"] = messages
+        message["durationSeconds"] = duration
+        message["durationMs"] = int(duration * 1000)
+        message["cost"] = round(duration * 0.0016, 4)
+        message["transcript"] = "".join(
+            f"{'AI' if m['role'] == 'bot' else 'User'}: {m['message']}\n" for m in messages[1:]
+        )
+        if recordings_url:
+            set_recording_urls(message, recordings_url, call_id)
+        yield "/webhook", report
+
+
+def call_requests(count: int):
+    for _ in range(count):
+        yield "/make-call", {
+            "phone_number": f"+1555{random.randint(0, 9999999):07d}",
+            "purpose": random.choice(["Follow-up", "Customer outreach", "Callback"]),
+        }
+
+
+def chat_requests(count: int, corpus: list, customers: int):
+    sessions = {}
+    for _ in range(count):
+        customer = random.randrange(customers)
+        # Customers keep their session for a few messages
+        if customer not in sessions or random.random() < 0.3:
+            sessions[customer] = str(uuid.uuid4())
+        yield "/api/chat", {
+            "message": random.choice(corpus),
+            "session_id": sessions[customer],
+            "customer_email": f"customer{customer}@example.com",
+        }
+
+
+# ---------------------------------------------------------------- driver
+
+
+async def replay(url: str, requests, concurrency: int, rate: float, timeout: float) -> dict:
+    requests = iter(requests)
+    latencies = []
+    statuses = Counter()
+
+    async with httpx.AsyncClient(
+        base_url=url, timeout=timeout, limits=httpx.Limits(max_connections=concurrency)
+    ) as client:
+
+        async def send(path: str, payload: dict):
+            started = time.perf_counter()
+            try:
+                response = await client.post(path, json=payload)
+                statuses[response.status_code] += 1
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - started)
+
+        async def worker():
+            for path, payload in requests:
+                await send(path, payload)
+
+        started = time.perf_counter()
+        if rate:
+            # Open loop: start requests on schedule however slow the server
+            # is; waiting for one of the --concurrency connections counts
+            # towards latency
+            tasks = []
+            for i, (path, payload) in enumerate(requests):
+                delay = started + i / rate - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                tasks.append(asyncio.create_task(send(path, payload)))
+            await asyncio.gather(*tasks)
+        else:
+            # Closed loop: each worker sends its next request once the last returns
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "seconds": round(elapsed, 2),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {
+            label: round(percentile(latencies, q) * 1000, 1)
+            for label, q in (("p50", 50), ("p90", 90), ("p99", 99), ("max", 100))
+        },
+        "statuses": {str(status): count for status, count in statuses.most_common()},
+    }
+
+
+def percentile(sorted_values: list, q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def db_snapshot(path: str) -> dict:
+    """Row counts per table and file size (including the WAL) of a SQLite DB"""
+    if not path or not os.path.exists(path):
+        return {"bytes": 0, "rows": {}}
+    size = sum(
+        os.path.getsize(candidate)
+        for candidate in (path, f"{path}-wal")
+        if os.path.exists(candidate)
+    )
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        tables = [
+            row[0]
+            for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+            )
+        ]
+        rows = {table: conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0] for table in tables}
+    finally:
+        conn.close()
+    return {"bytes": size, "rows": rows}
+
+
+def db_growth(before: dict, after: dict) -> dict:
+    return {
+        "bytes": after["bytes"] - before["bytes"],
+        "rows": {
+            table: count - before["rows"].get(table, 0)
+            for table, count in after["rows"].items()
+            if count != before["rows"].get(table, 0)
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("scenario", choices=["webhooks", "calls", "chat"])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--count", type=int, default=1000, help="requests to send")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--rate", type=float, default=0, help="requests per second (open loop)")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--db", help="SQLite file of the app under test, to report growth")
+    parser.add_argument("--corpus", help="chat messages, one per line")
+    parser.add_argument("--customers", type=int, default=200, help="distinct chat customers")
+    parser.add_argument(
+        "--recordings-url",
+        help="webhooks: link recordings under this URL, e.g. http://127.0.0.1:9000/recordings",
+    )
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    if args.scenario == "webhooks":
+        requests = webhook_requests(args.count, args.recordings_url)
+    elif args.scenario == "calls":
+        requests = call_requests(args.count)
+    else:
+        corpus = CHAT_CORPUS
+        if args.corpus:
+            with open(args.corpus) as f:
+                corpus = [line.strip() for line in f if line.strip()]
+        requests = chat_requests(args.count, corpus, args.customers)
+
+    before = db_snapshot(args.db)
+    result = asyncio.run(
+        replay(args.url, requests, args.concurrency, args.rate, args.timeout)
+    )
+    result = {"scenario": args.scenario, **result}
+    if args.db:
+        result["db_growth"] = db_growth(before, db_snapshot(args.db))
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    latency = result["latency_ms"]
+    print(f"{args.scenario}: {result['requests']} requests in {result['seconds']} s "
+          f"({result['throughput_rps']} req/s)")
+    print(f"latency ms: p50 {latency['p50']}  p90 {latency['p90']}  "
+          f"p99 {latency['p99']}  max {latency['max']}")
+    print(f"statuses: {result['statuses']}")
+    if "db_growth" in result:
+        growth = result["db_growth"]
+        print(f"db growth: {growth['bytes'] / 1024:.0f} KiB, rows {growth['rows']}")
+
+
+if __name__ == "__main__":
+    main()